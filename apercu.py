@@ -0,0 +1,343 @@
+"""
+Ce module définit la classe `TableApercu`, une table précalculée de trajectoires optimales pour prévoir
+instantanément le point d'atterrissage, en attendant la résolution exacte.
+
+Responsable de :
+    - résoudre en parallèle (une ligne de la grille par tâche, amorcée d'un point au suivant) le
+      problème de guidage sur une grille de décalages effectifs,
+    - enregistrer et relire la table (`.npz`), dans le dossier du cache d'aperçu,
+    - prévoir par interpolation bilinéaire vectorisée, pour M cas à la fois, le point d'atterrissage,
+      l'erreur, le coût et la trajectoire approchée.
+
+Le vent n'intervient dans le problème que par la dérive qu'il ajoute à chaque pas : la position finale
+vaut x_0 + somme des déplacements commandés + somme des W[:, k], et aucune contrainte ne porte sur les
+positions intermédiaires. La commande optimale ne dépend donc du vent (moyenne, cisaillement ou profil
+quelconque) et du départ que par le décalage effectif e = x_0 - cible + somme_k W[:, k] ; le profil de
+vitesse ne dépend que de N. Une table à deux dimensions (e_x, e_y), par N et cap initial, suffit ; le
+vent réel ne sert qu'à redessiner la trajectoire.
+
+Hors de la grille, le décalage est ramené au bord et l'excédent s'ajoute à l'écart d'atterrissage.
+
+Configuration par variable d'environnement :
+    - PARACHUTE_CACHE_APERCU : dossier des tables (défaut : ~/.cache/parachute_apercu).
+
+Usage (construction de la table, depuis la racine du dépôt) :
+    python apercu.py
+    python apercu.py 31 3000 150
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from importer_vent import ImportVent, ProfilVent
+from pilote_scp import cout_controle
+from propagation import propager
+from simultion_final import SimulerTrajectoire
+
+DOSSIER_PAR_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "parachute_apercu")
+
+_tables = {}
+_constructions = {}
+_VERROU = threading.Lock()
+
+
+def _ligne(N, psi_0, e_y, decalages_x):
+    """
+    Résout une ligne de la grille (e_y fixé) dans un processus du pool, chaque point amorcé par le précédent.
+
+    :return: Tuple (e_y, commandes (nx, 2, N), résidus x_N - cible (nx, 2), coûts (nx,)).
+    :rtype: tuple
+    """
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    profil = ProfilVent(np.zeros((1, 2, N)), z_t, time_vec)
+    commandes = np.full((len(decalages_x), 2, N), np.nan)
+    residus = np.full((len(decalages_x), 2), np.nan)
+    couts = np.full(len(decalages_x), np.nan)
+    u = x = None
+    for i, e_x in enumerate(decalages_x):
+        simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", x_0=[e_x, e_y], profil_vent=profil)
+        simulateur.psi_0 = psi_0
+        try:
+            if u is None:
+                simulateur.optimiser_trajectoire()
+            else:
+                simulateur.optimiser_trajectoire(u, x, rayon_initial=0.)
+        except (ValueError, ArithmeticError):
+            try:
+                simulateur.optimiser_trajectoire()
+            except (ValueError, ArithmeticError):
+                u = x = None
+                continue
+        u, x = simulateur.u_star, simulateur.x_star
+        commandes[i], residus[i], couts[i] = u, x[:, -1], simulateur.cout
+    return e_y, commandes, residus, couts
+
+
+class TableApercu:
+    """
+    Table des trajectoires optimales sur une grille de décalages effectifs, interpolée pour l'aperçu.
+
+    :param decalages_x: Grille des décalages effectifs e_x (m), croissante et régulière.
+    :type decalages_x: np.ndarray
+    :param decalages_y: Grille des décalages effectifs e_y (m), croissante et régulière.
+    :type decalages_y: np.ndarray
+    :param commandes: Commandes optimales (ny, nx, 2, N).
+    :type commandes: np.ndarray
+    :param residus: Écarts d'atterrissage x_N - cible (ny, nx, 2).
+    :type residus: np.ndarray
+    :param couts: Coûts du problème non convexe (ny, nx).
+    :type couts: np.ndarray
+    :param v: Profil de vitesse (N,).
+    :type v: np.ndarray
+    :param dt: Pas de temps.
+    :type dt: float
+    :param psi_0: Cap initial imposé (rad).
+    :type psi_0: float
+
+    :ivar efforts: Effort de contrôle des commandes de la table (ny, nx).
+    """
+
+    def __init__(self, decalages_x, decalages_y, commandes, residus, couts, v, dt, psi_0=0.):
+        self.decalages_x = np.asarray(decalages_x, dtype=float)
+        self.decalages_y = np.asarray(decalages_y, dtype=float)
+        self.commandes = commandes
+        self.residus = residus
+        self.couts = couts
+        self.v = np.asarray(v, dtype=float)
+        self.dt = float(dt)
+        self.psi_0 = float(psi_0)
+        self.N = commandes.shape[-1]
+        self._combler()
+        self.efforts = cout_controle(self.commandes, self.v, self.dt)
+
+    def _combler(self):
+        """Remplace les points non résolus par leur plus proche voisin résolu de la grille."""
+        manquants = np.isnan(self.couts)
+        if not manquants.any() or manquants.all():
+            return
+        jj, ii = np.nonzero(~manquants)
+        for j, i in zip(*np.nonzero(manquants)):
+            k = np.argmin((jj - j) ** 2 + (ii - i) ** 2)
+            self.commandes[j, i] = self.commandes[jj[k], ii[k]]
+            self.residus[j, i] = self.residus[jj[k], ii[k]]
+            self.couts[j, i] = self.couts[jj[k], ii[k]]
+
+    @classmethod
+    def construire(cls, N=31, etendue=3000., pas=150., psi_0=0., processus=None, progression=None):
+        """
+        Résout le problème sur la grille [-etendue, etendue]² de décalages effectifs.
+
+        :param N: Nombre d'étapes temporelles.
+        :type N: int
+        :param etendue: Demi-largeur de la grille (m).
+        :type etendue: float
+        :param pas: Pas de la grille (m).
+        :type pas: float
+        :param psi_0: Cap initial imposé (rad).
+        :type psi_0: float
+        :param processus: Nombre de processus (par défaut : nombre de cœurs).
+        :type processus: int
+        :param progression: Fonction appelée avec (lignes terminées, total) après chaque ligne.
+        :type progression: callable
+        :return: Table construite.
+        :rtype: TableApercu
+        """
+        grille = np.arange(-etendue, etendue + pas / 2, pas)
+        commandes = np.full((len(grille), len(grille), 2, N), np.nan)
+        residus = np.full((len(grille), len(grille), 2), np.nan)
+        couts = np.full((len(grille), len(grille)), np.nan)
+        lignes = {e_y: j for j, e_y in enumerate(grille)}
+        with ProcessPoolExecutor(max_workers=processus or os.cpu_count()) as pool:
+            taches = [pool.submit(_ligne, N, psi_0, e_y, grille) for e_y in grille]
+            for fait, tache in enumerate(as_completed(taches), 1):
+                e_y, u, r, c = tache.result()
+                j = lignes[e_y]
+                commandes[j], residus[j], couts[j] = u, r, c
+                if progression is not None:
+                    progression(fait, len(taches))
+
+        reference = SimulerTrajectoire(lat=0, lon=0, N=N, x_0=[0., 0.])
+        time_vec, _ = ImportVent(0, 0, N=N).profil_descente()
+        v = reference.calcul_profil_vitesse(reference.calcul_altitude(time_vec))
+        return cls(grille, grille, commandes, residus, couts, v, time_vec[-1] / (N - 1), psi_0)
+
+    def enregistrer(self, chemin):
+        """
+        Enregistre la table dans un fichier `.npz`.
+
+        :param chemin: Chemin du fichier.
+        :type chemin: str
+        """
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as fichier:
+            np.savez(fichier, decalages_x=self.decalages_x, decalages_y=self.decalages_y,
+                     commandes=self.commandes, residus=self.residus, couts=self.couts, v=self.v,
+                     dt=self.dt, psi_0=self.psi_0)
+        os.replace(temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        Relit une table enregistrée par `enregistrer`.
+
+        :param chemin: Chemin du fichier.
+        :type chemin: str
+        :return: Table.
+        :rtype: TableApercu
+        """
+        with np.load(chemin) as donnees:
+            return cls(donnees["decalages_x"], donnees["decalages_y"], donnees["commandes"], donnees["residus"],
+                       donnees["couts"], donnees["v"], float(donnees["dt"]), float(donnees["psi_0"]))
+
+    def _interpoler(self, e):
+        """
+        Renvoie les indices et poids bilinéaires de décalages (M, 2), ramenés dans la grille.
+
+        :return: Tuple (j, i, s, t, excédent hors grille (M, 2)).
+        :rtype: tuple
+        """
+        bornes = np.array([[self.decalages_x[0], self.decalages_y[0]], [self.decalages_x[-1], self.decalages_y[-1]]])
+        dedans = np.clip(e, bornes[0], bornes[1])
+        fx = (dedans[:, 0] - self.decalages_x[0]) / (self.decalages_x[1] - self.decalages_x[0])
+        fy = (dedans[:, 1] - self.decalages_y[0]) / (self.decalages_y[1] - self.decalages_y[0])
+        i = np.minimum(fx.astype(int), len(self.decalages_x) - 2)
+        j = np.minimum(fy.astype(int), len(self.decalages_y) - 2)
+        return j, i, fy - j, fx - i, e - dedans
+
+    @staticmethod
+    def _bilineaire(tableau, j, i, s, t):
+        """Interpole `tableau` (ny, nx, ...) aux points (j + s, i + t)."""
+        forme = (-1,) + (1,) * (tableau.ndim - 2)
+        s, t = s.reshape(forme), t.reshape(forme)
+        return ((1 - s) * (1 - t) * tableau[j, i] + (1 - s) * t * tableau[j, i + 1]
+                + s * (1 - t) * tableau[j + 1, i] + s * t * tableau[j + 1, i + 1])
+
+    def evaluer(self, tableau, e):
+        """
+        Interpole un tableau de la grille (par exemple `couts` ou `efforts`) en des décalages effectifs.
+
+        :param tableau: Valeurs sur la grille, (ny, nx, ...).
+        :type tableau: np.ndarray
+        :param e: Décalages effectifs (M, 2), ramenés dans la grille.
+        :type e: np.ndarray
+        :return: Valeurs interpolées (M, ...).
+        :rtype: np.ndarray
+        """
+        j, i, s, t, _ = self._interpoler(np.atleast_2d(np.asarray(e, dtype=float)))
+        return self._bilineaire(tableau, j, i, s, t)
+
+    def predire(self, x_0, cible, W):
+        """
+        Prévoit l'issue de l'optimisation pour un ou plusieurs cas, sans résolution.
+
+        La commande interpolée est ramenée à la norme v, rejouée sous le vent réel, puis la trajectoire
+        est corrigée linéairement dans le temps pour finir au point d'atterrissage interpolé.
+
+        :param x_0: Positions de départ, (2,), (2, 1) ou (M, 2).
+        :type x_0: array_like
+        :param cible: Position de la cible (2,).
+        :type cible: array_like
+        :param W: Vent, (2, N) ou (M, 2, N).
+        :type W: array_like
+        :return: Dictionnaire (atterrissage (M, 2), erreur (M,), cout (M,), trajectoire (M, 2, N),
+            commande (M, 2, N)).
+        :rtype: dict
+        """
+        x_0 = np.asarray(x_0, dtype=float)
+        x_0 = np.atleast_2d(x_0.reshape(-1, 2) if x_0.shape == (2, 1) else x_0)
+        cible = np.ravel(np.asarray(cible, dtype=float))
+        W = np.asarray(W, dtype=float)
+        if W.shape[-1] != self.N:
+            raise ValueError(f"Le vent a {W.shape[-1]} étapes, la table N = {self.N}")
+        derive = W[..., :self.N - 1].sum(axis=-1)
+        e = x_0 - cible + derive
+
+        j, i, s, t, excedent = self._interpoler(e)
+        residu = self._bilineaire(self.residus, j, i, s, t) + excedent
+        cout = self._bilineaire(self.couts, j, i, s, t)
+        u = self._bilineaire(self.commandes, j, i, s, t)
+        u *= self.v / np.maximum(np.linalg.norm(u, axis=1, keepdims=True), 1e-9)
+
+        atterrissage = cible + residu
+        trajectoire = propager(x_0, u, W, self.dt)
+        rampe = np.linspace(0., 1., self.N)
+        trajectoire += (atterrissage - trajectoire[:, :, -1])[:, :, None] * rampe
+        return {"atterrissage": atterrissage, "erreur": np.linalg.norm(residu, axis=1), "cout": cout,
+                "trajectoire": trajectoire, "commande": u}
+
+
+def chemin_table(N, psi_0=0.):
+    """
+    Renvoie le chemin de la table d'aperçu de (N, psi_0) dans le dossier du cache.
+
+    :return: Chemin du fichier.
+    :rtype: str
+    """
+    dossier = os.environ.get("PARACHUTE_CACHE_APERCU", DOSSIER_PAR_DEFAUT)
+    return os.path.join(dossier, f"table_{N}_{psi_0:+.3f}.npz")
+
+
+def table_apercu(N=31, psi_0=0., construire=True, attendre=False):
+    """
+    Renvoie la table d'aperçu du processus, lue sur disque si elle existe.
+
+    Sinon, et si `construire` est vrai, la construction est lancée dans un fil d'arrière-plan (une seule
+    à la fois) et None est renvoyé jusqu'à ce qu'elle soit enregistrée, sauf avec `attendre`. Si elle
+    échoue, None est renvoyé et la demande suivante la relance.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param psi_0: Cap initial imposé (rad).
+    :type psi_0: float
+    :param construire: Lancer la construction si la table n'existe pas.
+    :type construire: bool
+    :param attendre: Attendre la fin d'une construction en cours plutôt que renvoyer None.
+    :type attendre: bool
+    :return: Table, ou None si elle n'est pas encore disponible.
+    :rtype: TableApercu
+    """
+    cle = (N, round(psi_0, 3))
+    chemin = chemin_table(N, psi_0)
+    with _VERROU:
+        if cle in _tables:
+            return _tables[cle]
+        if os.path.exists(chemin):
+            _tables[cle] = TableApercu.charger(chemin)
+            return _tables[cle]
+        if construire and cle not in _constructions:
+            def tache():
+                try:
+                    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+                    TableApercu.construire(N, psi_0=psi_0).enregistrer(chemin)
+                finally:
+                    # En cas d'échec, la prochaine demande relance la construction
+                    with _VERROU:
+                        del _constructions[cle]
+            _constructions[cle] = threading.Thread(target=tache, daemon=True)
+            _constructions[cle].start()
+        fil = _constructions.get(cle)
+    if not attendre or fil is None:
+        return None
+    fil.join()
+    return table_apercu(N, psi_0, construire=False)
+
+
+def main(N=31, etendue=3000., pas=150.):
+    """Construit et enregistre la table d'aperçu de N étapes dans le dossier du cache."""
+    chemin = chemin_table(N)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    table = TableApercu.construire(N, etendue, pas, progression=lambda fait, total: print(
+        f"\r{fait}/{total} lignes", end="", flush=True))
+    table.enregistrer(chemin)
+    print(f"\nTable {table.couts.shape} enregistrée dans {chemin}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]], *[float(a) for a in sys.argv[2:4]])
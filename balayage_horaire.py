@@ -0,0 +1,128 @@
+"""
+Ce module balaie les heures de prévision pour trouver la meilleure heure de largage d'un site.
+
+Responsable de :
+    - récupérer une seule fois le vent de toutes les heures (`ProfilVent`),
+    - lancer l'optimisation de trajectoire de chaque heure (ou d'une fenêtre d'heures)
+      sur un pool de processus, depuis un même point de départ pour que les heures soient comparables,
+    - remonter la progression au fur et à mesure que les résultats arrivent,
+    - classer les heures par erreur d'atterrissage, puis coût de commande.
+
+Chaque processus garde en cache le problème compilé de sa taille (`obtenir_gabarit`,
+`obtenir_socp_direct`) : seule la première heure traitée par un processus paie la construction.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from importer_vent import ProfilVent, profil_vent
+from simultion_final import SimulerTrajectoire
+
+# En dessous de cette erreur (m), les heures sont départagées par le coût de commande
+TOLERANCE_ATTERRISSAGE = 1.
+
+
+def optimiser_heure(lat, lon, heure, x_0, profil, backend="direct", solveur="ECOS"):
+    """
+    Optimise la trajectoire d'une heure de largage (exécuté dans un processus du pool).
+
+    :param lat: Latitude de la cible.
+    :type lat: float
+    :param lon: Longitude de la cible.
+    :type lon: float
+    :param heure: Index horaire de largage (entier ou fractionnaire).
+    :type heure: float
+    :param x_0: Position de départ.
+    :type x_0: array-like
+    :param profil: Profil de vent réduit à cette heure (une tranche, pour limiter les échanges).
+    :type profil: ProfilVent
+    :param backend: Backend de résolution ("cvxpy" ou "direct").
+    :type backend: str
+    :param solveur: Solveur conique.
+    :type solveur: str
+    :return: Résultat de l'heure (heure, erreur, cout_controle, n_iter, converge, message).
+    :rtype: dict
+    """
+    simulateur = SimulerTrajectoire(lat=lat, lon=lon, N=profil.tenseur.shape[2], backend=backend,
+                                    solveur=solveur, profil_vent=profil, x_0=x_0)
+    try:
+        _, erreur, _, _, _ = simulateur.optimiser_trajectoire()
+    except (ValueError, ArithmeticError) as e:
+        return {"heure": heure, "erreur": np.inf, "cout_controle": np.inf, "n_iter": None,
+                "converge": False, "message": str(e)}
+    return {"heure": heure, "erreur": float(erreur), "cout_controle": simulateur.calcul_cout_controle(),
+            "n_iter": simulateur.n_iter, "converge": simulateur.converge, "message": ""}
+
+
+def classer(resultats, tolerance=TOLERANCE_ATTERRISSAGE):
+    """
+    Trie les résultats : heures résolues d'abord, par erreur d'atterrissage au-delà de `tolerance`,
+    puis par coût de commande.
+
+    :param resultats: Résultats de `optimiser_heure`.
+    :type resultats: list
+    :param tolerance: Erreur (m) sous laquelle deux atterrissages sont jugés équivalents.
+    :type tolerance: float
+    :return: Résultats triés.
+    :rtype: list
+    """
+    return sorted(resultats, key=lambda r: (not r["converge"], max(r["erreur"] - tolerance, 0.),
+                                            r["cout_controle"], r["heure"]))
+
+
+def balayer_heures(lat, lon, heures=None, x_0=None, N=31, backend="direct", solveur="ECOS",
+                   processus=None, progression=None, profil=None, random_range=600):
+    """
+    Optimise la trajectoire de chaque heure de largage en parallèle et classe les heures.
+
+    :param lat: Latitude de la cible.
+    :type lat: float
+    :param lon: Longitude de la cible.
+    :type lon: float
+    :param heures: Index horaires à évaluer (par défaut : toutes les heures de la prévision).
+    :type heures: iterable
+    :param x_0: Position de départ commune ; par défaut, tirée une fois comme dans `SimulerTrajectoire`.
+    :type x_0: array-like
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param backend: Backend de résolution ("cvxpy" ou "direct").
+    :type backend: str
+    :param solveur: Solveur conique.
+    :type solveur: str
+    :param processus: Nombre de processus (par défaut : nombre de cœurs).
+    :type processus: int
+    :param progression: Fonction appelée à chaque résultat avec (nombre terminé, total, résultat).
+    :type progression: callable
+    :param profil: Profil de vent du site déjà calculé (sinon récupéré via `profil_vent`).
+    :type profil: ProfilVent
+    :param random_range: Amplitude du tirage de `x_0` s'il n'est pas fourni.
+    :type random_range: float
+    :return: Résultats classés (voir `optimiser_heure`), avec l'horodatage de chaque heure.
+    :rtype: list
+    """
+    if profil is None:
+        profil = profil_vent(lat, lon, N)
+    heures = list(range(len(profil))) if heures is None else list(heures)
+    if x_0 is None:
+        x_0 = [lat + np.random.uniform(-random_range, random_range),
+               lon + np.random.uniform(-random_range, random_range)]
+    tranches = profil.balayage(heures)
+
+    resultats = []
+    with ProcessPoolExecutor(max_workers=processus or os.cpu_count()) as pool:
+        taches = [pool.submit(optimiser_heure, lat, lon, h, x_0,
+                              ProfilVent(tranches[[k]], profil.z_t, profil.time), backend, solveur)
+                  for k, h in enumerate(heures)]
+        for tache in as_completed(taches):
+            resultat = tache.result()
+            if profil.heures is not None and float(resultat["heure"]).is_integer():
+                resultat["horodatage"] = profil.heures[int(resultat["heure"])]
+            resultats.append(resultat)
+            if progression:
+                progression(len(resultats), len(taches), resultat)
+    return classer(resultats)
@@ -0,0 +1,91 @@
+"""
+apercu.py - Précision et temps de réponse de la table d'aperçu (`apercu.TableApercu`).
+
+Construit une table sur une grille de décalages effectifs, puis, sur des cas sans appel réseau
+(départs aléatoires, vents synthétiques avec moyenne et cisaillement tirés au hasard), compare la
+prévision à la résolution exacte et affiche :
+    - le temps de construction de la table,
+    - le temps de prévision d'un cas et d'un lot de 10 000 cas,
+    - les écarts de coût, d'erreur d'atterrissage et de trajectoire entre prévision et résolution à froid,
+    - les mêmes écarts quand la résolution exacte est amorcée par la commande prévue, et son gain de temps.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.apercu
+    python -m benchmarks.apercu 300 20
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from apercu import TableApercu
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+
+N = 31
+LOT = 10000
+
+
+def vent_aleatoire(rng, time_vec):
+    """Tire un vent (2, N) : moyenne, cisaillement linéaire le long de la descente et rafales."""
+    hauteur = 1. - time_vec / time_vec[-1]
+    moyenne, cisaillement = rng.normal(0., 3., (2, 1)), rng.normal(0., 2., (2, 1))
+    return moyenne + cisaillement * (hauteur - 0.5) + rng.normal(0., 1., (2, len(time_vec)))
+
+
+def main(pas=150., cas=20):
+    """
+    Affiche temps de construction et de prévision, puis les écarts à la résolution exacte.
+
+    :param pas: Pas de la grille de la table (m).
+    :type pas: float
+    :param cas: Nombre de cas comparés à la résolution exacte.
+    :type cas: int
+    """
+    debut = time.perf_counter()
+    table = TableApercu.construire(N, pas=pas)
+    print(f"table {table.couts.shape} construite en {time.perf_counter() - debut:.1f} s")
+
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    rng = np.random.default_rng(0)
+    departs = rng.uniform(-600., 600., (LOT, 2))
+    vents = np.array([vent_aleatoire(rng, time_vec) for _ in range(LOT)])
+    debut = time.perf_counter()
+    for k in range(100):
+        table.predire(departs[k], [0., 0.], vents[k])
+    unitaire = (time.perf_counter() - debut) / 100
+    debut = time.perf_counter()
+    table.predire(departs, [0., 0.], vents)
+    lot = time.perf_counter() - debut
+    print(f"prévision : {1e6 * unitaire:.0f} µs par cas, {1e6 * lot / LOT:.1f} µs par cas en lot de {LOT}")
+
+    ecarts = {"froid": [], "amorcé": []}
+    for k in range(cas):
+        prevision = table.predire(departs[k], [0., 0.], vents[k])
+        for nom in ecarts:
+            simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", x_0=departs[k],
+                                            profil_vent=ProfilVent(vents[k][None], z_t, time_vec))
+            debut = time.perf_counter()
+            if nom == "froid":
+                _, erreur, _, _, _ = simulateur.optimiser_trajectoire()
+            else:
+                _, erreur, _, _, _ = simulateur.optimiser_trajectoire(
+                    prevision["commande"][0], prevision["trajectoire"][0], rayon_initial=0.)
+            duree = time.perf_counter() - debut
+            ecart = np.sqrt(np.mean((prevision["trajectoire"][0] - simulateur.x_star) ** 2))
+            ecarts[nom].append((simulateur.cout - prevision["cout"][0], abs(erreur - prevision["erreur"][0]),
+                                ecart, duree, simulateur.n_iter))
+
+    for nom, valeurs in ecarts.items():
+        cout, erreur, trajectoire, duree, resolutions = np.array(valeurs).T
+        print(f"résolution {nom:7s} : coût exact - prévu {np.mean(cout):+.3f} (max {np.max(np.abs(cout)):.3f}), "
+              f"écart d'erreur max {np.max(erreur):.2E} m, écart de trajectoire médian {np.median(trajectoire):.1f} m, "
+              f"{np.mean(duree) * 1000:.0f} ms et {np.mean(resolutions):.1f} résolutions par cas")
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:2]], *[int(a) for a in sys.argv[2:3]])
@@ -0,0 +1,89 @@
+"""
+backend_direct.py - Comparaison des backends "cvxpy" et "direct" sur un sous-problème SCP.
+
+Pour chaque N et chaque étape, charge les mêmes données (vent synthétique, départ, cible,
+linéarisation) dans `GabaritSCP` et `SOCPDirect`, puis affiche :
+    - l'écart relatif entre les valeurs optimales,
+    - le temps moyen d'une résolution pour chaque backend.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.backend_direct
+    python -m benchmarks.backend_direct 31 250
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+import cvxpy as cvx
+
+from gabarit_scp import GabaritSCP
+from socp_direct import SOCPDirect
+
+VALEURS_N = [31, 101, 301]
+REPETITIONS = 20
+TOLERANCE_RELATIVE = 1e-4
+
+
+def donnees_synthetiques(N, graine=0):
+    """
+    Construit un cas de guidage reproductible sans appel réseau.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param graine: Graine du générateur aléatoire.
+    :type graine: int
+    :return: Arguments positionnels de `charger`.
+    :rtype: tuple
+    """
+    rng = np.random.default_rng(graine)
+    v = np.linspace(20., 15., N)
+    W = rng.normal(0., 3., (2, N))
+    u_bar = np.vstack([np.ones(N), 0.05 * rng.normal(size=N)])
+    u_bar /= np.linalg.norm(u_bar, axis=0)
+    return W, [100., -50.], [300., 200.], v, 60. / (N - 1), [v[0], 0.], u_bar
+
+
+def chronometrer(modele, etape, options):
+    """
+    Résout une étape plusieurs fois et renvoie le dernier résultat et le temps moyen.
+
+    :return: Tuple (résultat de `resoudre`, temps moyen en secondes).
+    :rtype: tuple
+    """
+    resultat = modele.resoudre(etape, **options)
+    debut = time.perf_counter()
+    for _ in range(REPETITIONS):
+        resultat = modele.resoudre(etape, **options)
+    return resultat, (time.perf_counter() - debut) / REPETITIONS
+
+
+def main(valeurs_n=VALEURS_N):
+    """
+    Affiche, pour chaque N et chaque étape, l'écart des valeurs optimales et les temps de résolution.
+
+    :return: Vrai si tous les écarts sont sous `TOLERANCE_RELATIVE`.
+    :rtype: bool
+    """
+    print("N\t étape\t écart relatif\t cvxpy (ms)\t direct (ms)")
+    conforme = True
+    for N in valeurs_n:
+        gabarit, direct = GabaritSCP(N), SOCPDirect(N)
+        donnees = donnees_synthetiques(N)
+        gabarit.charger(*donnees)
+        direct.charger(*donnees)
+        for etape in (1, 2):
+            (valeur_cvxpy, _, _), t_cvxpy = chronometrer(gabarit, etape, {"solver": cvx.ECOS})
+            (valeur_direct, _, _), t_direct = chronometrer(direct, etape, {})
+            ecart = abs(valeur_direct - valeur_cvxpy) / max(1., abs(valeur_cvxpy))
+            conforme &= ecart < TOLERANCE_RELATIVE
+            print(f"{N}\t {etape}\t {ecart:10.2E}\t {1000 * t_cvxpy:8.2f}\t {1000 * t_direct:8.2f}")
+    print("Résultats conformes" if conforme else "ÉCART AU-DELÀ DE LA TOLÉRANCE")
+    return conforme
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or VALEURS_N)
@@ -0,0 +1,69 @@
+"""
+boucle_fermee.py - Banc d'essai du guidage en boucle fermée (`GuidageMPC`) face à un cycle de commande.
+
+Sur un cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), simule plusieurs
+descentes sous des vents perturbés (biais et rafales) et affiche pour chaque backend :
+    - l'erreur d'atterrissage en boucle ouverte et en boucle fermée,
+    - les percentiles de latence et le nombre de replis sur le dernier plan,
+    - l'histogramme des latences de re-résolution, à comparer au budget.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.boucle_fermee
+    python -m benchmarks.boucle_fermee 0.05 20
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+
+import numpy as np
+
+from guidage_mpc import GuidageMPC, histogramme_latence
+from importer_vent import ImportVent, ProfilVent
+from propagation import atterrissages
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+N = 31
+BACKENDS = ["direct", "cvxpy"]
+
+
+def main(budget=0.1, descentes=10):
+    """
+    Affiche erreurs, latences et replis de `descentes` descentes en boucle fermée pour chaque backend.
+
+    :param budget: Budget de latence par re-résolution, en secondes.
+    :type budget: float
+    :param descentes: Nombre de descentes simulées par backend.
+    :type descentes: int
+    """
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    W = cas_synthetique(N)[0]
+    rng = np.random.default_rng(0)
+    vents = [W + rng.normal(0., 1., (2, 1)) + rng.normal(0., .5, (2, N)) for _ in range(descentes)]
+
+    for backend in BACKENDS:
+        simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend=backend, x_0=[200., -300.],
+                                        profil_vent=ProfilVent(W[None], z_t, time_vec))
+        guidage = GuidageMPC(simulateur, budget=budget)
+        guidage.prechauffer()
+        ouverte, fermee, latences, replis = [], [], [], 0
+        for W_reel in vents:
+            ouverte.append(np.linalg.norm(atterrissages(simulateur.x_0, simulateur.u_star, W_reel, simulateur.dt)))
+            resultat = guidage.executer(W_reel)
+            fermee.append(resultat["erreur"])
+            latences.extend(resultat["latences"])
+            replis += resultat["replis"]
+
+        p50, p95, p100 = 1000 * np.percentile(latences, [50, 95, 100])
+        print(f"\n{backend} : erreur moyenne {np.mean(ouverte):.2f} m (boucle ouverte) -> {np.mean(fermee):.2f} m "
+              f"(boucle fermée), {replis}/{len(latences)} replis")
+        print(f"latence p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {p100:.1f} ms (budget {1000 * budget:.0f} ms)")
+        effectifs, bornes = histogramme_latence(latences)
+        for effectif, borne in zip(effectifs, bornes):
+            print(f"{borne:6.0f} ms {'#' * int(np.ceil(60 * effectif / max(effectifs)))} {effectif}")
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:2]], *[int(a) for a in sys.argv[2:3]])
@@ -0,0 +1,75 @@
+"""
+cache_trajectoires.py - Résolutions à froid et résolutions servies ou amorcées par `CacheTrajectoires`.
+
+Sur un cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), rejoue une suite de
+demandes dont les points de départ sont regroupés autour de quelques positions (petites variations et
+demandes répétées, comme des clics voisins sur la carte), d'abord sans cache puis avec un cache vide
+dans un dossier temporaire, et affiche pour chacune :
+    - le temps total et le nombre de résolutions,
+    - l'erreur d'atterrissage et le coût moyens,
+    - les taux de succès, d'amorçage et d'échec du cache.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.cache_trajectoires
+    python -m benchmarks.cache_trajectoires 121 200
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from cache_trajectoires import CacheTrajectoires
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+N = 31
+DEMANDES = 80
+POSITIONS = 20
+
+
+def main(N=N, demandes=DEMANDES):
+    """
+    Affiche temps, résolutions, erreurs et coûts des demandes sans cache puis avec cache.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param demandes: Nombre de demandes rejouées.
+    :type demandes: int
+    """
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+    rng = np.random.default_rng(0)
+    centres = rng.uniform(-600., 600., (POSITIONS, 2))
+    # Une demande sur trois tombe exactement sur sa position, les autres s'en écartent de quelques dizaines de m
+    departs = [centres[i % POSITIONS] + (rng.normal(0., 30., 2) if i % 3 else 0.) for i in range(demandes)]
+
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = CacheTrajectoires(dossier)
+        for nom in ("sans cache", "avec cache"):
+            duree, resolutions, erreurs, couts = 0., 0, [], []
+            for x_0 in departs:
+                simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", x_0=x_0, profil_vent=profil)
+                debut = time.perf_counter()
+                if nom == "sans cache":
+                    _, erreur, _, _, _ = simulateur.optimiser_trajectoire()
+                else:
+                    _, erreur, _, _, _ = cache.optimiser(simulateur)
+                duree += time.perf_counter() - debut
+                resolutions += simulateur.n_iter
+                erreurs.append(erreur)
+                couts.append(simulateur.cout)
+            print(f"{nom:10s} : {duree:.2f} s, {resolutions} résolutions, erreur moyenne {np.mean(erreurs):.2E} m, "
+                  f"coût moyen {np.mean(couts):.4f}")
+        taux = cache.taux()
+        print(f"{taux['demandes']} demandes : {100 * taux['succes']:.0f} % servies sans résolution, "
+              f"{100 * taux['amorces']:.0f} % amorcées, {100 * taux['echecs']:.0f} % sans voisin")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,42 @@
+"""
+calibration_solveurs.py - Banc d'essai des solveurs coniques et écriture de la calibration "auto".
+
+Chronomètre chaque solveur conique installé sur le cas synthétique de `solveurs.cas_synthetique`,
+affiche le temps moyen par résolution (ou "échec" s'il ne converge pas vers la solution d'ECOS)
+et enregistre le résultat dans `calibration_solveurs.json`, lu par le mode `solveur="auto"`.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.calibration_solveurs
+    python -m benchmarks.calibration_solveurs 31 101 301 1001
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+
+from solveurs import FICHIER_CALIBRATION, calibrer, choisir_solveur
+
+VALEURS_N = [31, 101, 301]
+
+
+def main(valeurs_n=VALEURS_N):
+    """
+    Calibre les solveurs, affiche le tableau des temps et le choix "auto" pour chaque N.
+
+    :param valeurs_n: Tailles de problème à calibrer.
+    :type valeurs_n: list
+    :return: Calibration enregistrée.
+    :rtype: dict
+    """
+    calibration = calibrer(valeurs_n)
+    for N, temps in calibration["temps"].items():
+        print(f"N = {N} (auto : {choisir_solveur(int(N))})")
+        for nom, duree in sorted(temps.items(), key=lambda item: (item[1] is None, item[1])):
+            print(f"    {nom:10s} {'échec' if duree is None else f'{1000 * duree:8.2f} ms'}")
+    print(f"Calibration écrite dans {FICHIER_CALIBRATION}")
+    return calibration
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or VALEURS_N)
@@ -0,0 +1,73 @@
+"""
+carp.py - Point de largage calculé (`carp.placer_largage`) face au départ aléatoire d'origine.
+
+Construit une table d'aperçu, puis, pour plusieurs vents synthétiques (moyenne et rafales tirées au
+hasard, sans appel réseau), calcule le point de largage et affiche :
+    - la durée du calcul (table et contour déjà en mémoire) et l'aire de la région de largage,
+    - l'effort de contrôle prévu, puis obtenu et l'erreur d'atterrissage de la résolution exacte amorcée,
+    - l'effort de contrôle de départs tirés comme dans `SimulerTrajectoire` (à `random_range` de la cible).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.carp
+    python -m benchmarks.carp 150 10
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from apercu import TableApercu
+from carp import placer_largage
+from empreinte import contour_atteignable
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+
+N = 31
+DEPARTS_ALEATOIRES = 10
+
+
+def aire(polygone):
+    """Renvoie l'aire d'un polygone (K, 2) par la formule du lacet."""
+    x, y = polygone.T
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def main(pas=300., vents=5):
+    """
+    Affiche, pour chaque vent, la durée du calcul, les efforts prévu et obtenu, et ceux des départs aléatoires.
+
+    :param pas: Pas de la grille de la table d'aperçu (m).
+    :type pas: float
+    :param vents: Nombre de vents tirés.
+    :type vents: int
+    """
+    table = TableApercu.construire(N, pas=pas)
+    contour_atteignable(N)
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    rng = np.random.default_rng(0)
+    print("durée (ms)\t aire (km²)\t effort prévu\t effort exact\t erreur (m)\t effort aléatoire (min / médian)")
+    for _ in range(vents):
+        W = rng.normal(0., 3., (2, 1)) + rng.normal(0., 1., (2, N))
+        profil = ProfilVent(W[None], z_t, time_vec)
+        simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", profil_vent=profil)
+        debut = time.perf_counter()
+        carp = placer_largage(simulateur, table=table)
+        duree = time.perf_counter() - debut
+        _, erreur, _, _, _ = simulateur.optimiser_trajectoire(*carp["amorce"], rayon_initial=0.)
+
+        aleatoires = []
+        for _ in range(DEPARTS_ALEATOIRES):
+            reference = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", profil_vent=profil)
+            reference.optimiser_trajectoire()
+            aleatoires.append(reference.calcul_cout_controle())
+        print(f"{1000 * duree:.1f}\t\t {aire(carp['region']) / 1e6:.1f}\t\t {carp['effort']:.4f}\t"
+              f"\t {simulateur.calcul_cout_controle():.4f}\t\t {erreur:.1E}\t\t"
+              f" {min(aleatoires):.4f} / {np.median(aleatoires):.4f}")
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:2]], *[int(a) for a in sys.argv[2:3]])
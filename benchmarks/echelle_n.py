@@ -0,0 +1,80 @@
+"""
+echelle_n.py - Banc d'essai du coût de construction du problème de guidage en fonction de N.
+
+Pour chaque N, mesure :
+    - la construction du graphe d'expressions cvxpy (`GabaritSCP`),
+    - la canonicalisation vers les matrices du solveur (sans cache DPP),
+    - le temps d'une résolution ECOS dans le mode retenu par le gabarit (DPP ou non),
+puis estime la pente log-log de construction + canonicalisation entre le plus petit et le plus
+grand N. Une pente inférieure ou égale à 1 indique une croissance au plus linéaire.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.echelle_n
+    python -m benchmarks.echelle_n 31 250 2000
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+import cvxpy as cvx
+
+from gabarit_scp import GabaritSCP
+
+VALEURS_N = [31, 62, 125, 250, 500, 1000, 2000]
+
+
+def mesurer(N):
+    """
+    Mesure les temps de construction, de canonicalisation et de résolution pour N étapes.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :return: Tuple (construction, canonicalisation, résolution) en secondes.
+    :rtype: tuple
+    """
+    debut = time.perf_counter()
+    gabarit = GabaritSCP(N)
+    construction = time.perf_counter() - debut
+
+    v = np.full(N, 18.5)
+    u_bar = np.vstack([np.ones(N), np.zeros(N)])
+    gabarit.charger(np.zeros((2, N)), np.zeros(2), np.full(2, 100.), v, 1.0, v[0] * u_bar[:, [0]], u_bar)
+
+    debut = time.perf_counter()
+    gabarit.etape_1.get_problem_data(cvx.ECOS, ignore_dpp=True)
+    canonicalisation = time.perf_counter() - debut
+
+    gabarit.resoudre(1, solver=cvx.ECOS)
+    debut = time.perf_counter()
+    gabarit.resoudre(1, solver=cvx.ECOS)
+    resolution = time.perf_counter() - debut
+    return construction, canonicalisation, resolution
+
+
+def main(valeurs_n=VALEURS_N):
+    """
+    Affiche le tableau des temps et la pente log-log du temps de construction.
+
+    :param valeurs_n: Tailles de problème à mesurer, dans l'ordre croissant.
+    :type valeurs_n: list
+    :return: Pente log-log de construction + canonicalisation.
+    :rtype: float
+    """
+    print("N\t construction (s)\t canonicalisation (s)\t résolution (s)")
+    totaux = []
+    for N in valeurs_n:
+        construction, canonicalisation, resolution = mesurer(N)
+        totaux.append(construction + canonicalisation)
+        print(f"{N}\t {construction:10.4f}\t\t {canonicalisation:10.4f}\t\t {resolution:10.4f}")
+
+    pente = np.polyfit(np.log(valeurs_n), np.log(totaux), 1)[0]
+    print(f"Pente log-log de la construction : {pente:.2f} (1 = linéaire, 2 = quadratique)")
+    return pente
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or VALEURS_N)
@@ -0,0 +1,82 @@
+"""
+empreinte.py - Coût et qualité du contour atteignable (`empreinte.contour_atteignable`).
+
+Sur un cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), compare le calcul des
+rayons à froid (chaque rayon part du cap constant) et le balayage amorcé de rayon en rayon, puis affiche :
+    - la durée de chaque méthode et la portée minimale, moyenne et maximale du contour,
+    - la durée d'une empreinte servie par le cache (site, heure),
+    - une vérification : des cibles tirées dans l'empreinte sont atteintes, celles tirées hors de
+      l'empreinte agrandie de 10 % ne le sont pas.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.empreinte
+    python -m benchmarks.empreinte 144
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from empreinte import PORTEE, contour_atteignable, empreinte, marges
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+N = 31
+VERIFICATIONS = 10
+
+
+def rayons_a_froid(profil, n_rayons):
+    """Résout chaque rayon indépendamment, depuis le cap constant, et renvoie les points d'atterrissage."""
+    points = []
+    for angle in 2 * np.pi * np.arange(n_rayons) / n_rayons:
+        simulateur = SimulerTrajectoire(PORTEE * np.cos(angle), PORTEE * np.sin(angle), N, backend="direct",
+                                        x_0=[0., 0.], profil_vent=profil)
+        simulateur.optimiser_trajectoire(etape_max=1)
+        points.append(simulateur.x_star[:, -1])
+    return np.array(points)
+
+
+def main(n_rayons=72):
+    """Affiche durées et portées des deux méthodes, puis la vérification par résolutions exactes."""
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    sans_vent = ProfilVent(np.zeros((1, 2, N)), z_t, time_vec)
+    profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+
+    for nom, calcul in (("à froid", lambda: rayons_a_froid(sans_vent, n_rayons)),
+                        ("amorcé", lambda: contour_atteignable(N, n_rayons=n_rayons))):
+        debut = time.perf_counter()
+        contour = calcul()
+        portees = np.linalg.norm(contour, axis=1)
+        print(f"{nom:8s} : {time.perf_counter() - debut:.2f} s, portée min {portees.min():.0f} m, "
+              f"moyenne {portees.mean():.0f} m, max {portees.max():.0f} m")
+
+    empreinte(0., 0., profil=profil, n_rayons=n_rayons)
+    debut = time.perf_counter()
+    zone = empreinte(0., 0., profil=profil, n_rayons=n_rayons)
+    print(f"empreinte servie par le cache en {1e6 * (time.perf_counter() - debut):.0f} µs, "
+          f"dérive du vent {np.linalg.norm(zone.derive):.0f} m")
+
+    xs, ys, marge = zone.raster()
+    points = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+    agrandie = (zone.contour - zone.derive) * 1.1 + zone.derive
+    rng = np.random.default_rng(0)
+    dedans = points[marge.ravel() > 100.]
+    bas, haut = agrandie.min(axis=0) - 300., agrandie.max(axis=0) + 300.
+    dehors = rng.uniform(bas, haut, (1000, 2))
+    dehors = dehors[marges(agrandie, dehors) == 0.]
+    for nom, cibles in (("dans l'empreinte", dedans), ("hors de l'empreinte (+10 %)", dehors)):
+        erreurs = []
+        for cible in cibles[rng.choice(len(cibles), VERIFICATIONS)]:
+            simulateur = SimulerTrajectoire(cible[0], cible[1], N, backend="direct", x_0=[0., 0.], profil_vent=profil)
+            _, erreur, _, _, _ = simulateur.optimiser_trajectoire(etape_max=1)
+            erreurs.append(erreur)
+        print(f"{nom:28s} : erreur d'atterrissage min {min(erreurs):.2f} m, max {max(erreurs):.2f} m")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,71 @@
+"""
+flotte.py - Passage à l'échelle de la planification de flotte (`flotte.planifier_flotte`).
+
+Sans appel réseau (vent synthétique de `solveurs.cas_synthetique`, commun à tous les groupes), planifie
+1, 10, 30 puis 100 charges réparties sur quelques sites et affiche :
+    - la durée totale de l'appel, la durée moyenne de résolution d'une charge et le débit (charges/s),
+    - l'erreur d'atterrissage maximale,
+puis, pour une rangée de charges larguées et posées à 20 m les unes des autres, la distance minimale en
+vol et l'effort de contrôle sans et avec la contrainte de séparation conjointe.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.flotte
+    python -m benchmarks.flotte 1 10 30 100
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+
+import numpy as np
+
+from flotte import planifier_flotte, vers_geographique
+from importer_vent import ImportVent, ProfilVent
+from solveurs import cas_synthetique
+
+N = 31
+SITES = [[48.85, 2.35], [45.76, 4.84], [43.60, 1.44]]
+SEPARATION = 50.
+RANGEE = 5
+
+
+def flotte_aleatoire(K, rng):
+    """Tire K cibles autour des sites et un point de largage à moins de 1 km de chaque cible."""
+    sites = rng.integers(len(SITES), size=K)
+    cibles = np.array([vers_geographique(SITES[s], rng.uniform(-300., 300., 2))[0] for s in sites])
+    largages = np.array([vers_geographique(c, rng.uniform(-700., 700., 2))[0] for c in cibles])
+    return cibles, largages
+
+
+def main(tailles=(1, 10, 30, 100)):
+    """Affiche le passage à l'échelle, puis l'effet de la séparation conjointe."""
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+    rng = np.random.default_rng(0)
+
+    print("charges\t durée totale (s)\t résolution moyenne (ms)\t débit (charges/s)\t erreur max (m)")
+    for K in tailles:
+        cibles, largages = flotte_aleatoire(K, rng)
+        resultat = planifier_flotte(cibles, largages, N=N, profil=profil)
+        durees = [c["duree"] for c in resultat["charges"]]
+        erreur = max(c["erreur"] for c in resultat["charges"])
+        print(f"{K}\t {resultat['duree_totale']:.2f}\t\t\t {1000 * np.mean(durees):.0f}\t\t\t\t"
+              f" {K / resultat['duree_totale']:.1f}\t\t\t {erreur:.2f}")
+
+    centre = SITES[0]
+    rangee = np.stack([20. * np.arange(RANGEE), np.zeros(RANGEE)], axis=1)
+    cibles = vers_geographique(centre, rangee)
+    largages = vers_geographique(centre, rangee + [-300., -400.])
+    print(f"\n{RANGEE} charges à 20 m d'intervalle, séparation demandée {SEPARATION:.0f} m :")
+    for separation in (None, SEPARATION):
+        resultat = planifier_flotte(cibles, largages, N=N, profil=profil, separation=separation)
+        efforts = [c["cout_controle"] for c in resultat["charges"]]
+        erreur = max(c["erreur"] for c in resultat["charges"])
+        print(f"  {'conjointe' if separation else 'indépendante':12s} : distance min {resultat['separation_min']:.1f} m,"
+              f" effort moyen {np.mean(efforts):.3f}, erreur max {erreur:.2f} m,"
+              f" durée {resultat['duree_totale']:.2f} s (conjointe {resultat['duree_conjointe']:.2f} s)")
+
+
+if __name__ == "__main__":
+    main(*[tuple(int(a) for a in sys.argv[1:])] if len(sys.argv) > 1 else [])
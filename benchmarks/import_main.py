@@ -0,0 +1,73 @@
+"""
+import_main.py - Temps d'import du point d'entrée et des modules de calcul, dans un interpréteur neuf.
+
+Pour chaque module, lance `python -c "import <module>"` plusieurs fois (sans cache d'import chaud partagé
+entre les essais autre que celui du système de fichiers) et affiche :
+    - la durée médiane de l'import, hors démarrage de l'interpréteur (mesuré avec `python -c pass`),
+    - les bibliothèques lourdes chargées par l'import (cvxpy, matplotlib, folium, plotly...), qui ne
+      doivent l'être qu'à leur première utilisation.
+
+Le code de sortie est 1 si `import main` dépasse `BUDGET` ou si un module charge une bibliothèque lourde :
+le benchmark sert aussi de vérification.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.import_main
+    python -m benchmarks.import_main 0.1
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Durée maximale de `import main` (s), démarrage de l'interpréteur déduit
+BUDGET = 0.2
+ESSAIS = 5
+LOURDES = ("cvxpy", "matplotlib", "folium", "plotly", "pandas", "scipy", "streamlit", "streamlit_folium",
+           "requests")
+# Module importé, bibliothèques lourdes qu'il a le droit de charger (Streamlit importe lui-même plotly)
+MODULES = (("main", ()), ("simultion_final", ()), ("carp", ()), ("dispersion", ()),
+           ("flotte", ()), ("vent_multi_sites", ()), ("streamlit_en_POO", ("streamlit", "plotly")))
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def mesurer(code):
+    """Renvoie (durée médiane d'exécution de `code` dans un interpréteur neuf, dernière sortie standard)."""
+    durees = []
+    for _ in range(ESSAIS):
+        debut = time.perf_counter()
+        sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, capture_output=True, text=True,
+                                check=True).stdout
+        durees.append(time.perf_counter() - debut)
+    return float(np.median(durees)), sortie
+
+
+def main(budget=BUDGET):
+    """Affiche durée et bibliothèques lourdes chargées par module, et renvoie le code de sortie."""
+    demarrage, _ = mesurer("pass")
+    print(f"démarrage de l'interpréteur : {1000 * demarrage:.0f} ms\n")
+    print("module\t\t\t import (ms)\t bibliothèques lourdes chargées")
+    hors_budget, interdits = False, False
+    for module, permises in MODULES:
+        code = f"import sys, {module}; print(' '.join(m for m in {LOURDES!r} if m in sys.modules))"
+        duree, sortie = mesurer(code)
+        chargees = sortie.split()
+        interdites = [m for m in chargees if m not in permises]
+        duree -= demarrage
+        interdits |= bool(interdites)
+        hors_budget |= module == "main" and duree > budget
+        print(f"{module:20s}\t {1000 * duree:.0f}\t\t {', '.join(chargees) or '-'}"
+              f"{'  <- interdit : ' + ', '.join(interdites) if interdites else ''}")
+    print(f"\nbudget de `import main` : {1000 * budget:.0f} ms -> {'dépassé' if hors_budget else 'respecté'}")
+    if interdits:
+        print("des bibliothèques lourdes sont chargées à l'import")
+    return int(hors_budget or interdits)
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[float(a) for a in sys.argv[1:2]]))
@@ -0,0 +1,84 @@
+"""
+interface.py - Effet des caches de l'interface Streamlit (`streamlit_en_POO`) sur une suite d'interactions.
+
+Sans appel réseau : la prévision est servie par un `ServeurMeteoLocal` (variable PARACHUTE_URL_METEO) et
+les caches disque (prévisions, trajectoires) sont redirigés vers un dossier temporaire, pour que seule la
+mise en mémoire de l'interface soit mesurée. Pour chaque interaction, rejoue les étapes qu'exécute un
+passage du script (prévision, profil de vent, tableau et graphiques météo, carte avec empreinte,
+simulation depuis un point de largage fixe, confiée à la file de travaux et attendue) et affiche :
+    - la durée de chaque étape et du passage complet,
+    - le nombre de requêtes reçues par le serveur de prévision.
+Interactions : premier affichage d'un site, simple ré-exécution (un widget sans rapport), changement
+d'heure, puis retour à l'heure de départ.
+
+Le point de largage optimal (`_point_largage`) n'est pas rejoué : il dépend de la présence de la table
+d'aperçus, construite en arrière-plan (voir `benchmarks.apercu` et `benchmarks.carp`).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.interface
+    python -m benchmarks.interface 61
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from serveur_meteo_local import ServeurMeteoLocal
+
+LAT, LON = 48.85, 2.35
+X_0 = (LAT - 600., LON - 800.)
+INTERACTIONS = (("premier affichage", 0), ("ré-exécution", 0), ("autre heure", 6), ("retour", 0))
+
+
+def simuler(ui, index_horaire, N):
+    """Soumet la simulation à la file de travaux, comme `InterfaceStreamlit.simuler`, et attend son résultat."""
+    file = ui.file_travaux_par_defaut()
+    cle = file.soumettre(("simulation", LAT, LON, index_horaire, N, "cvxpy", "ECOS", X_0), ui.tache_simulation,
+                         LAT, LON, index_horaire, N, "cvxpy", "ECOS", X_0, ui._profil_vent(LAT, LON, N))
+    return file.resultat(cle)
+
+
+def passage(ui, interface, index_horaire, N):
+    """Rejoue les étapes d'un passage du script et renvoie la durée de chacune (s)."""
+    interface.lat, interface.lon, interface.index_horaire, interface.N = LAT, LON, index_horaire, N
+    etapes = (("prévision", lambda: ui._meteo(LAT, LON)),
+              ("profil de vent", lambda: ui._profil_vent(LAT, LON, N)),
+              ("météo", lambda: ui._affichage_meteo(interface, LAT, LON, index_horaire)),
+              ("carte", lambda: ui._carte_localisation(interface, LAT, LON, index_horaire, N, "cible", True)),
+              ("simulation", lambda: simuler(ui, index_horaire, N)))
+    durees = {}
+    for nom, etape in etapes:
+        debut = time.perf_counter()
+        etape()
+        durees[nom] = time.perf_counter() - debut
+    return durees
+
+
+def main(N=31):
+    """Affiche, pour chaque interaction, la durée des étapes et les requêtes de prévision."""
+    with ServeurMeteoLocal() as serveur, tempfile.TemporaryDirectory() as dossier:
+        os.environ["PARACHUTE_URL_METEO"] = serveur.url
+        os.environ["PARACHUTE_CACHE_VENT"] = os.path.join(dossier, "vent")
+        os.environ["PARACHUTE_CACHE_TRAJECTOIRES"] = os.path.join(dossier, "trajectoires")
+        import streamlit_en_POO as ui
+        from streamlit.logger import set_log_level
+
+        # Hors d'un `streamlit run`, Streamlit signale à chaque appel l'absence de contexte d'exécution
+        set_log_level("error")
+
+        interface = ui.InterfaceStreamlit()
+        print("interaction\t\t " + "\t ".join(f"{nom} (ms)" for nom in
+                                               ("prévision", "profil", "météo", "carte", "simulation"))
+              + "\t total (ms)\t requêtes")
+        for nom, index_horaire in INTERACTIONS:
+            durees = passage(ui, interface, index_horaire, N)
+            print(f"{nom:20s}\t " + "\t\t ".join(f"{1000 * d:.1f}" for d in durees.values())
+                  + f"\t\t {1000 * sum(durees.values()):.1f}\t\t {serveur.requetes}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
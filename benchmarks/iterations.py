@@ -0,0 +1,65 @@
+"""
+iterations.py - Suivi itéré par itéré de la convexification successive (`SimulerTrajectoire.iterer_trajectoire`).
+
+Sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), pour quelques points de largage et
+chaque backend, affiche :
+    - la durée médiane d'une optimisation sans suivi, puis avec une fonction `suivi` qui lit chaque itéré
+      (le surcoût du générateur),
+    - le nombre de résolutions, la durée et l'effort de contrôle quand la boucle s'arrête dès que l'erreur
+      d'atterrissage passe sous `TOLERANCE`, rapportés à ceux de la convergence complète.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.iterations
+    python -m benchmarks.iterations 61 0.5
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+DEPARTS = [[-600., -800.], [900., 300.], [-200., 1200.], [1500., -500.]]
+REPETITIONS = 5
+TOLERANCE = 1.
+
+
+def optimiser(profil, N, backend, x_0, suivi=None):
+    """Optimise depuis `x_0` et renvoie le simulateur et la durée médiane (le problème est déjà construit)."""
+    durees = []
+    for _ in range(REPETITIONS + 1):
+        simulateur = SimulerTrajectoire(0., 0., N, backend=backend, x_0=x_0, profil_vent=profil)
+        debut = time.perf_counter()
+        simulateur.optimiser_trajectoire(suivi=suivi)
+        durees.append(time.perf_counter() - debut)
+    return simulateur, float(np.median(durees[1:]))
+
+
+def main(N=31, tolerance=TOLERANCE):
+    """Affiche le surcoût du suivi et le gain d'un arrêt sur l'erreur d'atterrissage."""
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+    lus = []
+
+    print(f"arrêt dès que l'erreur d'atterrissage est sous {tolerance} m\n")
+    print("backend\t départ\t\t\t sans suivi (ms)\t avec suivi (ms)\t résolutions\t durée (ms)\t effort")
+    for backend in ("direct", "cvxpy"):
+        for x_0 in DEPARTS:
+            complet, reference = optimiser(profil, N, backend, x_0)
+            _, suivie = optimiser(profil, N, backend, x_0, suivi=lambda it: lus.append(it["termes"]) and False)
+            arrete, duree = optimiser(profil, N, backend, x_0,
+                                      suivi=lambda it: it["termes"] is not None
+                                      and it["termes"]["final_position"] < tolerance)
+            print(f"{backend}\t {str(x_0):16s}\t {1000 * reference:.1f}\t\t\t {1000 * suivie:.1f}\t\t\t"
+                  f" {arrete.n_iter} / {complet.n_iter}\t\t {1000 * duree:.1f}\t\t"
+                  f" {arrete.calcul_cout_controle():.4f} / {complet.calcul_cout_controle():.4f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]], *[float(a) for a in sys.argv[2:3]])
@@ -0,0 +1,61 @@
+"""
+multiresolution.py - Comparaison de l'optimisation directe et de l'optimisation multi-résolution.
+
+Pour chaque N, sur un cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`),
+résout le problème une fois depuis le cap constant `psi_0` (`optimiser_trajectoire`) et une fois
+par raffinements successifs (`optimiser_multiresolution`), puis affiche :
+    - le nombre d'itérations SCP et la durée de chaque niveau,
+    - le temps total, l'erreur d'atterrissage et le coût de commande des deux méthodes.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.multiresolution
+    python -m benchmarks.multiresolution 301 601
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+VALEURS_N = [121, 301]
+BACKEND = "direct"
+
+
+def simulateur(N):
+    """Construit un simulateur sur le cas synthétique, avec un départ fixe."""
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    W = 0.3 * cas_synthetique(N)[0]
+    return SimulerTrajectoire(lat=0, lon=0, N=N, backend=BACKEND, x_0=[200., -300.],
+                              profil_vent=ProfilVent(W[None], z_t, time_vec))
+
+
+def main(valeurs_n=VALEURS_N):
+    """Affiche, pour chaque N, le détail par niveau et la comparaison des deux méthodes."""
+    for N in valeurs_n:
+        direct = simulateur(N)
+        debut = time.perf_counter()
+        _, erreur_directe, _, _, _ = direct.optimiser_trajectoire()
+        t_direct = time.perf_counter() - debut
+
+        raffine = simulateur(N)
+        debut = time.perf_counter()
+        _, erreur_raffinee, _, _, _ = raffine.optimiser_multiresolution()
+        t_raffine = time.perf_counter() - debut
+
+        print(f"\nN = {N}")
+        print("niveau\t itérations\t durée (s)")
+        for niveau in raffine.niveaux:
+            print(f"{niveau['N']}\t {niveau['n_iter']}\t\t {niveau['duree']:.3f}")
+        print(f"direct         : {direct.n_iter} itérations, {t_direct:.3f} s, erreur {erreur_directe:.2E} m, "
+              f"coût de commande {direct.calcul_cout_controle():.4f}")
+        print(f"multirésolution : {t_raffine:.3f} s (x{t_direct / t_raffine:.1f}), erreur {erreur_raffinee:.2E} m, "
+              f"coût de commande {raffine.calcul_cout_controle():.4f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or VALEURS_N)
@@ -0,0 +1,56 @@
+"""
+pilote_scp.py - Nombre de résolutions et coût final de la convexification successive selon le rayon initial.
+
+Sur des cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`, plusieurs points de
+départ), compare la boucle d'origine (rayon fixe 0.1, `rayon_initial=0.1`) et la région de confiance
+par défaut de `PiloteSCP` (rayon initial large seulement jusqu'à `pilote_scp.N_RAYON_LARGE`, donc
+identique à la boucle d'origine au-delà), puis affiche pour chacune :
+    - le nombre de résolutions et la durée par cas,
+    - l'écart de coût final (problème non convexe) à la boucle d'origine.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.pilote_scp
+    python -m benchmarks.pilote_scp 31 301
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+VALEURS_N = [31, 121]
+DEPARTS = [[350., -420.], [200., -300.], [-500., 100.], [900., 900.], [0., 600.], [-300., -300.]]
+REGLAGES = {"origine": {"rayon_initial": 0.1}, "région de confiance": {}}
+
+
+def main(valeurs_n=VALEURS_N):
+    """Affiche, pour chaque N et chaque réglage, résolutions, durées et écarts de coût."""
+    for N in valeurs_n:
+        time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+        profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+        print(f"\nN = {N}")
+        reference = None
+        for nom, reglage in REGLAGES.items():
+            resolutions, durees, couts = [], [], []
+            for x_0 in DEPARTS:
+                simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", x_0=x_0, profil_vent=profil)
+                debut = time.perf_counter()
+                simulateur.optimiser_trajectoire(**reglage)
+                durees.append(time.perf_counter() - debut)
+                resolutions.append(simulateur.n_iter)
+                couts.append(simulateur.cout)
+            reference = couts if reference is None else reference
+            ecarts = np.array(couts) - np.array(reference)
+            print(f"{nom:20s} résolutions {sum(resolutions):4d} {resolutions}, durée {sum(durees):.2f} s, "
+                  f"écart de coût moyen {ecarts.mean():+.3f} (min {ecarts.min():+.3f}, max {ecarts.max():+.3f})")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or VALEURS_N)
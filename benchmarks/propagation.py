@@ -0,0 +1,63 @@
+"""
+propagation.py - Banc d'essai de la propagation par lots et de la réintégration fine.
+
+Sur un cas sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), optimise une
+trajectoire puis :
+    - rejoue la commande sous M vents perturbés, par lot NumPy puis par boucle Python, et compare les temps,
+    - réintègre la commande sur des grilles de plus en plus fines et affiche l'écart au point
+      d'atterrissage de la grille grossière.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.propagation
+    python -m benchmarks.propagation 100000
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from importer_vent import ImportVent, ProfilVent
+from propagation import atterrissages, propager, reintegrer
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+N = 31
+FACTEURS = [1, 2, 5, 10, 50]
+
+
+def main(M=10000):
+    """
+    Affiche les temps de propagation de M vents et l'écart dû à la grille grossière.
+
+    :param M: Nombre de réalisations du vent.
+    :type M: int
+    """
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    W = cas_synthetique(N)[0]
+    simulateur = SimulerTrajectoire(lat=0, lon=0, N=N, backend="direct", x_0=[350., -420.],
+                                    profil_vent=ProfilVent(W[None], z_t, time_vec))
+    simulateur.optimiser_trajectoire()
+    ensemble = W + np.random.default_rng(0).normal(0., 1., (M, 2, N))
+
+    debut = time.perf_counter()
+    lot = atterrissages(simulateur.x_0, simulateur.u_star, ensemble, simulateur.dt)
+    t_lot = time.perf_counter() - debut
+    debut = time.perf_counter()
+    boucle = np.array([propager(simulateur.x_0, simulateur.u_star, w, simulateur.dt)[:, -1] for w in ensemble])
+    t_boucle = time.perf_counter() - debut
+    print(f"M = {M} : lot {1000 * t_lot:.1f} ms, boucle {1000 * t_boucle:.1f} ms "
+          f"(x{t_boucle / t_lot:.0f}), écart max {np.abs(lot - boucle).max():.1E} m")
+
+    print("facteur\t pas (s)\t écart à la grille grossière (m)")
+    for facteur in FACTEURS:
+        trajectoire, _ = reintegrer(simulateur, facteur=facteur)
+        ecart = np.linalg.norm(trajectoire[:, -1] - simulateur.x_star[:, -1])
+        print(f"{facteur}\t {simulateur.dt / facteur:.3f}\t {ecart:.2f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""
+rendu.py - Durée des rendus d'une trajectoire (`rendu`) en fonction de N.
+
+Sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), optimise une trajectoire pour chaque N
+puis affiche, bibliothèques déjà importées :
+    - la durée médiane de la figure 2D, de la figure 3D et de l'animation GIF, et leur somme,
+    - la durée par image de l'animation,
+    - la durée de construction de la figure Plotly animée et la taille de ce qui est envoyé au navigateur.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.rendu
+    python -m benchmarks.rendu 31 61 101 201
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import rendu
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+REPETITIONS = 3
+
+
+def mesurer(fonction):
+    """Renvoie (durée médiane de `fonction()` après un premier appel, dernier résultat)."""
+    resultat = fonction()
+    durees = []
+    for _ in range(REPETITIONS):
+        debut = time.perf_counter()
+        resultat = fonction()
+        durees.append(time.perf_counter() - debut)
+    return float(np.median(durees)), resultat
+
+
+def main(tailles=(31, 61, 101, 201)):
+    """Affiche la durée de chaque rendu pour chaque N."""
+    print("N\t 2D (ms)\t 3D (ms)\t GIF (ms)\t total (ms)\t par image (ms)\t Plotly (ms)\t Plotly (ko)")
+    for N in tailles:
+        time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+        simulateur = SimulerTrajectoire(0., 0., N, backend="direct", x_0=[-600., -800.],
+                                        profil_vent=ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec))
+        simulateur.optimiser_trajectoire()
+        x, z = simulateur.x_star, simulateur.calcul_altitude(simulateur.time)
+
+        d2, _ = mesurer(lambda: rendu.image_2d(x))
+        d3, _ = mesurer(lambda: rendu.image_3d(x, simulateur.z_t))
+        gif, _ = mesurer(lambda: rendu.animation_gif(x, z))
+        plotly, fig = mesurer(lambda: rendu.figure_animee(x, z))
+        print(f"{N}\t {1000 * d2:.0f}\t\t {1000 * d3:.0f}\t\t {1000 * gif:.0f}\t\t {1000 * (d2 + d3 + gif):.0f}\t\t"
+              f" {1000 * gif / N:.1f}\t\t {1000 * plotly:.0f}\t\t {len(fig.to_json()) / 1000:.0f}")
+
+
+if __name__ == "__main__":
+    main(*[tuple(int(a) for a in sys.argv[1:])] if len(sys.argv) > 1 else [])
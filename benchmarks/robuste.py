@@ -0,0 +1,84 @@
+"""
+robuste.py - Optimisation robuste sur K scénarios de vent (`optimiser_trajectoire(scenarios=...)`).
+
+Sans appel réseau (vent synthétique de `solveurs.cas_synthetique`, scénarios de `dispersion.scenarios_vent`),
+affiche :
+    - pour chaque backend et chaque K, la durée d'une optimisation robuste (pire cas) rapportée à celle
+      d'une optimisation sur le vent seul, et le nombre de résolutions,
+    - pour K scénarios d'apprentissage, les écarts finaux (pire, moyen) de la commande nominale et des
+      commandes robustes, sur ces scénarios et sur des scénarios de test tirés indépendamment ; d'abord
+      pour un ensemble centré sur le vent nominal, puis pour un ensemble décentré (biais `BIAIS`), comme
+      un ensemble de prévision face à la prévision déterministe.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.robuste
+    python -m benchmarks.robuste 1 10 50 200
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dispersion import scenarios_vent
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+from solveurs import cas_synthetique
+
+N = 31
+X_0 = [-600., -800.]
+REPETITIONS = 3
+APPRENTISSAGE = 50
+TEST = 1000
+BIAIS = np.array([[1.], [-0.5]])
+
+
+def optimiser(profil, backend, **options):
+    """Optimise depuis `X_0` et renvoie le simulateur et la durée médiane (le problème est déjà construit)."""
+    durees = []
+    for _ in range(REPETITIONS + 1):
+        simulateur = SimulerTrajectoire(0., 0., N, backend=backend, x_0=X_0, profil_vent=profil)
+        debut = time.perf_counter()
+        simulateur.optimiser_trajectoire(**options)
+        durees.append(time.perf_counter() - debut)
+    return simulateur, float(np.median(durees[1:]))
+
+
+def ecarts(simulateur, scenarios):
+    """Renvoie les écarts finaux (m) de la commande du simulateur sous chaque scénario."""
+    derives = (scenarios[:, :, :N - 1] - simulateur.W[:, :N - 1]).sum(axis=2)
+    return np.linalg.norm(simulateur.x_star[:, -1] + derives - simulateur.target, axis=1)
+
+
+def main(tailles=(1, 10, 50, 200)):
+    """Affiche le surcoût des scénarios, puis la qualité des commandes nominale et robustes."""
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    W = cas_synthetique(N)[0]
+    profil = ProfilVent(W[None], z_t, time_vec)
+
+    print("backend\t K\t durée (ms)\t rapport au vent seul\t résolutions")
+    for backend in ("direct", "cvxpy"):
+        _, reference = optimiser(profil, backend)
+        for K in tailles:
+            simulateur, duree = optimiser(profil, backend, scenarios=scenarios_vent(W, K), critere="pire")
+            print(f"{backend}\t {K}\t {1000 * duree:.0f}\t\t {duree / reference:.2f}\t\t\t {simulateur.n_iter}")
+
+    for ensemble, centre in (("centré", W), ("décentré", W + BIAIS)):
+        apprentissage = scenarios_vent(centre, APPRENTISSAGE)
+        test = scenarios_vent(centre, TEST, graine=1)
+        print(f"\nensemble {ensemble}\t apprentissage ({APPRENTISSAGE}) pire / moyen (m)\t"
+              f" test ({TEST}) pire / moyen / CEP90 (m)")
+        for nom, options in (("nominale", {}),
+                             ("pire cas", {"scenarios": apprentissage, "critere": "pire"}),
+                             ("moyenne", {"scenarios": apprentissage, "critere": "moyenne"})):
+            simulateur, _ = optimiser(profil, "direct", **options)
+            a, t = ecarts(simulateur, apprentissage), ecarts(simulateur, test)
+            print(f"{nom}\t\t {a.max():.1f} / {a.mean():.1f}\t\t\t\t {t.max():.1f} / {t.mean():.1f} / "
+                  f"{np.percentile(t, 90):.1f}")
+
+
+if __name__ == "__main__":
+    main(*[tuple(int(a) for a in sys.argv[1:])] if len(sys.argv) > 1 else [])
@@ -0,0 +1,86 @@
+"""
+travaux.py - File de travaux partagée (`travaux.FileTravaux`) sous des demandes concurrentes.
+
+Sans appel réseau (vent synthétique de `solveurs.cas_synthetique`), et avec un cache de trajectoires vide
+dans un dossier temporaire, des fils simulent des utilisateurs qui demandent chacun une simulation
+(`travaux.tache_simulation`) tirée parmi quelques simulations distinctes, puis suivent son état jusqu'au
+résultat. Pour chaque nombre de processus, affiche :
+    - la durée médiane d'une soumission et d'une lecture d'état (ce que paie le fil de l'interface),
+    - le nombre de demandes, de travaux réellement exécutés et de demandes fusionnées,
+    - la durée totale jusqu'au dernier résultat, et le débit en demandes servies par seconde.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.travaux
+    python -m benchmarks.travaux 24 4
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+N = 31
+LAT, LON = 48.85, 2.35
+ATTENTE = 0.05
+
+
+def utilisateur(file, demande, profil, mesures):
+    """Soumet une demande, suit son état jusqu'au résultat et enregistre les durées (exécuté dans un fil)."""
+    from travaux import tache_simulation
+
+    x_0 = (LAT - 400. - 100. * demande, LON - 600.)
+    debut = time.perf_counter()
+    cle = file.soumettre(("simulation", LAT, LON, 0, N, "direct", "ECOS", x_0), tache_simulation,
+                         LAT, LON, 0, N, "direct", "ECOS", x_0, profil)
+    mesures["soumission"].append(time.perf_counter() - debut)
+    while True:
+        debut = time.perf_counter()
+        etat = file.etat(cle)
+        mesures["etat"].append(time.perf_counter() - debut)
+        if etat["etat"] in ("terminé", "échec"):
+            break
+        time.sleep(ATTENTE)
+    file.resultat(cle)
+
+
+def main(demandes=12, distinctes=3):
+    """Affiche latences de l'interface, fusion des demandes et débit, pour 1 processus puis tous les cœurs."""
+    with tempfile.TemporaryDirectory() as dossier:
+        os.environ["PARACHUTE_CACHE_TRAJECTOIRES"] = dossier
+        from importer_vent import ImportVent, ProfilVent
+        from solveurs import cas_synthetique
+        from travaux import FileTravaux
+
+        time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+        profil = ProfilVent(cas_synthetique(N)[0][None], z_t, time_vec)
+        rng = np.random.default_rng(0)
+
+        print("processus\t soumission (ms)\t état (ms)\t demandes\t travaux\t fusionnées\t durée (s)\t débit (demandes/s)")
+        for processus in sorted({1, os.cpu_count()}):
+            file = FileTravaux(processus=processus, profondeur_max=demandes)
+            # Démarre les processus du pool avant la mesure
+            file.resultat(file.soumettre(("chauffe",), time.sleep, 0.))
+            mesures = {"soumission": [], "etat": []}
+            # Décalage par essai : aucun plan n'est resservi par le cache de trajectoires d'un essai à l'autre
+            tirages = rng.integers(distinctes, size=demandes) + distinctes * processus
+            fils = [threading.Thread(target=utilisateur, args=(file, int(d), profil, mesures)) for d in tirages]
+            debut = time.perf_counter()
+            for fil in fils:
+                fil.start()
+            for fil in fils:
+                fil.join()
+            duree = time.perf_counter() - debut
+            print(f"{processus}\t\t {1000 * np.median(mesures['soumission']):.2f}\t\t\t"
+                  f" {1000 * np.median(mesures['etat']):.3f}\t\t {demandes}\t\t {file.soumis - file.fusionnes - 1}\t\t"
+                  f" {file.fusionnes}\t\t {duree:.2f}\t\t {demandes / duree:.2f}")
+            file.fermer()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
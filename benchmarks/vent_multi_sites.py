@@ -0,0 +1,57 @@
+"""
+vent_multi_sites.py - Banc d'essai de la récupération du vent pour de nombreux sites.
+
+Compare, contre le serveur Open-Meteo local (`serveur_meteo_local`) et avec des caches vides :
+    - des appels `import_vent` successifs (une requête par site),
+    - `ImportVentMultiSites` (requêtes multi-positions parallèles, session partagée).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.vent_multi_sites
+    python -m benchmarks.vent_multi_sites 200
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import sys
+import tempfile
+import time
+
+from cache_vent import CacheVent
+from importer_vent import ImportVent, telecharger_meteo
+from serveur_meteo_local import ServeurMeteoLocal
+from vent_multi_sites import ImportVentMultiSites
+
+
+def main(nombre_sites=100):
+    """
+    Affiche le temps et le nombre de requêtes HTTP des deux méthodes.
+
+    :param nombre_sites: Nombre de sites distincts.
+    :type nombre_sites: int
+    :return: Tuple (temps séquentiel, temps groupé) en secondes.
+    :rtype: tuple
+    """
+    sites = [(40 + 0.1 * i, -5 + 0.1 * i) for i in range(nombre_sites)]
+    with ServeurMeteoLocal() as serveur, tempfile.TemporaryDirectory() as d1, tempfile.TemporaryDirectory() as d2:
+        cache = CacheVent(d1, max_entrees=nombre_sites)
+        debut = time.perf_counter()
+        for lat, lon in sites:
+            ImportVent(lat, lon).interpoler(telecharger_meteo(lat, lon, cache, serveur.url))
+        sequentiel = time.perf_counter() - debut
+        requetes_sequentielles = serveur.requetes
+
+        recuperateur = ImportVentMultiSites(url_base=serveur.url, cache=CacheVent(d2, max_entrees=nombre_sites))
+        debut = time.perf_counter()
+        recuperateur.import_vent(sites)
+        groupe = time.perf_counter() - debut
+        recuperateur.fermer()
+
+    print(f"{nombre_sites} sites")
+    print(f"    séquentiel : {sequentiel:7.3f} s, {requetes_sequentielles} requêtes")
+    print(f"    groupé     : {groupe:7.3f} s, {serveur.requetes - requetes_sequentielles} requêtes")
+    return sequentiel, groupe
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
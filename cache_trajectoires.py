@@ -0,0 +1,298 @@
+"""
+Ce module définit la classe `CacheTrajectoires`, un cache disque des trajectoires optimisées.
+
+Responsable de :
+    - conserver chaque plan résolu (x, u, vent, coût) dans un fichier `.npz`, avec sa clé :
+      cible, décalage du point de largage à la cible, heure de prévision et N,
+    - retrouver les plans voisins d'une nouvelle demande par un arbre k-d par groupe (N, heure, cap initial),
+    - resservir directement un plan quand la demande est la même à la tolérance près (même décalage,
+      même site, même vent), sans résolution,
+    - sinon, amorcer la convexification successive (linéarisation `u_bar` et warm start) par la
+      moyenne des plans voisins pondérée par l'inverse de la distance,
+    - limiter le nombre d'entrées en évinçant les moins récemment utilisées (LRU), et compter les
+      succès, amorçages et échecs.
+
+La dynamique ne dépend de la position que par le décalage x_0 - cible : le site n'intervient que par
+son vent. La distance entre deux demandes est donc celle des décalages (m), à laquelle s'ajoute celle
+des cibles, en degrés multipliés par `ECHELLE_SITE`. Comme dans `CacheVent`, la date de dernière
+modification d'un fichier sert de date de dernier accès pour l'éviction.
+
+Configuration par variable d'environnement du cache par défaut :
+    - PARACHUTE_CACHE_TRAJECTOIRES : dossier du cache (défaut : ~/.cache/parachute_trajectoires).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import glob
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+DOSSIER_PAR_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "parachute_trajectoires")
+
+# Équivalent en mètres d'un degré d'écart entre deux cibles, dans la distance entre demandes
+ECHELLE_SITE = 1000.
+
+_cache_par_defaut = None
+_VERROU = threading.Lock()
+
+
+def cle_heure(simulateur):
+    """
+    Renvoie l'heure de prévision d'un simulateur sous forme de texte utilisable dans un nom de fichier.
+
+    Avec un profil horodaté, c'est l'horodatage de l'heure de largage (et sa fraction) ; sinon, l'index
+    horaire rapporté à l'heure UTC courante, comme les réponses de `CacheVent`.
+
+    :param simulateur: Simulateur.
+    :type simulateur: SimulerTrajectoire
+    :return: Clé d'heure.
+    :rtype: str
+    """
+    index = float(simulateur.hour_index)
+    profil = simulateur.profil_vent
+    if profil is not None and profil.heures is not None:
+        entiere = min(int(np.floor(index)), len(profil.heures) - 1)
+        origine = profil.heures[entiere].replace(":", "").replace("-", "")
+        return f"{origine}+{index - entiere:.2f}"
+    if profil is not None:
+        return f"{index:.2f}"
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%d%H')}+{index:.2f}"
+
+
+class CacheTrajectoires:
+    """
+    Cache disque des trajectoires optimisées, interrogé par plus proches voisins.
+
+    :param dossier: Dossier où sont stockés les plans.
+    :type dossier: str
+    :param max_entrees: Nombre maximal de plans conservés.
+    :type max_entrees: int
+    :param tolerance: Distance (m) sous laquelle une demande est servie par un plan enregistré.
+    :type tolerance: float
+    :param tolerance_vent: Écart maximal (m/s) entre le vent de la demande et celui du plan pour le resservir.
+    :type tolerance_vent: float
+    :param voisins: Nombre de plans moyennés pour amorcer une résolution.
+    :type voisins: int
+    :param rayon: Distance (m) au-delà de laquelle un plan n'est plus utilisé comme voisin.
+    :type rayon: float
+
+    :ivar succes: Nombre de demandes servies sans résolution.
+    :ivar amorces: Nombre de résolutions amorcées par des plans voisins.
+    :ivar echecs: Nombre de résolutions sans voisin.
+    """
+
+    def __init__(self, dossier=DOSSIER_PAR_DEFAUT, max_entrees=512, tolerance=1., tolerance_vent=0.05,
+                 voisins=4, rayon=300.):
+        self.dossier = dossier
+        self.max_entrees = max_entrees
+        self.tolerance = tolerance
+        self.tolerance_vent = tolerance_vent
+        self.voisins = voisins
+        self.rayon = rayon
+        self.succes = 0
+        self.amorces = 0
+        self.echecs = 0
+        self.verrou = threading.RLock()
+        self._entrees = OrderedDict()
+        self._index = {}
+        os.makedirs(self.dossier, exist_ok=True)
+        self.charger()
+
+    def charger(self):
+        """Lit les plans enregistrés dans le dossier, du moins au plus récemment utilisé."""
+        with self.verrou:
+            self._entrees.clear()
+            self._index.clear()
+            for chemin in sorted(glob.glob(os.path.join(self.dossier, "*.npz")), key=os.path.getmtime):
+                try:
+                    with np.load(chemin) as donnees:
+                        entree = {cle: donnees[cle] for cle in ("position", "x", "u", "W")}
+                        entree["groupe"] = str(donnees["groupe"])
+                except (OSError, ValueError, KeyError):
+                    continue
+                self._entrees[chemin] = entree
+            self.evincer()
+
+    @staticmethod
+    def groupe(simulateur):
+        """
+        Renvoie le groupe d'une demande : seuls les plans d'un même groupe sont comparés.
+
+        :param simulateur: Simulateur.
+        :type simulateur: SimulerTrajectoire
+        :return: Clé du groupe (N, heure de prévision, cap initial).
+        :rtype: str
+        """
+        return f"{simulateur.N}_{cle_heure(simulateur)}_{simulateur.psi_0:+.3f}"
+
+    @staticmethod
+    def position(simulateur):
+        """
+        Renvoie la position d'une demande dans l'espace de recherche des voisins.
+
+        :param simulateur: Simulateur.
+        :type simulateur: SimulerTrajectoire
+        :return: Vecteur (décalage x, décalage y, lat, lon mises à l'échelle).
+        :rtype: np.ndarray
+        """
+        decalage = simulateur.x_0.ravel() - np.array([simulateur.lat, simulateur.lon])
+        return np.concatenate([decalage, ECHELLE_SITE * np.array([simulateur.lat, simulateur.lon])])
+
+    def _arbre(self, groupe):
+        """Renvoie (arbre k-d, chemins) des plans d'un groupe, reconstruit après chaque modification."""
+        if groupe not in self._index:
+            from scipy.spatial import cKDTree
+
+            chemins = [c for c, e in self._entrees.items() if e["groupe"] == groupe]
+            arbre = cKDTree(np.array([self._entrees[c]["position"] for c in chemins])) if chemins else None
+            self._index[groupe] = (arbre, chemins)
+        return self._index[groupe]
+
+    def voisins_de(self, groupe, position):
+        """
+        Renvoie les plans d'un groupe les plus proches d'une position, dans le rayon de recherche.
+
+        :param groupe: Clé du groupe.
+        :type groupe: str
+        :param position: Position de la demande.
+        :type position: np.ndarray
+        :return: Liste de (distance, chemin), de la plus proche à la plus éloignée.
+        :rtype: list
+        """
+        with self.verrou:
+            arbre, chemins = self._arbre(groupe)
+            if arbre is None:
+                return []
+            distances, indices = arbre.query(position, k=min(self.voisins, len(chemins)),
+                                             distance_upper_bound=self.rayon)
+            return [(float(d), chemins[i]) for d, i in zip(np.atleast_1d(distances), np.atleast_1d(indices))
+                    if np.isfinite(d)]
+
+    def _utiliser(self, chemin):
+        """Marque un plan comme le plus récemment utilisé."""
+        self._entrees.move_to_end(chemin)
+        try:
+            os.utime(chemin)
+        except FileNotFoundError:
+            pass
+
+    def ecrire(self, simulateur):
+        """
+        Enregistre le plan optimisé d'un simulateur, puis applique l'éviction LRU.
+
+        :param simulateur: Simulateur dont `optimiser_trajectoire` a abouti.
+        :type simulateur: SimulerTrajectoire
+        """
+        groupe = self.groupe(simulateur)
+        entree = {"position": self.position(simulateur), "x": simulateur.x_star, "u": simulateur.u_star,
+                  "W": simulateur.W, "groupe": groupe}
+        chemin = os.path.join(self.dossier, f"{groupe}_{uuid.uuid4().hex[:12]}.npz")
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as fichier:
+            np.savez(fichier, **entree)
+        os.replace(temporaire, chemin)
+        with self.verrou:
+            self._entrees[chemin] = entree
+            self._index.pop(groupe, None)
+            self.evincer()
+
+    def evincer(self):
+        """Supprime les plans les moins récemment utilisés au-delà de `max_entrees`."""
+        with self.verrou:
+            while len(self._entrees) > self.max_entrees:
+                chemin, entree = self._entrees.popitem(last=False)
+                self._index.pop(entree["groupe"], None)
+                try:
+                    os.remove(chemin)
+                except FileNotFoundError:
+                    pass
+
+    def taux(self):
+        """
+        Renvoie la part des demandes servies sans résolution, amorcées et résolues sans voisin.
+
+        :return: Dictionnaire (demandes, succes, amorces, echecs), les trois derniers en fraction.
+        :rtype: dict
+        """
+        demandes = self.succes + self.amorces + self.echecs
+        return {"demandes": demandes, **{nom: getattr(self, nom) / max(demandes, 1)
+                                         for nom in ("succes", "amorces", "echecs")}}
+
+    def optimiser(self, simulateur, amorce=None, **reglages):
+        """
+        Optimise la trajectoire d'un simulateur en s'appuyant sur les plans enregistrés.
+
+        Une demande identique à la tolérance près reçoit le plan enregistré, translaté sur son point de
+        départ, par `SimulerTrajectoire.adopter` (`n_iter` vaut alors 0 : aucune résolution). Sinon, la
+        résolution est amorcée par les voisins (`rayon_initial=0.` : la région de confiance part du rayon
+        minimal), à défaut par `amorce`, ou part du cap constant ; le plan obtenu est enregistré s'il a convergé.
+
+        :param simulateur: Simulateur à optimiser.
+        :type simulateur: SimulerTrajectoire
+        :param amorce: Commande et trajectoire (u, x) utilisées quand aucun plan voisin n'est enregistré
+            (par exemple la prévision de `apercu.TableApercu`) ; la demande compte alors comme un échec.
+        :type amorce: tuple
+        :param reglages: Paramètres transmis à `optimiser_trajectoire`.
+        :return: Même résultat que `optimiser_trajectoire`.
+        :rtype: tuple
+        """
+        W, z_t, time_vec = simulateur.champ_vent()
+        groupe, position = self.groupe(simulateur), self.position(simulateur)
+        x_0 = simulateur.x_0
+        proches = self.voisins_de(groupe, position)
+
+        with self.verrou:
+            entrees = [(d, self._entrees.get(c), c) for d, c in proches]
+        entrees = [(d, e, c) for d, e, c in entrees if e is not None and e["W"].shape == W.shape]
+        if entrees and entrees[0][0] <= self.tolerance and np.max(np.abs(entrees[0][1]["W"] - W)) <= self.tolerance_vent:
+            _, entree, chemin = entrees[0]
+            with self.verrou:
+                if chemin in self._entrees:
+                    self._utiliser(chemin)
+                self.succes += 1
+            x_star = entree["x"] - entree["x"][:, :1] + x_0
+            return simulateur.adopter(x_star, entree["u"], W, z_t, time_vec, n_iter=0)
+
+        if entrees:
+            poids = np.array([1. / max(d, 1e-6) for d, _, _ in entrees])
+            poids /= poids.sum()
+            u_init = sum(p * e["u"] for p, (_, e, _) in zip(poids, entrees))
+            x_init = sum(p * (e["x"] - e["x"][:, :1]) for p, (_, e, _) in zip(poids, entrees)) + x_0
+            with self.verrou:
+                for _, _, chemin in entrees:
+                    if chemin in self._entrees:
+                        self._utiliser(chemin)
+                self.amorces += 1
+            resultat = simulateur.optimiser_trajectoire(u_init, x_init, **{"rayon_initial": 0., **reglages})
+        else:
+            with self.verrou:
+                self.echecs += 1
+            if amorce is None:
+                resultat = simulateur.optimiser_trajectoire(**reglages)
+            else:
+                resultat = simulateur.optimiser_trajectoire(*amorce, **{"rayon_initial": 0., **reglages})
+
+        if simulateur.converge:
+            self.ecrire(simulateur)
+        return resultat
+
+
+def cache_trajectoires_par_defaut():
+    """
+    Renvoie le cache de trajectoires partagé du processus, configuré par les variables d'environnement.
+
+    :return: Cache par défaut.
+    :rtype: CacheTrajectoires
+    """
+    global _cache_par_defaut
+    with _VERROU:
+        if _cache_par_defaut is None:
+            _cache_par_defaut = CacheTrajectoires(
+                dossier=os.environ.get("PARACHUTE_CACHE_TRAJECTOIRES", DOSSIER_PAR_DEFAUT))
+        return _cache_par_defaut
@@ -0,0 +1,190 @@
+"""
+Ce module définit la classe `CacheVent`, un cache disque des réponses de l'API Open-Meteo.
+
+Responsable de :
+    - conserver chaque réponse sous forme de JSON compressé (gzip), une par site et par heure de prévision,
+    - servir une réponse encore valide (durée de vie `ttl`) sans appel réseau,
+    - limiter le nombre d'entrées en évinçant les moins récemment utilisées (LRU),
+    - rejouer hors ligne les réponses enregistrées, pour des tests et bancs d'essai déterministes.
+
+Les fichiers sont nommés `<lat>_<lon>_<AAAAMMJJHH>.json.gz`, avec lat/lon arrondies à `precision`
+décimales et l'heure UTC de récupération de la prévision. La date de dernière modification d'un
+fichier sert de date de dernier accès pour l'éviction.
+
+Configuration par variables d'environnement du cache par défaut :
+    - PARACHUTE_CACHE_VENT : dossier du cache (défaut : ~/.cache/parachute_vent),
+    - PARACHUTE_VENT_TTL : durée de vie en secondes (défaut : 3600),
+    - PARACHUTE_VENT_HORS_LIGNE : "1" pour rejouer les réponses enregistrées sans réseau.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+DOSSIER_PAR_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "parachute_vent")
+
+_cache_par_defaut = None
+_VERROU = threading.Lock()
+
+
+class CacheVent:
+    """
+    Cache disque des réponses météo, indexé par position arrondie et heure de prévision.
+
+    :param dossier: Dossier où sont stockées les réponses.
+    :type dossier: str
+    :param ttl: Durée de validité d'une réponse, en secondes.
+    :type ttl: float
+    :param max_entrees: Nombre maximal de réponses conservées.
+    :type max_entrees: int
+    :param precision: Nombre de décimales conservées sur lat/lon pour la clé.
+    :type precision: int
+    :param hors_ligne: Si vrai, aucune requête n'est faite : la réponse enregistrée la plus récente
+        (ou celle de `heure_prevision`) est servie quel que soit son âge.
+    :type hors_ligne: bool
+    :param heure_prevision: Heure de prévision à rejouer en mode hors ligne (format AAAAMMJJHH).
+    :type heure_prevision: str
+
+    :ivar succes: Nombre de réponses servies depuis le cache.
+    :ivar echecs: Nombre de réponses téléchargées.
+    """
+
+    def __init__(self, dossier=DOSSIER_PAR_DEFAUT, ttl=3600, max_entrees=256, precision=2,
+                 hors_ligne=False, heure_prevision=None):
+        self.dossier = dossier
+        self.ttl = ttl
+        self.max_entrees = max_entrees
+        self.precision = precision
+        self.hors_ligne = hors_ligne
+        self.heure_prevision = heure_prevision
+        self.succes = 0
+        self.echecs = 0
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def prefixe(self, lat, lon):
+        """
+        Renvoie le préfixe de nom de fichier d'un site (position arrondie).
+
+        :param lat: Latitude.
+        :type lat: float
+        :param lon: Longitude.
+        :type lon: float
+        :return: Préfixe de la clé.
+        :rtype: str
+        """
+        return f"{lat:+.{self.precision}f}_{lon:+.{self.precision}f}"
+
+    def _fichiers(self, lat, lon):
+        """Renvoie les fichiers enregistrés pour un site, du plus ancien au plus récent."""
+        return sorted(glob.glob(os.path.join(self.dossier, f"{self.prefixe(lat, lon)}_*.json.gz")))
+
+    def lire(self, lat, lon):
+        """
+        Renvoie la réponse enregistrée pour un site si elle est utilisable, sinon None.
+
+        :param lat: Latitude.
+        :type lat: float
+        :param lon: Longitude.
+        :type lon: float
+        :return: Réponse de l'API (dictionnaire) ou None.
+        :rtype: dict
+        """
+        fichiers = self._fichiers(lat, lon)
+        if self.hors_ligne and self.heure_prevision:
+            fichiers = [f for f in fichiers if f.endswith(f"_{self.heure_prevision}.json.gz")]
+        if not fichiers:
+            return None
+        chemin = fichiers[-1]
+        try:
+            with gzip.open(chemin, "rt", encoding="utf-8") as fichier:
+                entree = json.load(fichier)
+        except (OSError, ValueError):
+            return None
+        if not self.hors_ligne and time.time() - entree["recupere_le"] > self.ttl:
+            return None
+        try:
+            os.utime(chemin)
+        except FileNotFoundError:
+            # Évincé par un autre processus depuis la lecture : la réponse lue reste valable
+            pass
+        return entree["reponse"]
+
+    def ecrire(self, lat, lon, reponse):
+        """
+        Enregistre une réponse sous l'heure de prévision courante, puis applique l'éviction LRU.
+
+        :param lat: Latitude.
+        :type lat: float
+        :param lon: Longitude.
+        :type lon: float
+        :param reponse: Réponse de l'API.
+        :type reponse: dict
+        """
+        heure = datetime.now(timezone.utc).strftime("%Y%m%d%H")
+        chemin = os.path.join(self.dossier, f"{self.prefixe(lat, lon)}_{heure}.json.gz")
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with gzip.open(temporaire, "wt", encoding="utf-8") as fichier:
+            json.dump({"recupere_le": time.time(), "reponse": reponse}, fichier, separators=(",", ":"))
+        os.replace(temporaire, chemin)
+        self.evincer()
+
+    def evincer(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de `max_entrees`."""
+        fichiers = glob.glob(os.path.join(self.dossier, "*.json.gz"))
+        if len(fichiers) <= self.max_entrees:
+            return
+        fichiers.sort(key=os.path.getmtime)
+        for chemin in fichiers[:len(fichiers) - self.max_entrees]:
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+
+    def obtenir(self, lat, lon, telecharger):
+        """
+        Renvoie la réponse du cache, ou la télécharge puis l'enregistre.
+
+        :param lat: Latitude.
+        :type lat: float
+        :param lon: Longitude.
+        :type lon: float
+        :param telecharger: Fonction sans argument qui interroge l'API et renvoie la réponse.
+        :type telecharger: callable
+        :return: Réponse de l'API.
+        :rtype: dict
+        """
+        reponse = self.lire(lat, lon)
+        if reponse is not None:
+            self.succes += 1
+            return reponse
+        if self.hors_ligne:
+            raise LookupError(f"Aucune réponse météo enregistrée pour {self.prefixe(lat, lon)} (mode hors ligne)")
+        reponse = telecharger()
+        self.echecs += 1
+        self.ecrire(lat, lon, reponse)
+        return reponse
+
+
+def cache_par_defaut():
+    """
+    Renvoie le cache partagé du processus, configuré par les variables d'environnement.
+
+    :return: Cache par défaut.
+    :rtype: CacheVent
+    """
+    global _cache_par_defaut
+    with _VERROU:
+        if _cache_par_defaut is None:
+            _cache_par_defaut = CacheVent(
+                dossier=os.environ.get("PARACHUTE_CACHE_VENT", DOSSIER_PAR_DEFAUT),
+                ttl=float(os.environ.get("PARACHUTE_VENT_TTL", 3600)),
+                hors_ligne=os.environ.get("PARACHUTE_VENT_HORS_LIGNE") == "1",
+            )
+        return _cache_par_defaut
@@ -0,0 +1,158 @@
+"""
+Ce module calcule le point de largage (CARP, Computed Air Release Point) : la région de largage d'où la
+cible est atteignable sous le vent prévu, et le point de cette région qui demande le moins d'effort de
+contrôle.
+
+Responsable de :
+    - déduire la région de largage de l'empreinte atteignable (`empreinte.contour_atteignable`) : la cible
+      est atteinte depuis x_0 si, et seulement si, cible - x_0 - dérive est un déplacement atteignable ;
+      la région est donc le contour sans vent retourné, centré sur cible - dérive,
+    - chercher le point de largage par une recherche sur grille vectorisée dans cette région, l'effort de
+      contrôle étant interpolé dans la table d'aperçu (`apercu.TableApercu`, résolue sur un pool de
+      processus) : l'optimum ne dépend que du décalage effectif e = x_0 - cible + dérive,
+    - tant que la table d'aperçu n'existe pas (sa construction prend de l'ordre d'une minute), se
+      contenter d'une recherche rapide parmi des plans à taux de virage constant (`point_largage_virage`),
+    - placer ce point de largage dans un `SimulerTrajectoire`, avec la commande prévue pour amorcer la
+      résolution exacte.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import numpy as np
+
+from apercu import table_apercu
+from empreinte import contour_atteignable
+from pilote_scp import cout_controle, cout_reel
+from propagation import propager
+
+# Nombre de virages totaux essayés par `point_largage_virage`, répartis sur [-pi, pi]
+N_VIRAGES = 73
+
+
+def point_largage(cible, W, table, contour, pas=25., tolerance=1.):
+    """
+    Calcule le point de largage d'effort de contrôle minimal et la région de largage.
+
+    :param cible: Position de la cible (2,).
+    :type cible: array_like
+    :param W: Vent (2, N) de l'heure de largage.
+    :type W: np.ndarray
+    :param table: Table d'aperçu de même N et même cap initial.
+    :type table: TableApercu
+    :param contour: Contour atteignable sans vent (K, 2), voir `empreinte.contour_atteignable`.
+    :type contour: np.ndarray
+    :param pas: Pas de la grille de recherche (m).
+    :type pas: float
+    :param tolerance: Écart d'atterrissage prévu (m) au-delà duquel un point de grille est exclu.
+    :type tolerance: float
+    :return: Dictionnaire (x_0 : point de largage (2,) ; effort : effort de contrôle prévu ; region : polygone
+        de largage (K, 2) ; xs, ys, efforts : grille des efforts prévus, NaN hors de la région).
+    :rtype: dict
+    """
+    from matplotlib.path import Path
+
+    cible = np.ravel(np.asarray(cible, dtype=float))
+    derive = np.asarray(W, dtype=float)[:, :table.N - 1].sum(axis=1)
+    # Décalages effectifs atteignables : l'opposé du contour sans vent
+    oppose = -np.asarray(contour, dtype=float)
+    bas = np.maximum(oppose.min(axis=0), [table.decalages_x[0], table.decalages_y[0]])
+    haut = np.minimum(oppose.max(axis=0), [table.decalages_x[-1], table.decalages_y[-1]])
+    ex = np.arange(bas[0], haut[0] + pas / 2, pas)
+    ey = np.arange(bas[1], haut[1] + pas / 2, pas)
+    e = np.stack(np.meshgrid(ex, ey), axis=-1).reshape(-1, 2)
+
+    admissibles = Path(oppose).contains_points(e)
+    admissibles &= np.linalg.norm(table.evaluer(table.residus, e), axis=1) <= tolerance
+    if not admissibles.any():
+        raise ValueError("Aucun point de largage n'atteint la cible")
+    efforts = np.where(admissibles, table.evaluer(table.efforts, e), np.nan)
+    meilleur = np.nanargmin(efforts)
+
+    origine = cible - derive
+    return {"x_0": origine + e[meilleur], "effort": float(efforts[meilleur]), "region": origine + oppose,
+            "xs": origine[0] + ex, "ys": origine[1] + ey, "efforts": efforts.reshape(len(ey), len(ex))}
+
+
+def point_largage_virage(cible, W, v, dt, contour, psi_0=0., n_virages=N_VIRAGES):
+    """
+    Calcule un point de largage sans table d'aperçu, par recherche sur une grille de plans à taux de
+    virage constant.
+
+    Chaque plan tourne régulièrement du cap initial `psi_0` à `psi_0 + virage`, à la vitesse v ; le point
+    de largage est celui d'où ce plan atterrit exactement sur la cible sous le vent W. Le plan retenu
+    minimise le coût du problème non convexe (`pilote_scp.cout_reel`), qui se réduit ici au terme d'angle
+    final et à l'effort de contrôle : c'est, à quelques pour cent d'effort près, l'optimum de
+    `point_largage`, pour le prix de quelques propagations vectorisées.
+
+    :param cible: Position de la cible (2,).
+    :type cible: array_like
+    :param W: Vent (2, N) de l'heure de largage.
+    :type W: np.ndarray
+    :param v: Profil de vitesse (N,).
+    :type v: np.ndarray
+    :param dt: Pas de temps.
+    :type dt: float
+    :param contour: Contour atteignable sans vent (K, 2), voir `empreinte.contour_atteignable`.
+    :type contour: np.ndarray
+    :param psi_0: Cap initial imposé (rad).
+    :type psi_0: float
+    :param n_virages: Nombre de virages totaux essayés, répartis sur [-pi, pi].
+    :type n_virages: int
+    :return: Dictionnaire (x_0 : point de largage (2,) ; effort : effort de contrôle du plan ; region : polygone
+        de largage (K, 2) ; xs, ys, efforts : None, sans grille d'efforts ; amorce : commande et trajectoire
+        du plan).
+    :rtype: dict
+    """
+    cible = np.ravel(np.asarray(cible, dtype=float))
+    W = np.asarray(W, dtype=float)
+    N = W.shape[1]
+    caps = psi_0 + np.linspace(-np.pi, np.pi, n_virages)[:, None] * np.linspace(0., 1., N)
+    u = v * np.stack([np.cos(caps), np.sin(caps)], axis=1)
+    # Départs tels que chaque plan atterrisse sur la cible
+    departs = cible - propager(np.zeros(2), u, W, dt)[:, :, -1]
+    x = propager(departs, u, W, dt)
+    couts = [cout_reel(x[k], u[k], cible, v, dt) for k in range(n_virages)]
+    meilleur = int(np.argmin(couts))
+
+    origine = cible - W[:, :N - 1].sum(axis=1)
+    return {"x_0": departs[meilleur], "effort": float(cout_controle(u[meilleur], v, dt)),
+            "region": origine - np.asarray(contour, dtype=float), "xs": None, "ys": None, "efforts": None,
+            "amorce": (u[meilleur], x[meilleur])}
+
+
+def placer_largage(simulateur, table=None, attendre=True, **options):
+    """
+    Remplace le point de départ d'un simulateur par le point de largage d'effort minimal.
+
+    La table d'aperçu est construite puis enregistrée si elle n'existe pas encore (une seule fois). Sans
+    `attendre`, ou si sa construction a échoué, le point de largage est celui de `point_largage_virage`.
+    Le résultat est conservé dans `simulateur.carp`, avec la commande et la trajectoire prévues
+    (`amorce`), à transmettre à `optimiser_trajectoire` ou `CacheTrajectoires.optimiser`.
+
+    :param simulateur: Simulateur dont la cible et l'heure de largage sont fixées.
+    :type simulateur: SimulerTrajectoire
+    :param table: Table d'aperçu (par défaut : celle du processus, voir `apercu.table_apercu`).
+    :type table: TableApercu
+    :param attendre: Attendre la construction de la table si elle est en cours, plutôt que se rabattre
+        sur `point_largage_virage`.
+    :type attendre: bool
+    :param options: Paramètres de `point_largage` (pas, tolerance).
+    :return: Résultat de `point_largage` ou de `point_largage_virage`, complété de `amorce`.
+    :rtype: dict
+    """
+    if table is None:
+        table = table_apercu(simulateur.N, simulateur.psi_0, attendre=attendre)
+    W, _, time_vec = simulateur.champ_vent()
+    cible = [simulateur.lat, simulateur.lon]
+    contour = contour_atteignable(simulateur.N, simulateur.psi_0)
+    if table is None:
+        v = simulateur.calcul_profil_vitesse(simulateur.calcul_altitude(time_vec))
+        resultat = point_largage_virage(cible, W, v, time_vec[-1] / (simulateur.N - 1), contour, simulateur.psi_0)
+    else:
+        resultat = point_largage(cible, W, table, contour, **options)
+        prevision = table.predire(resultat["x_0"], cible, W)
+        resultat["amorce"] = (prevision["commande"][0], prevision["trajectoire"][0])
+    simulateur.x_0 = resultat["x_0"].reshape(2, 1)
+    simulateur.carp = resultat
+    return resultat
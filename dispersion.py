@@ -0,0 +1,326 @@
+"""
+Ce module définit la classe `AnalyseDispersion`, qui estime la dispersion des atterrissages par Monte Carlo.
+
+Responsable de :
+    - tirer des points de largage autour de la cible (comme `SimulerTrajectoire` avec `random_range`)
+      et des perturbations du vent autour du profil `ImportVent` (biais par composante et rafales par étape),
+    - optimiser, pour chaque point de largage, le plan sur le vent nominal (la prévision), puis rejouer
+      cette commande fixée sous le vent perturbé du tirage (`propagation.atterrissages`) : l'erreur
+      mesurée est celle d'un plan qui ne connaît pas le vent réel,
+    - répartir les optimisations sur un pool de processus ; chaque processus reçoit une fois le vent
+      nominal et garde en cache son problème compilé, chaque tâche ne transporte que son tirage,
+    - écrire chaque résultat dès qu'il arrive dans un fichier JSON Lines, pour qu'un calcul interrompu
+      reprenne là où il s'était arrêté,
+    - résumer la distribution des erreurs d'atterrissage (CEP50, CEP90, taux d'échec),
+    - tirer, avec le même modèle de perturbation, des scénarios de vent pour l'optimisation robuste
+      (`scenarios_vent`, voir `SimulerTrajectoire.optimiser_trajectoire`).
+
+Le tirage n° i ne dépend que de (graine, i) : reprendre un calcul ou changer le nombre de processus
+ne modifie pas les échantillons. L'en-tête du fichier de résultats contient aussi une empreinte du vent
+nominal, le backend et le solveur : après un rafraîchissement de la prévision, le calcul repart d'un
+nouveau fichier au lieu de mêler des échantillons tirés autour de deux vents différents.
+
+Usage :
+    python dispersion.py 48.85 2.35 2000 dispersion.jsonl
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from importer_vent import ProfilVent, import_vent
+from propagation import atterrissages
+from simultion_final import _BACKENDS, SimulerTrajectoire
+
+# État de chaque processus du pool : vent nominal et paramètres communs, fixés par `_initialiser`
+_TRAVAILLEUR = {}
+
+
+def _initialiser(lat, lon, W, z_t, time_vec, backend, solveur):
+    """Reçoit les données communes et construit le problème compilé du processus."""
+    erreurs = (ValueError, ArithmeticError)
+    if backend == "cvxpy":
+        import cvxpy as cvx
+        erreurs += (cvx.error.SolverError,)
+    _TRAVAILLEUR.update(lat=lat, lon=lon, W=W, profil=ProfilVent(W[None], z_t, time_vec), backend=backend,
+                        solveur=solveur, erreurs=erreurs)
+    _BACKENDS[backend](W.shape[1])
+
+
+def _simuler(tirage):
+    """
+    Optimise le plan d'un échantillon sur le vent nominal, puis le rejoue sous le vent perturbé
+    (exécuté dans un processus du pool).
+
+    Un échec du solveur (y compris `cvxpy.error.SolverError` avec le backend cvxpy) est enregistré
+    comme un échantillon non convergé.
+
+    :param tirage: Tuple (indice, x_0, perturbation du vent (2, N)).
+    :type tirage: tuple
+    :return: Résultat de l'échantillon, sérialisable en JSON.
+    :rtype: dict
+    """
+    i, x_0, perturbation = tirage
+    t = _TRAVAILLEUR
+    simulateur = SimulerTrajectoire(lat=t["lat"], lon=t["lon"], N=t["W"].shape[1], backend=t["backend"],
+                                    solveur=t["solveur"], profil_vent=t["profil"], x_0=x_0)
+    debut = time.perf_counter()
+    resultat = {"indice": i, "x_0": [float(c) for c in x_0]}
+    try:
+        _, erreur_plan, _, _, _ = simulateur.optimiser_trajectoire()
+    except t["erreurs"] as e:
+        resultat.update(converge=False, message=str(e))
+    else:
+        atterrissage = atterrissages(simulateur.x_0, simulateur.u_star, t["W"] + perturbation, simulateur.dt)
+        resultat.update(converge=simulateur.converge,
+                        erreur=float(np.linalg.norm(atterrissage - simulateur.target)),
+                        atterrissage=[float(c) for c in atterrissage], erreur_plan=float(erreur_plan),
+                        n_iter=simulateur.n_iter)
+    resultat["duree"] = time.perf_counter() - debut
+    return resultat
+
+
+def scenarios_vent(W, K, sigma_vent=1., sigma_rafale=.5, graine=0):
+    """
+    Tire K scénarios de vent autour d'un vent nominal : biais par composante et rafales par étape.
+
+    :param W: Vent nominal (2, N).
+    :type W: np.ndarray
+    :param K: Nombre de scénarios.
+    :type K: int
+    :param sigma_vent: Écart type du biais de vent par composante (m/s).
+    :type sigma_vent: float
+    :param sigma_rafale: Écart type des rafales (m/s).
+    :type sigma_rafale: float
+    :param graine: Graine des tirages.
+    :type graine: int
+    :return: Scénarios (K, 2, N).
+    :rtype: np.ndarray
+    """
+    W = np.asarray(W, dtype=float)
+    rng = np.random.default_rng(graine)
+    return W + rng.normal(0., sigma_vent, (K, 2, 1)) + rng.normal(0., sigma_rafale, (K,) + W.shape)
+
+
+class AnalyseDispersion:
+    """
+    Analyse de dispersion Monte Carlo d'un largage.
+
+    :param lat: Latitude de la cible.
+    :type lat: float
+    :param lon: Longitude de la cible.
+    :type lon: float
+    :param hour_index: Index horaire de largage.
+    :type hour_index: float
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param random_range: Demi-côté du carré de tirage du point de largage autour de la cible.
+    :type random_range: float
+    :param sigma_vent: Écart type du biais de vent par composante, commun à toute la descente (m/s).
+    :type sigma_vent: float
+    :param sigma_rafale: Écart type des rafales, indépendantes à chaque étape (m/s).
+    :type sigma_rafale: float
+    :param graine: Graine des tirages.
+    :type graine: int
+    :param backend: Backend de résolution ("cvxpy" ou "direct").
+    :type backend: str
+    :param solveur: Solveur conique.
+    :type solveur: str
+    :param profil: Profil de vent déjà calculé (sinon récupéré via `import_vent`).
+    :type profil: ProfilVent
+    """
+
+    def __init__(self, lat, lon, hour_index=0, N=31, random_range=600, sigma_vent=1., sigma_rafale=.5,
+                 graine=0, backend="direct", solveur="ECOS", profil=None):
+        self.lat = lat
+        self.lon = lon
+        self.hour_index = hour_index
+        self.N = N
+        self.random_range = random_range
+        self.sigma_vent = sigma_vent
+        self.sigma_rafale = sigma_rafale
+        self.graine = graine
+        self.backend = backend
+        self.solveur = solveur
+        if profil is None:
+            self.W, self.z_t, self.time, _ = import_vent(lat, lon, hour_index, N)
+        else:
+            self.W, self.z_t, self.time = profil.W(hour_index), profil.z_t, profil.time
+
+    def configuration(self):
+        """
+        Renvoie les paramètres qui déterminent les tirages (en-tête du fichier de résultats).
+
+        :return: Configuration de l'analyse.
+        :rtype: dict
+        """
+        return {"lat": self.lat, "lon": self.lon, "hour_index": self.hour_index, "N": self.N,
+                "random_range": self.random_range, "sigma_vent": self.sigma_vent,
+                "sigma_rafale": self.sigma_rafale, "graine": self.graine,
+                "vent": hashlib.sha256(np.ascontiguousarray(self.W, dtype=float).tobytes()).hexdigest()[:16],
+                "backend": self.backend, "solveur": self.solveur}
+
+    def tirage(self, i):
+        """
+        Renvoie le tirage n° i : point de largage et perturbation du vent.
+
+        :param i: Indice de l'échantillon.
+        :type i: int
+        :return: Tuple (i, x_0 (2,), perturbation (2, N)).
+        :rtype: tuple
+        """
+        rng = np.random.default_rng([self.graine, i])
+        x_0 = np.array([self.lat, self.lon]) + rng.uniform(-self.random_range, self.random_range, 2)
+        perturbation = rng.normal(0., self.sigma_vent, (2, 1)) + rng.normal(0., self.sigma_rafale, (2, self.N))
+        return i, x_0, perturbation
+
+    def lire(self, fichier):
+        """
+        Relit les résultats déjà écrits dans un fichier, s'ils viennent de la même configuration.
+
+        Une dernière ligne tronquée (processus interrompu pendant l'écriture) est ignorée. Un fichier produit
+        avec une autre configuration (autre vent nominal, autre backend...) est renommé en
+        `<fichier>.precedent` et aucun résultat n'est repris.
+
+        :param fichier: Fichier JSON Lines.
+        :type fichier: str
+        :return: Résultats déjà calculés, par indice.
+        :rtype: dict
+        """
+        if not os.path.exists(fichier):
+            return {}
+        with open(fichier, encoding="utf-8") as f:
+            lignes = f.read().splitlines()
+        if not lignes:
+            return {}
+        try:
+            entete = json.loads(lignes[0])
+        except ValueError:
+            entete = None
+        if entete != self.configuration():
+            os.replace(fichier, fichier + ".precedent")
+            return {}
+        resultats = {}
+        for ligne in lignes[1:]:
+            try:
+                resultat = json.loads(ligne)
+            except ValueError:
+                continue
+            resultats[resultat["indice"]] = resultat
+        return resultats
+
+    def executer(self, n_echantillons, fichier=None, processus=None, progression=None):
+        """
+        Lance (ou reprend) l'analyse sur `n_echantillons` tirages.
+
+        :param n_echantillons: Nombre total d'échantillons.
+        :type n_echantillons: int
+        :param fichier: Fichier JSON Lines où chaque résultat est ajouté dès sa réception ;
+            les indices déjà présents ne sont pas recalculés.
+        :type fichier: str
+        :param processus: Nombre de processus (par défaut : nombre de cœurs).
+        :type processus: int
+        :param progression: Fonction appelée à chaque résultat avec (nombre terminé, total, résultat).
+        :type progression: callable
+        :return: Résultats de tous les échantillons, triés par indice.
+        :rtype: list
+        """
+        resultats = self.lire(fichier) if fichier else {}
+        restants = [i for i in range(n_echantillons) if i not in resultats]
+
+        sortie = None
+        if fichier:
+            nouveau = not os.path.exists(fichier) or os.path.getsize(fichier) == 0
+            if not nouveau:
+                with open(fichier, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    tronque = f.read(1) != b"\n"
+            sortie = open(fichier, "a", encoding="utf-8")
+            if nouveau:
+                sortie.write(json.dumps(self.configuration()) + "\n")
+            elif tronque:
+                # Ligne interrompue en cours d'écriture : l'échantillon est recalculé sur une nouvelle ligne
+                sortie.write("\n")
+        try:
+            if restants:
+                with multiprocessing.Pool(processus or os.cpu_count(), _initialiser,
+                                          (self.lat, self.lon, self.W, self.z_t, self.time,
+                                           self.backend, self.solveur)) as pool:
+                    taches = pool.imap_unordered(_simuler, map(self.tirage, restants), chunksize=4)
+                    for resultat in taches:
+                        resultats[resultat["indice"]] = resultat
+                        if sortie:
+                            sortie.write(json.dumps(resultat) + "\n")
+                            sortie.flush()
+                        if progression:
+                            progression(len(resultats), n_echantillons, resultat)
+        finally:
+            if sortie:
+                sortie.close()
+        return [resultats[i] for i in sorted(resultats) if i < n_echantillons]
+
+    def statistiques(self, resultats, classes=20):
+        """
+        Résume la distribution des erreurs d'atterrissage. Les erreurs sont celles des plans rejoués sous le
+        vent perturbé (voir `_simuler`).
+
+        :param resultats: Résultats de `executer`.
+        :type resultats: list
+        :param classes: Nombre de classes de l'histogramme des erreurs.
+        :type classes: int
+        :return: Dictionnaire (n, taux_echec, cep50, cep90, erreur_moyenne, erreur_max, histogramme, bornes).
+        :rtype: dict
+        """
+        erreurs = np.array([r["erreur"] for r in resultats if r["converge"]])
+        n = len(resultats)
+        stats = {"n": n, "taux_echec": 1 - len(erreurs) / n if n else 0.}
+        if erreurs.size:
+            histogramme, bornes = np.histogram(erreurs, bins=classes)
+            stats.update(cep50=float(np.percentile(erreurs, 50)), cep90=float(np.percentile(erreurs, 90)),
+                         erreur_moyenne=float(erreurs.mean()), erreur_max=float(erreurs.max()),
+                         histogramme=histogramme.tolist(), bornes=bornes.tolist())
+        return stats
+
+
+def dispersion(lat, lon, n_echantillons=1000, fichier=None, processus=None, progression=None, **options):
+    """
+    Fonction d'interface simplifiée : lance l'analyse et renvoie ses statistiques.
+
+    :param lat: Latitude de la cible.
+    :type lat: float
+    :param lon: Longitude de la cible.
+    :type lon: float
+    :param n_echantillons: Nombre d'échantillons.
+    :type n_echantillons: int
+    :param fichier: Fichier de reprise (voir `AnalyseDispersion.executer`).
+    :type fichier: str
+    :param processus: Nombre de processus.
+    :type processus: int
+    :param progression: Fonction de suivi (voir `AnalyseDispersion.executer`).
+    :type progression: callable
+    :param options: Autres paramètres de `AnalyseDispersion`.
+    :return: Tuple (statistiques, résultats).
+    :rtype: tuple
+    """
+    analyse = AnalyseDispersion(lat, lon, **options)
+    resultats = analyse.executer(n_echantillons, fichier, processus, progression)
+    return analyse.statistiques(resultats), resultats
+
+
+if __name__ == "__main__":
+    lat, lon = float(sys.argv[1]), float(sys.argv[2])
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    fichier = sys.argv[4] if len(sys.argv) > 4 else None
+    stats, _ = dispersion(lat, lon, n, fichier,
+                          progression=lambda fait, total, _: print(f"\r{fait}/{total}", end="", flush=True))
+    print()
+    for cle in ("n", "taux_echec", "cep50", "cep90", "erreur_moyenne", "erreur_max"):
+        print(f"{cle:15s} {stats.get(cle)}")
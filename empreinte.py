@@ -0,0 +1,232 @@
+"""
+Ce module calcule l'empreinte atteignable au sol depuis un point de largage : l'ensemble des points
+d'atterrissage accessibles sous le vent de l'heure choisie.
+
+Responsable de :
+    - résoudre, pour chaque direction d'un faisceau de rayons, le problème de guidage vers une cible
+      lointaine dans cette direction (la dynamique, la borne de virage `phid_max` et le cap initial
+      imposé sont ceux de `SimulerTrajectoire`) : le point d'atterrissage obtenu est le plus avancé dans
+      la direction, donc un sommet du contour atteignable,
+    - balayer les rayons en deux passes parallèles (sens trigonométrique et sens horaire depuis le cap
+      initial), chaque rayon amorcé par le précédent, et garder pour chaque direction le meilleur sommet,
+    - translater le contour par la dérive du vent, le convertir en polygone géographique et en grille
+      de marge (distance au bord, en m) pour une superposition folium,
+    - garder en cache les empreintes par (site, heure).
+
+La marge de vitesse de l'étape 2 n'est que pénalisée : vers une cible lointaine, elle gonflerait la
+vitesse. Les rayons s'arrêtent donc à l'étape 1 (`etape_max=1`, vitesse bornée à v + `rayon_min`).
+
+Le vent ne fait que translater le point d'atterrissage (x_N = x_0 + déplacements commandés + somme des
+W[:, k]) : le contour sans vent ne dépend que de (N, psi_0) et n'est résolu qu'une fois par processus ;
+une empreinte (site, heure) est ce contour décalé de la dérive.
+
+Les positions du modèle sont en mètres, x vers l'est et y vers le nord (composantes vx, vy du vent).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cache_trajectoires import cle_heure
+from importer_vent import ImportVent, ProfilVent
+from simultion_final import SimulerTrajectoire
+
+N_RAYONS = 72
+# Distance des cibles des rayons, au-delà de toute portée (environ 3 km pour une descente depuis 1200 m)
+PORTEE = 10000.
+# Chaque passe dépasse le demi-tour de cet angle, pour que les deux passes se recouvrent vers l'arrière
+RECOUVREMENT = np.pi / 4
+METRES_PAR_DEGRE = 111320.
+MAX_EMPREINTES = 64
+
+_contours = {}
+_empreintes = OrderedDict()
+_VERROU = threading.Lock()
+
+
+def _balayage(N, psi_0, angles):
+    """
+    Résout les rayons `angles` dans l'ordre, dans un processus du pool, chacun amorcé par le précédent.
+
+    :return: Points d'atterrissage sans vent, depuis l'origine, de forme (len(angles), 2).
+    :rtype: np.ndarray
+    """
+    time_vec, z_t = ImportVent(0, 0, N=N).profil_descente()
+    profil = ProfilVent(np.zeros((1, 2, N)), z_t, time_vec)
+    points = np.full((len(angles), 2), np.nan)
+    u = x = None
+    for i, angle in enumerate(angles):
+        simulateur = SimulerTrajectoire(PORTEE * np.cos(angle), PORTEE * np.sin(angle), N, backend="direct",
+                                        x_0=[0., 0.], profil_vent=profil)
+        simulateur.psi_0 = psi_0
+        try:
+            if u is None:
+                simulateur.optimiser_trajectoire(etape_max=1)
+            else:
+                simulateur.optimiser_trajectoire(u, x, rayon_initial=0., etape_max=1)
+        except (ValueError, ArithmeticError):
+            u = x = None
+            continue
+        u, x = simulateur.u_star, simulateur.x_star
+        points[i] = x[:, -1]
+    return points
+
+
+def contour_atteignable(N=31, psi_0=0., n_rayons=N_RAYONS):
+    """
+    Renvoie le contour atteignable sans vent, depuis l'origine, résolu une fois par (N, psi_0, n_rayons).
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param psi_0: Cap initial imposé (rad).
+    :type psi_0: float
+    :param n_rayons: Nombre de directions.
+    :type n_rayons: int
+    :return: Sommets (n_rayons, 2), par angle croissant depuis `psi_0`.
+    :rtype: np.ndarray
+    """
+    cle = (N, round(psi_0, 3), n_rayons)
+    with _VERROU:
+        if cle in _contours:
+            return _contours[cle]
+
+    decalages = 2 * np.pi * np.arange(n_rayons) / n_rayons
+    passe = decalages[decalages <= np.pi + RECOUVREMENT]
+    with ProcessPoolExecutor(max_workers=min(2, os.cpu_count())) as pool:
+        directs, retrogrades = pool.map(_balayage, [N, N], [psi_0, psi_0], [psi_0 + passe, psi_0 - passe])
+
+    # Deux candidats par direction au plus : on garde le plus avancé dans la direction
+    candidats = np.full((2, n_rayons, 2), np.nan)
+    candidats[0, :len(passe)] = directs
+    candidats[1, (-np.arange(len(passe))) % n_rayons] = retrogrades
+    directions = np.stack([np.cos(psi_0 + decalages), np.sin(psi_0 + decalages)], axis=1)
+    avancees = np.nan_to_num(np.einsum("cnk,nk->cn", candidats, directions), nan=-np.inf)
+    contour = candidats[np.argmax(avancees, axis=0), np.arange(n_rayons)]
+    if np.isnan(contour).any():
+        raise ValueError("Certains rayons de l'empreinte n'ont pas de solution")
+    with _VERROU:
+        _contours[cle] = contour
+    return contour
+
+
+def marges(contour, points):
+    """
+    Renvoie, pour chaque point, la distance au bord du polygone s'il est à l'intérieur, 0 sinon.
+
+    :param contour: Sommets du polygone (K, 2).
+    :type contour: np.ndarray
+    :param points: Points (M, 2).
+    :type points: np.ndarray
+    :return: Marges (M,).
+    :rtype: np.ndarray
+    """
+    from matplotlib.path import Path
+
+    debuts, fins = contour, np.roll(contour, -1, axis=0)
+    cotes = fins - debuts
+    relatifs = points[:, None, :] - debuts[None]
+    t = np.clip(np.einsum("mkc,kc->mk", relatifs, cotes) / np.einsum("kc,kc->k", cotes, cotes), 0., 1.)
+    distances = np.linalg.norm(relatifs - t[..., None] * cotes[None], axis=2).min(axis=1)
+    return np.where(Path(contour).contains_points(points), distances, 0.)
+
+
+class Empreinte:
+    """
+    Empreinte atteignable d'un site à une heure donnée, relative au point de largage.
+
+    :param contour: Sommets du contour atteignable sans vent (K, 2).
+    :type contour: np.ndarray
+    :param derive: Dérive totale du vent pendant la descente (2,), en m.
+    :type derive: np.ndarray
+    """
+
+    def __init__(self, contour, derive):
+        self.contour = contour + derive
+        self.derive = derive
+
+    def polygone(self, x_0=(0., 0.)):
+        """
+        Renvoie le polygone des points d'atterrissage atteignables depuis `x_0`.
+
+        :param x_0: Point de largage dans le repère du modèle (m).
+        :type x_0: array_like
+        :return: Sommets (K, 2), en m.
+        :rtype: np.ndarray
+        """
+        return self.contour + np.ravel(x_0)
+
+    def raster(self, pas=50.):
+        """
+        Renvoie la grille de marge (distance au bord, 0 hors de l'empreinte) autour du point de largage.
+
+        :param pas: Pas de la grille (m).
+        :type pas: float
+        :return: Tuple (xs, ys, marge (len(ys), len(xs))), xs et ys croissants, relatifs au largage.
+        :rtype: tuple
+        """
+        bas, haut = self.contour.min(axis=0), self.contour.max(axis=0)
+        xs = np.arange(bas[0], haut[0] + pas, pas)
+        ys = np.arange(bas[1], haut[1] + pas, pas)
+        grille = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+        return xs, ys, marges(self.contour, grille).reshape(len(ys), len(xs))
+
+    @staticmethod
+    def en_geographique(lat, lon, points):
+        """
+        Convertit des décalages (est, nord) en m autour de (lat, lon) en coordonnées [lat, lon].
+
+        :param lat: Latitude du point de largage.
+        :type lat: float
+        :param lon: Longitude du point de largage.
+        :type lon: float
+        :param points: Décalages (M, 2).
+        :type points: np.ndarray
+        :return: Coordonnées (M, 2) [lat, lon].
+        :rtype: np.ndarray
+        """
+        points = np.asarray(points, dtype=float)
+        return np.stack([lat + points[:, 1] / METRES_PAR_DEGRE,
+                         lon + points[:, 0] / (METRES_PAR_DEGRE * np.cos(np.radians(lat)))], axis=1)
+
+
+def empreinte(lat, lon, hour_index=0, profil=None, N=31, psi_0=0., n_rayons=N_RAYONS):
+    """
+    Renvoie l'empreinte atteignable depuis un point de largage, en cache par (site, heure).
+
+    :param lat: Latitude du point de largage.
+    :type lat: float
+    :param lon: Longitude du point de largage.
+    :type lon: float
+    :param hour_index: Index horaire de largage, éventuellement fractionnaire.
+    :type hour_index: float
+    :param profil: Profil de vent du site (importé si None).
+    :type profil: ProfilVent
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param psi_0: Cap initial imposé (rad).
+    :type psi_0: float
+    :param n_rayons: Nombre de directions du contour.
+    :type n_rayons: int
+    :return: Empreinte du site à cette heure.
+    :rtype: Empreinte
+    """
+    simulateur = SimulerTrajectoire(lat, lon, N, hour_index=hour_index, profil_vent=profil, x_0=[lat, lon])
+    cle = (round(lat, 4), round(lon, 4), cle_heure(simulateur), N, round(psi_0, 3), n_rayons)
+    with _VERROU:
+        if cle in _empreintes:
+            _empreintes.move_to_end(cle)
+            return _empreintes[cle]
+
+    W, _, _ = simulateur.champ_vent()
+    resultat = Empreinte(contour_atteignable(N, psi_0, n_rayons), W[:, :N - 1].sum(axis=1))
+    with _VERROU:
+        _empreintes[cle] = resultat
+        while len(_empreintes) > MAX_EMPREINTES:
+            _empreintes.popitem(last=False)
+    return resultat
@@ -0,0 +1,322 @@
+"""
+Ce module planifie en un appel les trajectoires de plusieurs charges larguées lors d'un même passage.
+
+Responsable de :
+    - regrouper les cibles par site (position arrondie, comme les clés de `CacheVent`) et récupérer le
+      vent une seule fois par groupe, en une requête groupée (`ImportVentMultiSites`),
+    - optimiser les charges indépendamment, en parallèle sur un pool de processus,
+    - en option, imposer une distance minimale entre charges pendant le vol : les paires trop proches
+      sont réunies en groupes de conflit, et chaque groupe est résolu conjointement (`ProblemeFlotte`),
+    - mesurer le temps total, le temps du vent et le temps de résolution de chaque charge.
+
+Le modèle prend la cible et le départ comme coordonnées planes en mètres : les cibles d'un groupe sont
+exprimées en mètres (est, nord) autour du centre du groupe, pour que les distances entre charges aient
+un sens. La séparation porte sur les instants de vol 1 à N - 2 : au largage les positions sont imposées,
+à l'atterrissage elles sont celles des cibles.
+
+Formulation conjointe : les K problèmes du groupe (étape 2 de `GabaritSCP`) sont réunis en un seul
+problème cvxpy, avec pour chaque paire (i, j) et chaque instant k la contrainte linéarisée
+n_ijk . (x_i[k] - x_j[k]) >= separation - s_ijk, où n_ijk est la direction de i vers j à l'itéré
+précédent (le demi-plan est une restriction convexe de la contrainte ||x_i[k] - x_j[k]|| >= separation)
+et s_ijk >= 0 un relâchement pénalisé comme l'écart à la cible (ALPHA_1 par mètre).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from empreinte import METRES_PAR_DEGRE
+from gabarit_scp import ALPHA_1, GabaritSCP
+from importer_vent import ImportVent, ProfilVent
+from pilote_scp import cout_controle
+from simultion_final import SimulerTrajectoire
+from solveurs import options_solveur
+
+
+def vers_local(origine, points):
+    """
+    Convertit des positions [lat, lon] en mètres (est, nord) autour de `origine`.
+
+    :param origine: Origine [lat, lon] du repère local.
+    :type origine: array_like
+    :param points: Positions (M, 2) [lat, lon].
+    :type points: array_like
+    :return: Positions (M, 2) en mètres.
+    :rtype: np.ndarray
+    """
+    origine, points = np.asarray(origine, dtype=float), np.atleast_2d(np.asarray(points, dtype=float))
+    return np.stack([(points[:, 1] - origine[1]) * METRES_PAR_DEGRE * np.cos(np.radians(origine[0])),
+                     (points[:, 0] - origine[0]) * METRES_PAR_DEGRE], axis=1)
+
+
+def vers_geographique(origine, points):
+    """
+    Convertit des positions (M, 2) en mètres (est, nord) autour de `origine` en [lat, lon].
+
+    :rtype: np.ndarray
+    """
+    origine, points = np.asarray(origine, dtype=float), np.atleast_2d(np.asarray(points, dtype=float))
+    return np.stack([origine[0] + points[:, 1] / METRES_PAR_DEGRE,
+                     origine[1] + points[:, 0] / (METRES_PAR_DEGRE * np.cos(np.radians(origine[0])))], axis=1)
+
+
+def _planifier_charge(indice, cible, x_0, W, z_t, time_vec, backend, solveur):
+    """
+    Optimise une charge dans un processus du pool (positions en mètres dans le repère du groupe).
+
+    :return: Résultat de la charge (indice, x_star, u_star, erreur, cout_controle, n_iter, converge, duree).
+    :rtype: dict
+    """
+    simulateur = SimulerTrajectoire(cible[0], cible[1], W.shape[1], backend=backend, solveur=solveur, x_0=x_0,
+                                    profil_vent=ProfilVent(W[None], z_t, time_vec))
+    debut = time.perf_counter()
+    try:
+        _, erreur, _, _, _ = simulateur.optimiser_trajectoire()
+    except (ValueError, ArithmeticError) as e:
+        return {"indice": indice, "x_star": None, "u_star": None, "erreur": np.inf, "cout_controle": np.inf,
+                "n_iter": None, "converge": False, "duree": time.perf_counter() - debut, "message": str(e)}
+    return {"indice": indice, "x_star": simulateur.x_star, "u_star": simulateur.u_star, "erreur": float(erreur),
+            "cout_controle": simulateur.calcul_cout_controle(), "n_iter": simulateur.n_iter,
+            "converge": simulateur.converge, "duree": time.perf_counter() - debut, "message": ""}
+
+
+def distances_minimales(trajectoires):
+    """
+    Renvoie la distance minimale en vol (instants 1 à N - 2) entre chaque paire de trajectoires.
+
+    :param trajectoires: Trajectoires (K, 2, N).
+    :type trajectoires: np.ndarray
+    :return: Matrice (K, K), infinie sur la diagonale.
+    :rtype: np.ndarray
+    """
+    vol = trajectoires[:, :, 1:-1]
+    distances = np.linalg.norm(vol[:, None] - vol[None], axis=2).min(axis=2)
+    np.fill_diagonal(distances, np.inf)
+    return distances
+
+
+def groupes_de_conflit(trajectoires, separation):
+    """
+    Réunit les charges liées par une chaîne de paires plus proches que `separation`.
+
+    :param trajectoires: Trajectoires (K, 2, N).
+    :type trajectoires: np.ndarray
+    :param separation: Distance minimale (m).
+    :type separation: float
+    :return: Groupes (listes d'indices) d'au moins deux charges.
+    :rtype: list
+    """
+    proches = distances_minimales(trajectoires) < separation
+    groupes, vus = [], set()
+    for depart in range(len(trajectoires)):
+        if depart in vus or not proches[depart].any():
+            continue
+        groupe, pile = [], [depart]
+        while pile:
+            i = pile.pop()
+            if i not in vus:
+                vus.add(i)
+                groupe.append(i)
+                pile.extend(np.nonzero(proches[i])[0].tolist())
+        groupes.append(sorted(groupe))
+    return groupes
+
+
+class ProblemeFlotte:
+    """
+    Problème conjoint de K charges d'un même groupe, avec séparation linéarisée entre toutes les paires.
+
+    :param K: Nombre de charges.
+    :type K: int
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param separation: Distance minimale en vol (m).
+    :type separation: float
+    """
+
+    def __init__(self, K, N, separation):
+        import cvxpy as cvx
+
+        self.N = N
+        self.gabarits = [GabaritSCP(N) for _ in range(K)]
+        self.paires = list(itertools.combinations(range(K), 2))
+        self.normales = [cvx.Parameter((2, N - 2)) for _ in self.paires]
+        self.relachements = cvx.Variable((len(self.paires), N - 2), nonneg=True)
+
+        contraintes = [c for g in self.gabarits for c in g.etape_2.constraints]
+        for p, ((i, j), n) in enumerate(zip(self.paires, self.normales)):
+            ecart = self.gabarits[i].x[:, 1:-1] - self.gabarits[j].x[:, 1:-1]
+            contraintes.append(cvx.sum(cvx.multiply(n, ecart), axis=0) >= separation - self.relachements[p])
+        cout = sum(g.etape_2.objective.expr for g in self.gabarits) + ALPHA_1 * cvx.sum(self.relachements)
+        self.probleme = cvx.Problem(cvx.Minimize(cout), contraintes)
+
+    def resoudre(self, donnees, trajectoires, commandes, options, max_iter=20, tol=1e-3):
+        """
+        Enchaîne les résolutions conjointes en mettant à jour u_bar et les normales de séparation.
+
+        :param donnees: Arguments de `GabaritSCP.charger` (W, x_0, cible, v, dt, u_0) de chaque charge.
+        :type donnees: list
+        :param trajectoires: Trajectoires initiales (K, 2, N), par exemple les solutions indépendantes.
+        :type trajectoires: np.ndarray
+        :param commandes: Commandes initiales (K, 2, N).
+        :type commandes: np.ndarray
+        :param options: Options de `cvx.Problem.solve`.
+        :type options: dict
+        :param max_iter: Nombre maximal de résolutions.
+        :type max_iter: int
+        :param tol: Variation relative du coût conjoint sous laquelle la boucle s'arrête (les positions, elles,
+            glissent encore de quelques mètres le long du bord des demi-plans).
+        :type tol: float
+        :return: Tuple (trajectoires, commandes, nombre de résolutions).
+        :rtype: tuple
+        """
+        x, u = np.array(trajectoires, dtype=float), np.array(commandes, dtype=float)
+        precedent = np.inf
+        for g, argument, u_k in zip(self.gabarits, donnees, u):
+            g.charger(*argument, u_k / np.linalg.norm(u_k, axis=0))
+        for iteration in range(1, max_iter + 1):
+            for (i, j), n in zip(self.paires, self.normales):
+                ecart = x[i, :, 1:-1] - x[j, :, 1:-1]
+                n.value = ecart / np.maximum(np.linalg.norm(ecart, axis=0), 1e-6)
+            self.probleme.solve(**options)
+            if self.gabarits[0].x.value is None:
+                raise ValueError(f"Le problème conjoint n'a pas de solution ({self.probleme.status})")
+            x = np.array([g.x.value for g in self.gabarits])
+            u = np.array([g.u.value for g in self.gabarits])
+            for g, u_k in zip(self.gabarits, u):
+                g.fixer_u_bar(u_k / np.linalg.norm(u_k, axis=0))
+            if abs(precedent - self.probleme.value) <= tol * abs(self.probleme.value):
+                break
+            precedent = self.probleme.value
+        return x, u, iteration
+
+
+def planifier_flotte(cibles, largages, hour_index=0, N=31, backend="direct", solveur="ECOS", separation=None,
+                     processus=None, precision=2, profil=None):
+    """
+    Planifie les trajectoires de plusieurs charges en un appel.
+
+    :param cibles: Cibles [lat, lon] des charges.
+    :type cibles: list
+    :param largages: Points de largage [lat, lon] des charges (dans l'ordre des cibles).
+    :type largages: list
+    :param hour_index: Index horaire de largage, commun aux charges.
+    :type hour_index: float
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param backend: Backend des résolutions indépendantes ("cvxpy" ou "direct").
+    :type backend: str
+    :param solveur: Solveur conique.
+    :type solveur: str
+    :param separation: Distance minimale en vol entre charges d'un même groupe (m) ; None : pas de contrainte.
+    :type separation: float
+    :param processus: Nombre de processus (par défaut : nombre de cœurs).
+    :type processus: int
+    :param precision: Nombre de décimales de lat/lon qui définissent un groupe (un vent par groupe).
+    :type precision: int
+    :param profil: Profil de vent commun à tous les groupes (sinon récupéré une fois par groupe).
+    :type profil: ProfilVent
+    :return: Dictionnaire (charges : résultat de chaque charge, avec groupe, trajectoire en [lat, lon] et
+        durée ; groupes : centres [lat, lon] ; conflits : groupes de charges résolus conjointement ;
+        separation_min : distance minimale en vol obtenue (m) ; duree_vent, duree_conjointe, duree_totale (s)).
+    :rtype: dict
+    """
+    debut = time.perf_counter()
+    cibles, largages = np.asarray(cibles, dtype=float), np.asarray(largages, dtype=float)
+    cles = [(round(lat, precision), round(lon, precision)) for lat, lon in cibles]
+    centres = list(dict.fromkeys(cles))
+    membres = [[i for i, c in enumerate(cles) if c == centre] for centre in centres]
+
+    if profil is None:
+        from vent_multi_sites import ImportVentMultiSites
+        multi = ImportVentMultiSites(hour_index, N)
+        try:
+            reponses = multi.recuperer(centres)
+        finally:
+            multi.fermer()
+        profils = [ImportVent(lat, lon, N=N).profil_vent(data) for (lat, lon), data in zip(centres, reponses)]
+    else:
+        profils = [profil] * len(centres)
+    vents = [p.W(hour_index) for p in profils]
+    duree_vent = time.perf_counter() - debut
+
+    locales = [(vers_local(centre, cibles[m]), vers_local(centre, largages[m])) for centre, m in zip(centres, membres)]
+    charges = [None] * len(cibles)
+    with ProcessPoolExecutor(max_workers=processus or os.cpu_count()) as pool:
+        taches = [pool.submit(_planifier_charge, i, cible, x_0, vents[g], profils[g].z_t, profils[g].time,
+                              backend, solveur)
+                  for g, m in enumerate(membres) for i, cible, x_0 in zip(m, *locales[g])]
+        for tache in taches:
+            resultat = tache.result()
+            charges[resultat["indice"]] = resultat
+
+    conflits, duree_conjointe, separation_min = [], 0., np.inf
+    for g, m in enumerate(membres):
+        for i in m:
+            charges[i]["groupe"] = g
+        resolues = [i for i in m if charges[i]["x_star"] is not None]
+        if len(resolues) < 2:
+            continue
+        trajectoires = np.array([charges[i]["x_star"] for i in resolues])
+        if separation is not None:
+            for conflit in groupes_de_conflit(trajectoires, separation):
+                indices = [resolues[k] for k in conflit]
+                duree_conjointe += separer(charges, indices, vents[g], profils[g], locales[g], m, separation)
+                conflits.append(indices)
+            trajectoires = np.array([charges[i]["x_star"] for i in resolues])
+        separation_min = min(separation_min, distances_minimales(trajectoires).min())
+
+    for g, (centre, m) in enumerate(zip(centres, membres)):
+        for i in m:
+            if charges[i]["x_star"] is not None:
+                charges[i]["trajectoire"] = vers_geographique(centre, charges[i]["x_star"].T)
+    return {"charges": charges, "groupes": centres, "conflits": conflits, "separation_min": float(separation_min),
+            "duree_vent": duree_vent, "duree_conjointe": duree_conjointe, "duree_totale": time.perf_counter() - debut}
+
+
+def separer(charges, indices, W, profil, locales, membres, separation):
+    """
+    Résout conjointement un groupe de conflit et met à jour les résultats de ses charges.
+
+    :param charges: Résultats de toutes les charges (modifiés sur place).
+    :type charges: list
+    :param indices: Charges du groupe de conflit.
+    :type indices: list
+    :param W: Vent (2, N) du groupe de sites.
+    :type W: np.ndarray
+    :param profil: Profil de vent du groupe de sites.
+    :type profil: ProfilVent
+    :param locales: Cibles et largages (M, 2) en mètres des membres du groupe de sites.
+    :type locales: tuple
+    :param membres: Indices des charges du groupe de sites, dans l'ordre de `locales`.
+    :type membres: list
+    :param separation: Distance minimale en vol (m).
+    :type separation: float
+    :return: Durée de la résolution conjointe (s).
+    :rtype: float
+    """
+    debut = time.perf_counter()
+    N = W.shape[1]
+    reference = SimulerTrajectoire(0., 0., N, x_0=[0., 0.])
+    v = reference.calcul_profil_vitesse(reference.calcul_altitude(profil.time))
+    dt = profil.time[-1] / (N - 1)
+    u_0 = np.array([v[0] * np.cos(reference.psi_0), v[0] * np.sin(reference.psi_0)])
+    position = {i: k for k, i in enumerate(membres)}
+    donnees = [(W, locales[1][position[i]], locales[0][position[i]], v, dt, u_0) for i in indices]
+
+    probleme = ProblemeFlotte(len(indices), N, separation)
+    x, u, iterations = probleme.resoudre(donnees, [charges[i]["x_star"] for i in indices],
+                                         [charges[i]["u_star"] for i in indices], options_solveur("ECOS"))
+    duree = time.perf_counter() - debut
+    for k, i in enumerate(indices):
+        cible = locales[0][position[i]]
+        charges[i].update(x_star=x[k], u_star=u[k], erreur=float(np.linalg.norm(x[k][:, -1] - cible)),
+                          cout_controle=float(cout_controle(u[k], v, dt)), conjointe=iterations,
+                          duree=charges[i]["duree"] + duree / len(indices))
+    return duree
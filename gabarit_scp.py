@@ -0,0 +1,254 @@
+"""
+Ce module définit la classe `GabaritSCP`, le problème convexe de guidage écrit une seule fois
+sous forme paramétrée (DPP) pour un nombre d'étapes N donné.
+
+Responsable de :
+    - déclarer les variables (x, u, eps_h) et les paramètres cvxpy du problème,
+    - construire les deux étapes de la convexification successive (eps_h fixé puis libre),
+    - conserver un cache de gabarits partagé par tout le processus,
+    - en mode robuste, minimiser l'écart final le pire ou moyen sur K scénarios de vent avec une
+      commande commune.
+
+Une fois compilé par cvxpy lors de la première résolution, un gabarit est réutilisé d'une itération
+à l'autre et d'une cible à l'autre : seules les valeurs des paramètres changent, la canonicalisation
+n'est pas refaite. cvxpy n'est importé qu'à la construction du premier gabarit.
+
+Scénarios de vent : le vent n'entre dans la dynamique que par addition, donc la trajectoire du
+scénario s sous la commande commune est celle du vent moyen décalée de cumsum(W_s - W_moyen). Les K
+dynamiques se réduisent à une seule (vent moyen) et à K décalages de la position finale (paramètre
+(2, K)) : la pile des K scénarios est un seul cône par scénario, pas K copies du problème.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import threading
+
+import numpy as np
+
+# Poids du coût (position finale, angle final, epsilon de l'étape 2)
+ALPHA_1, ALPHA_2, ALPHA_3 = 100, 10, 1
+
+# Au-delà de cette taille, la compilation DPP de cvxpy (tenseur paramétrique en O(lignes x variables))
+# coûte plus cher en mémoire que la canonicalisation directe, devenue linéaire en N
+SEUIL_DPP = 300
+
+# Critères d'agrégation des écarts finaux des scénarios de vent
+CRITERES = ("pire", "moyenne")
+
+# Cache des gabarits compilés, partagé par tout le processus (clé : N, scénarios, critère)
+_GABARITS = {}
+_VERROU_CACHE = threading.Lock()
+
+
+def decomposer_scenarios(W, N, scenarios=1):
+    """
+    Sépare un vent, ou K scénarios de vent, en vent moyen et en dérives finales de chaque scénario.
+
+    :param W: Vent (2, N) ou scénarios (K, 2, N) ; seules les N - 1 premières colonnes interviennent.
+    :type W: np.ndarray
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param scenarios: Nombre de scénarios attendu (1 : vent unique, de forme (2, N) ou (1, 2, N)).
+    :type scenarios: int
+    :return: Tuple (vent moyen (2, N - 1), dérives (2, K) de chaque scénario par rapport au vent moyen).
+    :rtype: tuple
+    """
+    W = np.asarray(W, dtype=float)
+    if W.ndim == 2:
+        W = W[None]
+    if len(W) != scenarios:
+        raise ValueError(f"{len(W)} scénarios de vent fournis, {scenarios} attendus")
+    moyen = W[:, :, :N - 1].mean(axis=0)
+    return moyen, (W[:, :, :N - 1] - moyen).sum(axis=2).T
+
+
+class GabaritSCP:
+    """
+    Problème de guidage paramétré pour N étapes temporelles.
+
+    Les données qui changent d'un appel à l'autre (vent, départ, cible, profil de vitesse,
+    linéarisation `u_bar`, poids de eps_h) sont des `cvx.Parameter` : le problème respecte
+    les règles DPP et n'est canonicalisé qu'une fois. Pour N > `SEUIL_DPP`, les paramètres
+    sont traités comme des constantes à chaque résolution (`ignore_dpp`).
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param scenarios: Nombre de scénarios de vent partageant la commande (1 : vent unique).
+    :type scenarios: int
+    :param critere: Agrégation des écarts finaux des scénarios : "pire" (maximum) ou "moyenne".
+    :type critere: str
+
+    :ivar x: Variable de position (2, N), sous le vent moyen des scénarios.
+    :ivar u: Variable de commande (vitesse horizontale) (2, N).
+    :ivar eps_h: Variable de relâchement de la contrainte de vitesse.
+    :ivar etape_1: Problème de la première étape (eps_h fixé).
+    :ivar etape_2: Problème de la seconde étape (eps_h pénalisé dans le coût).
+    :ivar dpp: Vrai si la compilation paramétrée de cvxpy est conservée entre les résolutions.
+    :ivar verrou: Verrou à tenir pendant toute une boucle SCP, le gabarit étant partagé.
+    :ivar derives: Dérives finales (2, K) des scénarios chargés par rapport au vent moyen.
+    """
+
+    def __init__(self, N, scenarios=1, critere="pire"):
+        import cvxpy as cvx
+
+        if critere not in CRITERES:
+            raise ValueError(f"Critère inconnu : {critere} (choix : {', '.join(CRITERES)})")
+        self.N = N
+        self.scenarios = scenarios
+        self.critere = critere
+        self.derives = np.zeros((2, scenarios))
+        self.dpp = N <= SEUIL_DPP
+        self.verrou = threading.Lock()
+
+        self.x = cvx.Variable((2, N))
+        self.u = cvx.Variable((2, N))
+        self.eps_h = cvx.Variable(nonneg=True)
+
+        self.W = cvx.Parameter((2, N - 1))
+        self.x_0 = cvx.Parameter((2, 1))
+        self.u_0 = cvx.Parameter((2, 1))
+        self.cible = cvx.Parameter((2, 1))
+        self.v = cvx.Parameter(N, nonneg=True)
+        self.u_bar = cvx.Parameter((2, N))
+        self.demi_dt = cvx.Parameter(nonneg=True)
+        # phid_max * dt * v[k] : la borne de virage est multipliée plutôt que divisée (DPP)
+        self.borne_virage = cvx.Parameter(N - 1, nonneg=True)
+        # 1 / (v[k] * sqrt(dt)) : pondération de l'effort de contrôle
+        self.poids_controle = cvx.Parameter(N - 1, nonneg=True)
+        self.inv_v_final = cvx.Parameter(nonneg=True)
+        self.decalages = cvx.Parameter((2, scenarios))
+        self.eps_h_fixe = cvx.Parameter(nonneg=True)
+        self.poids_eps = cvx.Parameter(nonneg=True)
+
+        x, u, eps_h = self.x, self.u, self.eps_h
+        A = np.eye(2)
+
+        # Une seule contrainte par famille : le graphe d'expressions reste linéaire en N
+        vitesse_virage = cvx.norm(cvx.diff(u, axis=1), axis=0)
+        const = [
+            x[:, [0]] == self.x_0,
+            u[:, [0]] == self.u_0,
+            x[:, 1:] == A @ x[:, :-1] + self.demi_dt * (u[:, :-1] + u[:, 1:]) + self.W,
+            vitesse_virage <= self.borne_virage,
+            cvx.sum(cvx.multiply(self.u_bar, u), axis=0) - self.v >= -eps_h,
+            cvx.norm(u, axis=0) - self.v <= eps_h,
+        ]
+
+        if scenarios == 1:
+            self.final_position = cvx.norm(x[:, [-1]] - self.cible)
+        else:
+            ecarts = cvx.norm(x[:, [-1]] - self.cible + self.decalages, axis=0)
+            self.final_position = cvx.max(ecarts) if critere == "pire" else cvx.sum(ecarts) / scenarios
+        self.final_angle = 2 - u[1, -1] * self.inv_v_final
+        self.control_cost = cvx.sum_squares(cvx.multiply(self.poids_controle, vitesse_virage))
+        cost = ALPHA_1 * self.final_position + ALPHA_2 * self.final_angle + self.control_cost
+
+        self.etape_1 = cvx.Problem(cvx.Minimize(cost), const + [eps_h == self.eps_h_fixe])
+        self.etape_2 = cvx.Problem(cvx.Minimize(cost + self.poids_eps * eps_h), const)
+
+    def charger(self, W, x_0, cible, v, dt, u_0, u_bar, phid_max=0.14, eps_h=0.1, poids_eps=ALPHA_3):
+        """
+        Met à jour les valeurs des paramètres pour un nouveau cas de guidage.
+
+        :param W: Champ de vent (2, N), ou scénarios (K, 2, N) si le gabarit en a K (voir
+            `decomposer_scenarios`) ; seules les N - 1 premières colonnes interviennent.
+        :type W: np.ndarray
+        :param x_0: Position de départ (2, 1).
+        :type x_0: np.ndarray
+        :param cible: Position de la cible (2, 1).
+        :type cible: np.ndarray
+        :param v: Profil de vitesse (N,).
+        :type v: np.ndarray
+        :param dt: Pas de temps.
+        :type dt: float
+        :param u_0: Commande initiale imposée (2, 1).
+        :type u_0: np.ndarray
+        :param u_bar: Direction de linéarisation initiale (2, N), normalisée par colonne.
+        :type u_bar: np.ndarray
+        :param phid_max: Vitesse de virage maximale (rad/s).
+        :type phid_max: float
+        :param eps_h: Valeur de eps_h imposée pendant l'étape 1.
+        :type eps_h: float
+        :param poids_eps: Poids de eps_h dans le coût de l'étape 2.
+        :type poids_eps: float
+        """
+        self.W.value, self.derives = decomposer_scenarios(W, self.N, self.scenarios)
+        self.decalages.value = self.derives
+        self.x_0.value = np.asarray(x_0, dtype=float).reshape(2, 1)
+        self.u_0.value = np.asarray(u_0, dtype=float).reshape(2, 1)
+        self.cible.value = np.asarray(cible, dtype=float).reshape(2, 1)
+        self.v.value = v
+        self.u_bar.value = u_bar
+        self.demi_dt.value = 0.5 * dt
+        self.borne_virage.value = phid_max * dt * v[:-1]
+        self.poids_controle.value = 1 / (v[:-1] * np.sqrt(dt))
+        self.inv_v_final.value = 1 / abs(v[-1])
+        self.eps_h_fixe.value = eps_h
+        self.poids_eps.value = poids_eps
+
+    def fixer_u_bar(self, u_bar):
+        """
+        Met à jour la direction de linéarisation entre deux itérations SCP.
+
+        :param u_bar: Directions de linéarisation (2, N).
+        :type u_bar: np.ndarray
+        """
+        self.u_bar.value = u_bar
+
+    def fixer_eps_h(self, eps_h):
+        """
+        Change la marge de vitesse imposée à l'étape 1 (rayon de la région de confiance, voir `pilote_scp`).
+
+        :param eps_h: Marge de vitesse (m/s).
+        :type eps_h: float
+        """
+        self.eps_h_fixe.value = eps_h
+
+    def amorcer(self, x, u):
+        """
+        Donne un point de départ aux variables, utilisé par les solveurs qui acceptent un warm start
+        (voir `solveurs.SOLVEURS_WARM_START`).
+
+        :param x: Trajectoire (2, N).
+        :type x: np.ndarray
+        :param u: Commande (2, N).
+        :type u: np.ndarray
+        """
+        self.x.value = np.asarray(x, dtype=float)
+        self.u.value = np.asarray(u, dtype=float)
+
+    def resoudre(self, etape, **options):
+        """
+        Résout l'une des deux étapes avec les valeurs courantes des paramètres.
+
+        :param etape: 1 (eps_h fixé) ou 2 (eps_h pénalisé).
+        :type etape: int
+        :param options: Options transmises à `cvx.Problem.solve`.
+        :return: Tuple (valeur optimale, x, u) ; x et u valent None en cas d'échec.
+        :rtype: tuple
+        """
+        probleme = self.etape_1 if etape == 1 else self.etape_2
+        valeur = probleme.solve(ignore_dpp=not self.dpp, **options)
+        return valeur, self.x.value, self.u.value
+
+
+def obtenir_gabarit(N, scenarios=1, critere="pire"):
+    """
+    Renvoie le gabarit associé à (N, scenarios, critere), en le construisant au premier appel.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param scenarios: Nombre de scénarios de vent.
+    :type scenarios: int
+    :param critere: Agrégation des écarts finaux ("pire" ou "moyenne").
+    :type critere: str
+    :return: Gabarit partagé du processus.
+    :rtype: GabaritSCP
+    """
+    cle = (N, scenarios, critere if scenarios > 1 else "pire")
+    with _VERROU_CACHE:
+        gabarit = _GABARITS.get(cle)
+        if gabarit is None:
+            gabarit = _GABARITS[cle] = GabaritSCP(*cle)
+        return gabarit
@@ -0,0 +1,149 @@
+"""
+Ce module définit la classe `GuidageMPC`, un guidage en boucle fermée à horizon glissant.
+
+Responsable de :
+    - partir du plan en boucle ouverte de `SimulerTrajectoire` puis, pendant la descente, re-résoudre
+      l'horizon restant à chaque pas (ou tous les `periode` pas) depuis la position mesurée,
+    - mettre à jour l'estimation du vent à partir de l'écart observé entre le vent réel et la prévision,
+    - démarrer chaque re-résolution du plan précédent décalé d'un pas (linéarisation `u_bar`) et la
+      conduire avec `PiloteSCP`, comme les autres résolutions (mêmes critères d'arrêt),
+    - respecter un budget de latence par pas : au-delà, le dernier plan est conservé,
+    - enregistrer la latence de chaque re-résolution pour en tracer l'histogramme.
+
+L'horizon se raccourcit à chaque pas : la re-résolution au pas j porte sur N - j étapes. Les problèmes
+de toutes ces tailles sont construits avant le largage (`prechauffer`), hors budget, et restent dans
+le cache du backend.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import time
+
+import numpy as np
+
+from pilote_scp import PiloteSCP
+from propagation import atterrissages
+from simultion_final import _BACKENDS
+
+
+def _normaliser(u):
+    """Normalise les colonnes de u (directions de linéarisation)."""
+    return u / np.maximum(np.linalg.norm(u, axis=0), 1e-12)
+
+
+def histogramme_latence(latences, largeur=5.):
+    """
+    Calcule l'histogramme des latences de re-résolution.
+
+    :param latences: Latences en secondes.
+    :type latences: array_like
+    :param largeur: Largeur des classes en millisecondes.
+    :type largeur: float
+    :return: Tuple (effectifs, bornes des classes en millisecondes).
+    :rtype: tuple
+    """
+    ms = 1000 * np.asarray(latences, dtype=float)
+    haut = largeur * (np.floor(ms.max() / largeur) + 1) if ms.size else largeur
+    return np.histogram(ms, bins=np.arange(0., haut + largeur / 2, largeur))
+
+
+class GuidageMPC:
+    """
+    Simulation de guidage en boucle fermée (commande prédictive à horizon décroissant).
+
+    :param simulateur: Simulateur du largage ; son plan en boucle ouverte est calculé s'il n'existe pas.
+    :type simulateur: SimulerTrajectoire
+    :param periode: Nombre de pas entre deux re-résolutions.
+    :type periode: int
+    :param budget: Latence maximale d'une re-résolution, en secondes ; un plan arrivé plus tard est ignoré.
+    :type budget: float
+    :param max_iter: Nombre maximal de résolutions SCP par re-résolution.
+    :type max_iter: int
+    """
+
+    def __init__(self, simulateur, periode=1, budget=0.1, max_iter=10):
+        self.simulateur = simulateur
+        self.periode = periode
+        self.budget = budget
+        self.max_iter = max_iter
+        if not hasattr(simulateur, "u_star"):
+            simulateur.optimiser_trajectoire()
+        self.N = simulateur.N
+        self.cible = np.array([simulateur.lat, simulateur.lon])
+        _, self.options = simulateur.options_resolution()
+
+    def prechauffer(self):
+        """Construit (et compile, pour cvxpy) les problèmes de toutes les tailles d'horizon avant le largage."""
+        s = self.simulateur
+        for j in range(self.N - 1):
+            modele = _BACKENDS[s.backend](self.N - j)
+            with modele.verrou:
+                modele.charger(s.W[:, j:], s.x_star[:, j], self.cible, s.v[j:], s.dt, s.u_star[:, j],
+                               _normaliser(s.u_star[:, j:]))
+                modele.resoudre(1, **self.options)
+
+    def replanifier(self, j, x_j, plan, W_estime):
+        """
+        Re-résout l'horizon restant depuis le pas j, dans la limite du budget de latence.
+
+        La convexification successive est conduite par `PiloteSCP`, amorcée par le plan courant (rayon de
+        confiance minimal d'emblée) : elle s'arrête à la convergence, après `max_iter` résolutions, ou dès
+        que la résolution suivante risquerait de dépasser le budget.
+
+        :param j: Indice du pas courant.
+        :type j: int
+        :param x_j: Position estimée au pas j.
+        :type x_j: np.ndarray
+        :param plan: Commande courante (2, N), indexée en temps absolu.
+        :type plan: np.ndarray
+        :param W_estime: Estimation du vent (2, N).
+        :type W_estime: np.ndarray
+        :return: Tuple (nouvelle commande (2, N - j) ou None si le budget est dépassé ou sans solution, latence).
+        :rtype: tuple
+        """
+        s = self.simulateur
+        debut = time.perf_counter()
+        modele = _BACKENDS[s.backend](self.N - j)
+        with modele.verrou:
+            modele.charger(W_estime[:, j:], x_j, self.cible, s.v[j:], s.dt, plan[:, j], _normaliser(plan[:, j:]))
+            pilote = PiloteSCP(modele, self.options, rayon_initial=0., max_iter=self.max_iter, budget=self.budget)
+            commande = pilote.executer(self.cible, s.v[j:], s.dt)["u"]
+        latence = time.perf_counter() - debut
+        return (commande if latence <= self.budget else None), latence
+
+    def executer(self, W_reel=None):
+        """
+        Simule la descente en boucle fermée.
+
+        À chaque pas, la commande du plan courant est appliquée sous le vent réel, puis (tous les
+        `periode` pas) l'horizon restant est re-résolu depuis la nouvelle position, avec une prévision
+        corrigée du biais moyen observé jusque-là.
+
+        :param W_reel: Vent réellement rencontré (2, N) ; par défaut, la prévision.
+        :type W_reel: np.ndarray
+        :return: Dictionnaire (trajectoire (2, N), commande (2, N), erreur, latences, replis, replanifications).
+        :rtype: dict
+        """
+        s = self.simulateur
+        W_prevu = s.W
+        W_reel = W_prevu if W_reel is None else np.asarray(W_reel, dtype=float)
+        plan = s.u_star.copy()
+        X = np.empty((2, self.N))
+        X[:, 0] = s.x_0.ravel()
+        latences, replis = [], 0
+
+        for j in range(self.N - 1):
+            X[:, j + 1] = atterrissages(X[:, j], plan[:, j:j + 2], W_reel[:, j:j + 2], s.dt)
+            if j + 1 < self.N - 1 and (j + 1) % self.periode == 0:
+                biais = (W_reel[:, :j + 1] - W_prevu[:, :j + 1]).mean(axis=1, keepdims=True)
+                commande, latence = self.replanifier(j + 1, X[:, j + 1], plan, W_prevu + biais)
+                latences.append(latence)
+                if commande is None:
+                    replis += 1
+                else:
+                    plan[:, j + 1:] = commande
+
+        self.trajectoire, self.commande, self.latences = X, plan, np.array(latences)
+        return {"trajectoire": X, "commande": plan, "erreur": float(np.linalg.norm(X[:, -1] - self.cible)),
+                "latences": self.latences, "replis": replis, "replanifications": len(latences)}
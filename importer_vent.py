@@ -2,7 +2,7 @@
 Ce module définit la classe `ImportVent`.
 
 Responsable de :
-    - récupérer les données de vent en temps réel via l’API Open-Meteo,
+    - récupérer les données de vent en temps réel via l’API Open-Meteo (à travers le cache `CacheVent`),
     - interpoler les composantes du vent en fonction de l'altitude et du temps,
     - renvoyer le champ de vent utilisé dans l’optimisation de trajectoire.
 
@@ -11,7 +11,61 @@ Responsable de :
 """
 
 import numpy as np
-import requests
+
+from cache_vent import cache_par_defaut
+
+ALTITUDES_API = [10, 80, 120, 180]
+DELAI_REQUETE = 10
+URL_OPEN_METEO = "https://api.open-meteo.com/v1/forecast"
+
+
+def url_open_meteo(lat, lon, base=URL_OPEN_METEO):
+    """
+    Construit l'URL de prévision horaire du vent aux quatre altitudes de l'API Open-Meteo.
+
+    :param lat: Latitude (ou liste de latitudes séparées par des virgules).
+    :type lat: float or str
+    :param lon: Longitude (ou liste de longitudes séparées par des virgules).
+    :type lon: float or str
+    :param base: Adresse du service (l'API publique, ou un serveur local de test).
+    :type base: str
+    :return: URL de la requête.
+    :rtype: str
+    """
+    return (
+        f"{base}?"
+        f"latitude={lat}&longitude={lon}"
+        f"&hourly=wind_speed_10m,wind_direction_10m,"
+        f"wind_speed_80m,wind_direction_80m,"
+        f"wind_speed_120m,wind_direction_120m,"
+        f"wind_speed_180m,wind_direction_180m"
+        f"&timezone=auto"
+    )
+
+
+def telecharger_meteo(lat, lon, cache=None, url_base=URL_OPEN_METEO):
+    """
+    Renvoie la prévision Open-Meteo d'un site, depuis le cache disque si elle y est encore valide.
+
+    :param lat: Latitude.
+    :type lat: float
+    :param lon: Longitude.
+    :type lon: float
+    :param cache: Cache à utiliser (par défaut : `cache_par_defaut()`).
+    :type cache: CacheVent
+    :param url_base: Adresse du service (l'API publique, ou un serveur local de test).
+    :type url_base: str
+    :return: Réponse brute de l'API.
+    :rtype: dict
+    """
+    def telecharger():
+        import requests
+
+        response = requests.get(url_open_meteo(lat, lon, url_base), timeout=DELAI_REQUETE)
+        response.raise_for_status()
+        return response.json()
+
+    return (cache or cache_par_defaut()).obtenir(lat, lon, telecharger)
 
 class ImportVent:
     """
@@ -21,23 +75,27 @@ class ImportVent:
     :type lat: float
     :param lon: Longitude de la zone cible.
     :type lon: float
-    :param hour_index: Index temporel dans les données de vent (ex: 0 = heure actuelle).
-    :type hour_index: int
+    :param hour_index: Index temporel dans les données de vent (ex: 0 = heure actuelle),
+        éventuellement fractionnaire pour un largage entre deux heures de prévision.
+    :type hour_index: float
     :param N: Nombre d'étapes de discrétisation temporelle.
     :type N: int
     :param z0: Altitude initiale (ex: altitude d'ouverture du parachute).
     :type z0: float
+    :param cache: Cache des réponses météo (par défaut : `cache_par_defaut()`).
+    :type cache: CacheVent
 
     :ivar vx_interp: Composante horizontale du vent interpolée.
     :ivar vy_interp: Composante verticale du vent interpolée.
     """
 
-    def __init__(self, lat, lon, hour_index=0, N=31, z0=1200):
+    def __init__(self, lat, lon, hour_index=0, N=31, z0=1200, cache=None):
         self.lat = lat
         self.lon = lon
         self.hour_index = hour_index
         self.N = N
         self.z0 = z0
+        self.cache = cache
 
         # Constantes atmosphériques
         self.cz = 2.256E-5
@@ -74,6 +132,17 @@ class ImportVent:
             - data: Données brutes de l'API météo.
         :rtype: tuple
         """
+        data = telecharger_meteo(self.lat, self.lon, self.cache)
+        W, z_t, time = self.interpoler(data)
+        return W, z_t, time, data
+
+    def profil_descente(self):
+        """
+        Calcule le vecteur temps et le profil d'altitude de la descente.
+
+        :return: Tuple (time, z_t).
+        :rtype: tuple
+        """
         tf = self.t0 + np.sqrt(self.ch) / self.rz0 / np.sqrt(self.rho0) * (
             ((1 - self.z0 * self.cz) ** self.cf) / self.cf / self.cz - ((1 - 0 * self.cz) ** self.cf) / self.cf / self.cz)
         time = np.linspace(0, tf, self.N)
@@ -82,38 +151,136 @@ class ImportVent:
             1 - ((((1 - self.z0 * self.cz) ** self.cf) / self.cf / self.cz -
                  (time - self.t0) * self.rz0 * np.sqrt(self.rho0) / np.sqrt(self.ch)) *
                  self.cf * self.cz) ** (1 / self.cf))
+        return time, z_t
 
-        altitudes_api = [10, 80, 120, 180]
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={self.lat}&longitude={self.lon}"
-            f"&hourly=wind_speed_10m,wind_direction_10m,"
-            f"wind_speed_80m,wind_direction_80m,"
-            f"wind_speed_120m,wind_direction_120m,"
-            f"wind_speed_180m,wind_direction_180m"
-            f"&timezone=auto"
-        )
-
-        response = requests.get(url)
-        data = response.json()
-
-        vx_profiles = []
-        vy_profiles = []
-        for a in altitudes_api:
-            speed = data['hourly'][f'wind_speed_{a}m'][self.hour_index]
-            direction = data['hourly'][f'wind_direction_{a}m'][self.hour_index]
-            vx, vy = self.convert_to_vx_vy(speed, direction)
-            vx_profiles.append(vx)
-            vy_profiles.append(vy)
-
-        vx_interp = np.interp(z_t, altitudes_api, vx_profiles)
-        vy_interp = np.interp(z_t, altitudes_api, vy_profiles)
-
-        W = np.array([vx_interp, vy_interp])
-        return W, z_t, time, data
+    def profil_vent(self, data=None):
+        """
+        Construit en une passe NumPy le champ de vent de toutes les heures de prévision.
+
+        :param data: Réponse brute de l'API météo (récupérée si None).
+        :type data: dict
+        :return: Profil de vent (heures, 2, N) le long de la descente.
+        :rtype: ProfilVent
+        :raises ValueError: Si une valeur de vent manque (None dans la réponse), avec l'heure et l'altitude.
+        """
+        if data is None:
+            data = telecharger_meteo(self.lat, self.lon, self.cache)
+        time, z_t = self.profil_descente()
+        hourly = data['hourly']
+        vitesses = _en_tableau([hourly[f'wind_speed_{a}m'] for a in ALTITUDES_API])
+        directions = _en_tableau([hourly[f'wind_direction_{a}m'] for a in ALTITUDES_API])
+        vx, vy = self.convert_to_vx_vy(vitesses, directions)
+        # Une valeur manquante rendrait NaN toute l'heure (produit par des poids nuls compris)
+        manquants = ~(np.isfinite(vx) & np.isfinite(vy))
+        if manquants.any():
+            niveau, heure = np.argwhere(manquants)[0]
+            horodatages = hourly.get('time') or range(vx.shape[1])
+            raise ValueError(f"Vent manquant dans la prévision : heure {horodatages[heure]}, "
+                             f"altitude {ALTITUDES_API[niveau]} m")
 
+        # (composante, altitude API, heure) x (altitude API, étape) -> (heure, composante, étape)
+        interpolation = _matrice_interpolation(z_t, ALTITUDES_API)
+        tenseur = np.einsum('cah,an->hcn', np.stack([vx, vy]), interpolation)
+        return ProfilVent(tenseur, z_t, time, hourly.get('time'))
 
-def import_vent(lat, lon, hour_index=0, N=31, z0=1200):
+    def interpoler(self, data):
+        """
+        Interpole le vent d'une réponse Open-Meteo déjà récupérée le long du profil de descente.
+
+        :param data: Réponse brute de l'API météo.
+        :type data: dict
+        :return: Tuple (W, z_t, time) pour `hour_index` (éventuellement fractionnaire).
+        :rtype: tuple
+        """
+        profil = self.profil_vent(data)
+        return profil.W(self.hour_index), profil.z_t, profil.time
+
+
+class ProfilVent:
+    """
+    Champ de vent de toutes les heures de prévision, interpolé le long du profil de descente.
+
+    Changer d'heure de largage revient à prendre une tranche du tenseur ; entre deux heures,
+    les composantes du vent sont interpolées linéairement dans le temps.
+
+    :param tenseur: Composantes (vx, vy) du vent, de forme (heures, 2, N).
+    :type tenseur: np.ndarray
+    :param z_t: Profil d'altitude de la descente.
+    :type z_t: np.ndarray
+    :param time: Vecteur temps de la descente.
+    :type time: np.ndarray
+    :param heures: Horodatages des heures de prévision (format ISO de l'API).
+    :type heures: list
+    """
+
+    def __init__(self, tenseur, z_t, time, heures=None):
+        self.tenseur = tenseur
+        self.z_t = z_t
+        self.time = time
+        self.heures = heures
+
+    def __len__(self):
+        return self.tenseur.shape[0]
+
+    def W(self, heure):
+        """
+        Renvoie le champ de vent (2, N) pour un index horaire entier ou fractionnaire.
+
+        :param heure: Index horaire (ex : 2.5 = entre la 3e et la 4e heure de prévision), dans [0, len(self) - 1].
+        :type heure: float
+        :return: Champ de vent (vx, vy).
+        :rtype: np.ndarray
+        """
+        if float(heure).is_integer():
+            if not 0 <= heure < len(self):
+                raise IndexError(f"Index horaire hors de la prévision (0 à {len(self) - 1})")
+            return self.tenseur[int(heure)]
+        return self.balayage([heure])[0]
+
+    def balayage(self, heures):
+        """
+        Renvoie le champ de vent de plusieurs instants de largage en une seule opération.
+
+        :param heures: Index horaires, entiers ou fractionnaires, dans [0, len(self) - 1].
+        :type heures: array_like
+        :return: Champs de vent de forme (len(heures), 2, N).
+        :rtype: np.ndarray
+        """
+        heures = np.asarray(heures, dtype=float)
+        if heures.size and (heures.min() < 0 or heures.max() > len(self) - 1):
+            raise IndexError(f"Index horaire hors de la prévision (0 à {len(self) - 1})")
+        avant = np.minimum(np.floor(heures).astype(int), len(self) - 2)
+        poids = (heures - avant)[:, None, None]
+        return (1 - poids) * self.tenseur[avant] + poids * self.tenseur[avant + 1]
+
+
+def _en_tableau(valeurs):
+    """Convertit des listes de l'API en tableau de flottants (valeurs manquantes en NaN)."""
+    return np.array([[np.nan if v is None else v for v in ligne] for ligne in valeurs], dtype=float)
+
+
+def _matrice_interpolation(z, altitudes):
+    """
+    Matrice (len(altitudes), len(z)) de l'interpolation linéaire de `np.interp` (valeurs bornées aux extrémités).
+
+    :param z: Altitudes où interpoler.
+    :type z: np.ndarray
+    :param altitudes: Altitudes des mesures, croissantes.
+    :type altitudes: list
+    :return: Matrice M telle que valeurs @ M == np.interp(z, altitudes, valeurs).
+    :rtype: np.ndarray
+    """
+    altitudes = np.asarray(altitudes, dtype=float)
+    j = np.clip(np.searchsorted(altitudes, z, side='right') - 1, 0, len(altitudes) - 2)
+    poids = np.clip((z - altitudes[j]) / (altitudes[j + 1] - altitudes[j]), 0, 1)
+    matrice = np.zeros((len(altitudes), len(z)))
+    colonnes = np.arange(len(z))
+    matrice[j, colonnes] = 1 - poids
+    matrice[j + 1, colonnes] += poids
+    return matrice
+
+
+def import_vent(lat, lon, hour_index=0, N=31, z0=1200, cache=None):
     """
     Fonction d'interface simplifiée pour instancier la classe `ImportVent`
     et récupérer les données de vent.
@@ -128,7 +295,29 @@ def import_vent(lat, lon, hour_index=0, N=31, z0=1200):
     :type N: int
     :param z0: Altitude d'ouverture du parachute.
     :type z0: float
+    :param cache: Cache des réponses météo (par défaut : `cache_par_defaut()`).
+    :type cache: CacheVent
     :return: Tuple contenant (W, z_t, time, data).
     :rtype: tuple
     """
-    return ImportVent(lat, lon, hour_index, N, z0).import_vent()
+    return ImportVent(lat, lon, hour_index, N, z0, cache).import_vent()
+
+
+def profil_vent(lat, lon, N=31, z0=1200, cache=None):
+    """
+    Fonction d'interface simplifiée : champ de vent de toutes les heures de prévision d'un site.
+
+    :param lat: Latitude de la zone cible.
+    :type lat: float
+    :param lon: Longitude de la zone cible.
+    :type lon: float
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param z0: Altitude d'ouverture du parachute.
+    :type z0: float
+    :param cache: Cache des réponses météo (par défaut : `cache_par_defaut()`).
+    :type cache: CacheVent
+    :return: Profil de vent de forme (heures, 2, N).
+    :rtype: ProfilVent
+    """
+    return ImportVent(lat, lon, N=N, z0=z0, cache=cache).profil_vent()
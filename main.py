@@ -1,7 +1,8 @@
 """
 main.py - Point d'entrée principal du simulateur de parachute guidé.
 
-Ce fichier exécute l'interface principale basée sur Streamlit.
+Ce fichier exécute l'interface principale basée sur Streamlit. L'importer ne charge rien :
+l'interface (et Streamlit) n'est importée qu'au lancement, voir `benchmarks/import_main.py`.
 L'utilisateur peut :
     - sélectionner une position géographique,
     - visualiser les champs de vent,
@@ -11,8 +12,6 @@ L'utilisateur peut :
 :date: 26/06/2026
 """
 
-from streamlit_en_POO import InterfaceStreamlit
-
 def main():
     """
     Lance l'interface utilisateur de simulation via Streamlit.
@@ -21,6 +20,8 @@ def main():
         - instancie l'objet `InterfaceStreamlit`,
         - appelle la méthode `afficher_interface()` pour démarrer l'affichage interactif.
     """
+    from streamlit_en_POO import InterfaceStreamlit
+
     app = InterfaceStreamlit()
     app.afficher_interface()
 
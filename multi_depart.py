@@ -0,0 +1,142 @@
+"""
+Ce module lance la convexification successive depuis plusieurs linéarisations initiales en parallèle.
+
+Responsable de :
+    - répartir sur un pool de processus des départs qui ne diffèrent que par le cap visé par la première
+      linéarisation `u_bar` (le cap initial imposé `psi_0` ne change pas : le problème reste le même) ;
+      la linéarisation part de `psi_0` et tourne vers ce cap à `VITESSE_VIRAGE_DEPART`, sous la
+      vitesse de virage maximale, pour rester admissible dès la première itération,
+    - partager entre les processus le meilleur coût final obtenu jusque-là,
+    - abandonner un départ dès que, à sa vitesse de décroissance actuelle, il ne peut plus passer
+      sous ce coût avant `MAX_ITER` itérations,
+    - renvoyer la meilleure trajectoire et le diagnostic de chaque départ.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from importer_vent import ProfilVent
+from pilote_scp import MAX_ITER
+from simultion_final import SimulerTrajectoire
+
+# Vitesse de virage (rad/s) de la linéarisation initiale, sous la borne `phid_max` = 0.14 du problème
+VITESSE_VIRAGE_DEPART = 0.1
+
+# Meilleur coût final connu, partagé par les processus du pool (fixé par `_initialiser`)
+_MEILLEUR = None
+
+
+def _initialiser(meilleur):
+    """Reçoit la valeur partagée du meilleur coût."""
+    global _MEILLEUR
+    _MEILLEUR = meilleur
+
+
+def _depart(parametres, psi, W, z_t, time_vec, marge):
+    """
+    Exécute un départ dans un processus du pool.
+
+    :param parametres: Arguments de `SimulerTrajectoire` (lat, lon, N, backend, solveur, x_0, psi_0).
+    :type parametres: dict
+    :param psi: Cap visé par la linéarisation initiale (rad).
+    :type psi: float
+    :param W: Vent (2, N).
+    :type W: np.ndarray
+    :param z_t: Profil d'altitude.
+    :type z_t: np.ndarray
+    :param time_vec: Vecteur temps.
+    :type time_vec: np.ndarray
+    :param marge: Écart relatif au meilleur coût en deçà duquel un départ n'est jamais abandonné.
+    :type marge: float
+    :return: Diagnostic du départ, avec sa trajectoire s'il a abouti.
+    :rtype: dict
+    """
+    parametres = dict(parametres)
+    psi_0 = parametres.pop("psi_0")
+    simulateur = SimulerTrajectoire(**parametres, profil_vent=ProfilVent(W[None], z_t, time_vec))
+    simulateur.psi_0 = psi_0
+    precedent = None
+
+    def arret(i, etape, cout):
+        nonlocal precedent
+        if etape == 1:
+            return False
+        meilleur = _MEILLEUR.value
+        retard = cout - meilleur
+        sans_espoir = retard > marge * abs(meilleur) and (
+            precedent is not None and (precedent - cout) * (MAX_ITER - 1 - i) < retard)
+        precedent = cout
+        return sans_espoir
+
+    ecart = np.angle(np.exp(1j * (psi - psi_0)))
+    caps = psi_0 + np.sign(ecart) * np.minimum(abs(ecart), VITESSE_VIRAGE_DEPART * (time_vec - time_vec[0]))
+    u_bar = np.vstack([np.cos(caps), np.sin(caps)])
+    debut = time.perf_counter()
+    diagnostic = {"psi": psi, "abandonne": False, "cout": np.inf, "erreur": np.inf, "n_iter": None}
+    try:
+        _, erreur, _, _, _ = simulateur.optimiser_trajectoire(u_bar, arret=arret)
+    except (ValueError, ArithmeticError) as e:
+        diagnostic["message"] = str(e)
+    else:
+        diagnostic.update(abandonne=simulateur.interrompu, n_iter=simulateur.n_iter, erreur=float(erreur))
+        if not simulateur.interrompu:
+            diagnostic.update(cout=float(simulateur.cout), x_star=simulateur.x_star, u_star=simulateur.u_star)
+            with _MEILLEUR.get_lock():
+                _MEILLEUR.value = min(_MEILLEUR.value, diagnostic["cout"])
+    diagnostic["duree"] = time.perf_counter() - debut
+    return diagnostic
+
+
+def optimiser_multi_depart(simulateur, n_departs=8, caps=None, processus=None, marge=1e-3):
+    """
+    Optimise la trajectoire d'un simulateur depuis plusieurs caps de linéarisation et garde la meilleure.
+
+    Le simulateur reçoit la meilleure solution (`x_star`, `u_star`, `cout`, `n_iter`) comme après
+    `optimiser_trajectoire`, et le diagnostic de chaque départ dans `departs`.
+
+    :param simulateur: Simulateur à optimiser.
+    :type simulateur: SimulerTrajectoire
+    :param n_departs: Nombre de caps répartis uniformément sur le cercle (si `caps` n'est pas fourni).
+    :type n_departs: int
+    :param caps: Caps visés par les linéarisations initiales (rad).
+    :type caps: list
+    :param processus: Nombre de processus (par défaut : min(nombre de départs, nombre de cœurs)).
+    :type processus: int
+    :param marge: Écart relatif au meilleur coût en deçà duquel un départ n'est jamais abandonné.
+    :type marge: float
+    :return: Même résultat que `optimiser_trajectoire`.
+    :rtype: tuple
+    """
+    if caps is None:
+        caps = simulateur.psi_0 + 2 * np.pi * np.arange(n_departs) / n_departs
+    W, z_t, time_vec = simulateur.champ_vent()
+    parametres = {"lat": simulateur.lat, "lon": simulateur.lon, "N": simulateur.N, "backend": simulateur.backend,
+                  "solveur": simulateur.solveur, "x_0": simulateur.x_0, "psi_0": simulateur.psi_0}
+
+    meilleur = multiprocessing.Value("d", np.inf)
+    departs = []
+    with ProcessPoolExecutor(max_workers=processus or min(len(caps), os.cpu_count()),
+                             initializer=_initialiser, initargs=(meilleur,)) as pool:
+        taches = [pool.submit(_depart, parametres, float(psi), W, z_t, time_vec, marge) for psi in caps]
+        for tache in as_completed(taches):
+            departs.append(tache.result())
+
+    departs.sort(key=lambda d: d["psi"])
+    aboutis = [d for d in departs if "x_star" in d]
+    if not aboutis:
+        raise ValueError("Aucun départ n'a abouti")
+    gagnant = min(aboutis, key=lambda d: d["cout"])
+
+    x_star, u_star = gagnant.pop("x_star"), gagnant.pop("u_star")
+    for d in aboutis:
+        d.pop("x_star", None)
+        d.pop("u_star", None)
+    simulateur.departs = departs
+    return simulateur.adopter(x_star, u_star, W, z_t, time_vec, n_iter=gagnant["n_iter"], cout=gagnant["cout"])
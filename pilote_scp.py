@@ -0,0 +1,324 @@
+"""
+Ce module définit la classe `PiloteSCP`, qui conduit la convexification successive avec une région de confiance.
+
+Responsable de :
+    - enchaîner les résolutions d'un modèle (`GabaritSCP` ou `SOCPDirect`) en mettant à jour la
+      linéarisation `u_bar`,
+    - adapter le rayon de la région de confiance, accepter ou rejeter chaque pas,
+    - arrêter la boucle sur des critères absolus et relatifs (coût, variation de `u`), après
+      `max_iter` résolutions, ou quand la résolution suivante dépasserait le budget de temps (estimée à
+      la durée moyenne des précédentes) : la boucle se termine toujours,
+    - ne conserver que le meilleur et le dernier itéré,
+    - produire chaque itéré au fil de la boucle (`iterer`, un générateur) : x, u, termes du coût, étape,
+      rayon et durées, pour suivre la convergence ou s'arrêter dès qu'il suffit.
+
+Le rayon est la marge de vitesse `eps_h` de l'étape 1 : la contrainte linéarisée u_bar . u >= v - eps_h
+limite la rotation de u autour de u_bar à environ sqrt(4 eps_h / v), et c'est elle qui limite la
+progression quand eps_h vaut 0.1. Pour N <= `N_RAYON_LARGE`, le pilote commence avec un rayon plus
+grand, puis le resserre jusqu'à `rayon_min` (la valeur historique) chaque fois que la boucle stagne ou
+qu'un pas est rejeté. Ensuite, l'étape 2 (eps_h libre, pénalisé) affine la solution. Avec
+`rayon_initial` = `rayon_min`, les itérés sont ceux de la boucle d'origine.
+
+Le rayon large n'est pas un gain gratuit : les premiers pas, plus amples, accumulent des virages que la
+suite ne défait pas, et la boucle converge parfois vers un optimum local d'effort de contrôle plus élevé.
+Sur le vent synthétique (36 cas), le rayon 0.3 divise les résolutions par 1.7 à N = 31 avec un coût final
+meilleur en moyenne (-0.48) mais pire dans 6 cas (jusqu'à +0.46) ; dès N = 61, il dégrade le coût
+systématiquement (N = 121 : +0.18 en moyenne, jusqu'à +0.73). Au-delà de `N_RAYON_LARGE`, le rayon
+initial par défaut est donc `rayon_min`.
+
+Les itérés sont comparés par le coût du problème non convexe, évalué sur la solution :
+    ALPHA_1 ||x_N - cible|| + ALPHA_2 (2 - u_y,N / v_N) + effort de contrôle + ALPHA_3 max_k | ||u_k|| - v_k |
+où, si le modèle porte K scénarios de vent, ||x_N - cible|| devient le pire ou la moyenne des écarts
+||x_N + d_s - cible|| (voir `distance_finale`).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import time
+
+import numpy as np
+
+from gabarit_scp import ALPHA_1, ALPHA_2, ALPHA_3
+
+# Nombre maximal de résolutions de la convexification successive
+MAX_ITER = 50
+# Rayon initial par défaut, et plus grand N pour lequel il s'applique (au-delà : `rayon_min`)
+RAYON_INITIAL = 0.3
+N_RAYON_LARGE = 31
+
+
+def cout_controle(u, v, dt):
+    """
+    Évalue l'effort de contrôle (terme `control_cost` du problème, sans pondération) d'une ou plusieurs
+    commandes : somme des variations de cap au carré, normalisées par v * sqrt(dt).
+
+    :param u: Commande, (2, N) ou (..., 2, N).
+    :type u: np.ndarray
+    :param v: Profil de vitesse (N,).
+    :type v: np.ndarray
+    :param dt: Pas de temps.
+    :type dt: float
+    :return: Effort de contrôle, de forme (...).
+    :rtype: float or np.ndarray
+    """
+    vitesse_virage = np.linalg.norm(np.diff(u, axis=-1), axis=-2)
+    return np.sum((vitesse_virage / (v[:-1] * np.sqrt(dt))) ** 2, axis=-1)
+
+
+def distance_finale(x, cible, derives=None, critere="pire"):
+    """
+    Évalue la distance finale à la cible, ou son agrégat sur des scénarios de vent.
+
+    :param x: Trajectoire (2, N) sous le vent moyen des scénarios.
+    :type x: np.ndarray
+    :param cible: Position de la cible (2,).
+    :type cible: np.ndarray
+    :param derives: Dérives finales (2, K) des scénarios (None : vent unique).
+    :type derives: np.ndarray
+    :param critere: "pire" (maximum des écarts) ou "moyenne".
+    :type critere: str
+    :return: Distance (m).
+    :rtype: float
+    """
+    ecarts = x[:, -1] - np.ravel(cible)
+    if derives is None:
+        return float(np.linalg.norm(ecarts))
+    ecarts = np.linalg.norm(ecarts[:, None] + derives, axis=0)
+    return float(ecarts.max() if critere == "pire" else ecarts.mean())
+
+
+def termes_cout(x, u, cible, v, dt, derives=None, critere="pire"):
+    """
+    Évalue, sans pondération, les termes du coût du problème non convexe sur une solution (x, u), sous les
+    noms des expressions de `GabaritSCP`.
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :param u: Commande (2, N).
+    :type u: np.ndarray
+    :param cible: Position de la cible (2,).
+    :type cible: np.ndarray
+    :param v: Profil de vitesse (N,).
+    :type v: np.ndarray
+    :param dt: Pas de temps.
+    :type dt: float
+    :param derives: Dérives finales (2, K) des scénarios de vent (None : vent unique).
+    :type derives: np.ndarray
+    :param critere: Agrégation des écarts finaux des scénarios ("pire" ou "moyenne").
+    :type critere: str
+    :return: Dictionnaire (final_position : distance finale à la cible (m), voir `distance_finale` ;
+        final_angle : 2 - u_y,N / v_N ; control_cost : effort de contrôle ; ecart_vitesse :
+        max_k | ||u_k|| - v_k | (m/s)).
+    :rtype: dict
+    """
+    return {"final_position": distance_finale(x, cible, derives, critere),
+            "final_angle": float(2 - u[1, -1] / abs(v[-1])),
+            "control_cost": float(cout_controle(u, v, dt)),
+            "ecart_vitesse": float(np.max(np.abs(np.linalg.norm(u, axis=0) - v)))}
+
+
+def cout_reel(x, u, cible, v, dt, derives=None, critere="pire"):
+    """
+    Évalue le coût du problème non convexe sur une solution (x, u).
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :param u: Commande (2, N).
+    :type u: np.ndarray
+    :param cible: Position de la cible (2,).
+    :type cible: np.ndarray
+    :param v: Profil de vitesse (N,).
+    :type v: np.ndarray
+    :param dt: Pas de temps.
+    :type dt: float
+    :param derives: Dérives finales (2, K) des scénarios de vent (None : vent unique).
+    :type derives: np.ndarray
+    :param critere: Agrégation des écarts finaux des scénarios ("pire" ou "moyenne").
+    :type critere: str
+    :return: Coût.
+    :rtype: float
+    """
+    return _ponderer(termes_cout(x, u, cible, v, dt, derives, critere))
+
+
+def _ponderer(termes):
+    """Somme pondérée des termes de `termes_cout`."""
+    return float(ALPHA_1 * termes["final_position"] + ALPHA_2 * termes["final_angle"] + termes["control_cost"]
+                 + ALPHA_3 * termes["ecart_vitesse"])
+
+
+class PiloteSCP:
+    """
+    Boucle de convexification successive à région de confiance sur la marge de vitesse.
+
+    :param modele: Modèle chargé (voir `charger`), dont le verrou est tenu par l'appelant.
+    :type modele: GabaritSCP or SOCPDirect
+    :param options: Options de `modele.resoudre`.
+    :type options: dict
+    :param rayon_initial: Rayon (marge de vitesse eps_h, m/s) de la première résolution ; un rayon plus
+        grand demande moins de résolutions mais peut conduire à un optimum local moins bon. Par défaut,
+        `RAYON_INITIAL` si le modèle a au plus `N_RAYON_LARGE` étapes, sinon `rayon_min`.
+    :type rayon_initial: float
+    :param rayon_min: Rayon final de l'étape 1.
+    :type rayon_min: float
+    :param reduction: Facteur appliqué au rayon quand la boucle stagne ou qu'un pas est rejeté.
+    :type reduction: float
+    :param tol_abs: Tolérance absolue sur la variation du coût.
+    :type tol_abs: float
+    :param tol_rel: Tolérance relative sur la variation du coût.
+    :type tol_rel: float
+    :param tol_u_abs: Tolérance absolue sur la variation maximale de u (m/s).
+    :type tol_u_abs: float
+    :param tol_u_rel: Tolérance relative sur la variation maximale de u (rapportée à max |u|).
+    :type tol_u_rel: float
+    :param max_iter: Nombre maximal de résolutions.
+    :type max_iter: int
+    :param budget: Temps maximal en secondes (None : pas de limite) ; la boucle s'arrête dès que la
+        résolution suivante, estimée à la durée moyenne des précédentes, le dépasserait.
+    :type budget: float
+    :param arret: Fonction appelée après chaque résolution avec (itération, étape, coût) ; si elle
+        renvoie vrai, la boucle s'arrête (voir aussi `iterer`, qui produit l'itéré complet).
+    :type arret: callable
+    :param etape_max: Dernière étape exécutée ; avec 1, la marge de vitesse reste fixée à `rayon_min`
+        (l'étape 2 la pénalise seulement, et un objectif lointain peut alors gonfler la vitesse).
+    :type etape_max: int
+    """
+
+    def __init__(self, modele, options, rayon_initial=None, rayon_min=0.1, reduction=0.3, tol_abs=1e-2,
+                 tol_rel=1e-4, tol_u_abs=1e-3, tol_u_rel=1e-4, max_iter=MAX_ITER, budget=None, arret=None,
+                 etape_max=2):
+        self.modele = modele
+        self.options = options
+        if rayon_initial is None:
+            rayon_initial = RAYON_INITIAL if modele.N <= N_RAYON_LARGE else rayon_min
+        self.rayon_initial = max(rayon_initial, rayon_min)
+        self.rayon_min = rayon_min
+        self.reduction = reduction
+        self.tol_abs = tol_abs
+        self.tol_rel = tol_rel
+        self.tol_u_abs = tol_u_abs
+        self.tol_u_rel = tol_u_rel
+        self.max_iter = max_iter
+        self.budget = budget
+        self.arret = arret
+        self.etape_max = etape_max
+
+    def stationnaire(self, cout, precedent, u, u_precedent):
+        """
+        Indique si la boucle stagne : variation du coût ou de u sous les tolérances.
+
+        :return: Vrai si l'un des deux tests est satisfait.
+        :rtype: bool
+        """
+        if abs(cout - precedent) <= self.tol_abs + self.tol_rel * abs(cout):
+            return True
+        variation = np.max(np.linalg.norm(u - u_precedent, axis=0))
+        return variation <= self.tol_u_abs + self.tol_u_rel * np.max(np.linalg.norm(u, axis=0))
+
+    def executer(self, cible, v, dt):
+        """
+        Exécute la boucle à partir de la linéarisation chargée dans le modèle (voir `iterer`).
+
+        :param cible: Position de la cible (2,).
+        :type cible: np.ndarray
+        :param v: Profil de vitesse (N,).
+        :type v: np.ndarray
+        :param dt: Pas de temps.
+        :type dt: float
+        :return: Bilan de la boucle (voir `iterer`).
+        :rtype: dict
+        """
+        iterations = self.iterer(cible, v, dt)
+        while True:
+            try:
+                next(iterations)
+            except StopIteration as fin:
+                return fin.value
+
+    def iterer(self, cible, v, dt):
+        """
+        Exécute la boucle à partir de la linéarisation chargée dans le modèle, en produisant chaque itéré
+        dès sa résolution. Envoyer une valeur vraie au générateur (`send(True)`) arrête la boucle comme
+        `arret` ; le bilan est la valeur de retour du générateur (`StopIteration.value`).
+
+        :param cible: Position de la cible (2,).
+        :type cible: np.ndarray
+        :param v: Profil de vitesse (N,).
+        :type v: np.ndarray
+        :param dt: Pas de temps.
+        :type dt: float
+        :return: Générateur d'itérés : dictionnaires (iteration ; etape ; rayon ; x, u : solution, None si la
+            résolution a échoué ; cout ; termes : voir `termes_cout`, None sans solution ; duree_resolution ;
+            duree : secondes depuis le début de la boucle), puis bilan : dictionnaire (x, u, cout du meilleur
+            itéré ; dernier : x, u, cout du dernier itéré accepté ; n_iter : nombre de résolutions ; rejets ;
+            etape atteinte ; converge : critère d'arrêt satisfait ; interrompu : arrêt demandé ; raison :
+            "convergence", "rejet" (le dernier pas de la dernière étape est rejeté : non convergé),
+            "max_iter", "budget" ou "arret" ; historique des coûts).
+        :rtype: generator
+        """
+        modele = self.modele
+        derives = modele.derives if modele.scenarios > 1 else None
+        debut = time.perf_counter()
+        etape, rayon = 1, self.rayon_initial
+        modele.fixer_eps_h(rayon)
+        meilleur = dernier = None
+        rejets, historique, raison, interrompu = 0, [], "max_iter", False
+
+        for i in range(self.max_iter):
+            debut_resolution = time.perf_counter()
+            _, x, u = modele.resoudre(etape, **self.options)
+            fin_resolution = time.perf_counter()
+            termes = None if u is None else termes_cout(x, u, cible, v, dt, derives, modele.critere)
+            cout = np.inf if u is None else _ponderer(termes)
+            historique.append(cout)
+
+            arreter = yield {"iteration": i, "etape": etape, "rayon": rayon, "x": x, "u": u, "cout": cout,
+                             "termes": termes, "duree_resolution": fin_resolution - debut_resolution,
+                             "duree": fin_resolution - debut}
+            if arreter or (self.arret is not None and self.arret(i, etape, cout)):
+                interrompu, raison = True, "arret"
+                if u is not None:
+                    dernier = {"x": x, "u": u, "cout": cout}
+                    if meilleur is None or cout <= meilleur["cout"]:
+                        meilleur = dernier
+                break
+
+            # Premier pas d'un niveau (nouveau rayon ou étape 2) : toujours accepté s'il existe
+            nouveau_niveau = dernier is None or dernier.get("niveau") != (etape, rayon)
+            accepte = u is not None and (nouveau_niveau or cout <= dernier["cout"] + self.tol_abs)
+            if accepte:
+                stagne = not nouveau_niveau and self.stationnaire(cout, dernier["cout"], u, dernier["u"])
+                dernier = {"x": x, "u": u, "cout": cout, "niveau": (etape, rayon)}
+                if meilleur is None or cout <= meilleur["cout"]:
+                    meilleur = dernier
+                modele.fixer_u_bar(u / np.linalg.norm(u, axis=0))
+            else:
+                rejets += 1
+                stagne = True
+                if dernier is not None:
+                    modele.fixer_u_bar(dernier["u"] / np.linalg.norm(dernier["u"], axis=0))
+
+            if stagne:
+                if etape == 1 and rayon > self.rayon_min:
+                    rayon = max(rayon * self.reduction, self.rayon_min)
+                    modele.fixer_eps_h(rayon)
+                elif etape < self.etape_max:
+                    etape = 2
+                else:
+                    raison = "convergence" if accepte else "rejet"
+                    break
+
+            ecoule = time.perf_counter() - debut
+            if self.budget is not None and ecoule * (i + 2) / (i + 1) > self.budget:
+                raison = "budget"
+                break
+
+        if meilleur is None and dernier is None:
+            return {"x": None, "u": None, "cout": np.inf, "n_iter": i + 1, "rejets": rejets, "etape": etape,
+                    "converge": False, "interrompu": interrompu, "raison": raison, "historique": historique}
+        meilleur = meilleur or dernier
+        return {"x": meilleur["x"], "u": meilleur["u"], "cout": meilleur["cout"],
+                "dernier": {"x": dernier["x"], "u": dernier["u"], "cout": dernier["cout"]},
+                "n_iter": i + 1, "rejets": rejets, "etape": etape, "converge": raison == "convergence",
+                "interrompu": interrompu, "raison": raison, "historique": historique}
@@ -0,0 +1,119 @@
+"""
+Ce module rejoue une commande fixée à travers la dynamique discrète de la descente, sans optimiseur.
+
+Responsable de :
+    - propager en une opération NumPy une séquence de commande `u` sous M réalisations du vent
+      (ensembles de forme (M, 2, N)), sans boucle Python par échantillon,
+    - renvoyer les M trajectoires ou seulement les M points d'atterrissage,
+    - réintégrer une trajectoire optimisée sur une grille temporelle plus fine, pour vérifier
+      que la grille grossière (N = 31) ne fausse pas le point d'atterrissage.
+
+La dynamique est celle du problème de guidage (`gabarit_scp`), avec A = I et B_m = B_p = dt / 2 :
+    x[k+1] = x[k] + dt / 2 * (u[k] + u[k+1]) + W[:, k]
+La position est donc une somme cumulée des incréments, calculée le long du dernier axe.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import numpy as np
+
+
+def _increments(u, W, dt):
+    """Renvoie les déplacements de chaque pas, de forme (..., 2, N - 1)."""
+    u = np.asarray(u, dtype=float)
+    W = np.asarray(W, dtype=float)
+    return 0.5 * dt * (u[..., :-1] + u[..., 1:]) + W[..., :u.shape[-1] - 1]
+
+
+def propager(x_0, u, W, dt):
+    """
+    Propage la dynamique discrète pour un lot de vents et/ou de commandes.
+
+    Les dimensions de tête sont diffusées (broadcast) : une commande (2, N) peut être rejouée
+    sous un ensemble de vents (M, 2, N), et des départs (M, 2) combinés à un vent unique.
+
+    :param x_0: Position de départ, (2,), (2, 1) ou (M, 2).
+    :type x_0: array_like
+    :param u: Commande, (2, N) ou (M, 2, N).
+    :type u: array_like
+    :param W: Vent, (2, N) ou (M, 2, N) ; seules les N - 1 premières colonnes interviennent.
+    :type W: array_like
+    :param dt: Pas de temps.
+    :type dt: float
+    :return: Trajectoires de forme (..., 2, N).
+    :rtype: np.ndarray
+    """
+    increments = _increments(u, W, dt)
+    x_0 = np.asarray(x_0, dtype=float)
+    x_0 = x_0.reshape(x_0.shape[:-2] + (2,)) if x_0.shape[-2:] == (2, 1) else x_0
+    positions = np.cumsum(increments, axis=-1) + x_0[..., None]
+    depart = np.broadcast_to(x_0[..., None], positions.shape[:-1] + (1,))
+    return np.concatenate([depart, positions], axis=-1)
+
+
+def atterrissages(x_0, u, W, dt):
+    """
+    Renvoie seulement les points d'atterrissage, sans construire les trajectoires complètes.
+
+    :param x_0: Position de départ, (2,), (2, 1) ou (M, 2).
+    :type x_0: array_like
+    :param u: Commande, (2, N) ou (M, 2, N).
+    :type u: array_like
+    :param W: Vent, (2, N) ou (M, 2, N).
+    :type W: array_like
+    :param dt: Pas de temps.
+    :type dt: float
+    :return: Points d'atterrissage de forme (..., 2).
+    :rtype: np.ndarray
+    """
+    x_0 = np.asarray(x_0, dtype=float)
+    x_0 = x_0.reshape(x_0.shape[:-2] + (2,)) if x_0.shape[-2:] == (2, 1) else x_0
+    return x_0 + _increments(u, W, dt).sum(axis=-1)
+
+
+def affiner(valeurs, facteur):
+    """
+    Interpole linéairement des valeurs échantillonnées sur N instants vers (N - 1) * facteur + 1 instants.
+
+    :param valeurs: Tableau (..., N).
+    :type valeurs: array_like
+    :param facteur: Nombre de sous-pas par pas grossier.
+    :type facteur: int
+    :return: Tableau (..., (N - 1) * facteur + 1).
+    :rtype: np.ndarray
+    """
+    valeurs = np.asarray(valeurs, dtype=float)
+    N = valeurs.shape[-1]
+    positions = np.arange((N - 1) * facteur + 1) / facteur
+    avant = np.minimum(positions.astype(int), N - 2)
+    poids = positions - avant
+    return (1 - poids) * valeurs[..., avant] + poids * valeurs[..., avant + 1]
+
+
+def reintegrer(simulateur, W=None, facteur=10):
+    """
+    Rejoue la commande optimisée d'un `SimulerTrajectoire` sur une grille temporelle `facteur` fois plus fine.
+
+    Sur la grille fine, l'altitude et la vitesse sont recalculées par `calcul_altitude` et
+    `calcul_profil_vitesse` ; le cap de la commande est interpolé entre les pas grossiers et sa norme
+    suit la vitesse recalculée. Le terme de vent du modèle étant un déplacement par pas grossier,
+    chaque sous-pas en reçoit la fraction 1 / facteur.
+
+    :param simulateur: Simulateur dont `optimiser_trajectoire` a été appelé.
+    :type simulateur: SimulerTrajectoire
+    :param W: Vent (2, N) ou ensemble (M, 2, N) sur la grille grossière (défaut : le vent de l'optimisation).
+    :type W: array_like
+    :param facteur: Nombre de sous-pas par pas grossier.
+    :type facteur: int
+    :return: Tuple (trajectoires (..., 2, (N - 1) * facteur + 1), temps de la grille fine).
+    :rtype: tuple
+    """
+    W = simulateur.W if W is None else W
+    temps = np.linspace(simulateur.time[0], simulateur.time[-1], (simulateur.N - 1) * facteur + 1)
+    v = simulateur.calcul_profil_vitesse(simulateur.calcul_altitude(temps))
+
+    cap = affiner(simulateur.u_star, facteur)
+    cap /= np.maximum(np.linalg.norm(cap, axis=0), 1e-12)
+    u = cap * v
+    return propager(simulateur.x_0, u, affiner(W, facteur) / facteur, simulateur.dt / facteur), temps
@@ -0,0 +1,175 @@
+"""
+Ce module rend les figures d'une trajectoire optimisée, en mémoire et sans fenêtre.
+
+Responsable de :
+    - tracer la trajectoire au sol (2D) et dans l'espace (3D) en PNG,
+    - produire l'animation 3D de la descente en GIF,
+    - construire une figure Plotly animée, rendue par le navigateur, pour l'interface Streamlit.
+
+Les figures matplotlib sont des `Figure` rendues par le canevas Agg, sans pyplot : ni fenêtre, ni choix de
+backend global, ni état partagé entre fils, et les images sont écrites dans des tampons en mémoire.
+L'animation est rendue incrémentalement : les axes 3D (le plus coûteux) sont dessinés une fois, puis
+chaque image ne redessine que la trajectoire et le parachute sur ce fond (blitting) et passe dans une
+palette commune calculée une fois ; le coût est donc linéaire en N. La figure Plotly ne transporte, par
+image, que la position du parachute (la trajectoire complète est une trace fixe).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import io
+
+import numpy as np
+
+# Durée d'une image de l'animation (ms), soit 5 images par seconde
+DUREE_IMAGE = 200
+
+
+def _figure(projection=None):
+    """Renvoie une figure Agg hors pyplot et ses axes."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111, projection=projection)
+
+
+def _png(fig):
+    """Renvoie les octets PNG d'une figure."""
+    tampon = io.BytesIO()
+    fig.savefig(tampon, format="png")
+    return tampon.getvalue()
+
+
+def image_2d(x):
+    """
+    Trace la trajectoire au sol.
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :return: Image PNG.
+    :rtype: bytes
+    """
+    fig, ax = _figure()
+    ax.plot(x[0], x[1], 'b--', label="Trajectoire optimisée")
+    ax.plot(x[0, 0], x[1, 0], 'go', label="Départ")
+    ax.plot(x[0, -1], x[1, -1], 'ro', label="Arrivée")
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_title("Trajectoire 2D au sol")
+    ax.legend()
+    ax.grid(True)
+    return _png(fig)
+
+
+def image_3d(x, z):
+    """
+    Trace la trajectoire avec son altitude.
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :param z: Altitude (N,).
+    :type z: np.ndarray
+    :return: Image PNG.
+    :rtype: bytes
+    """
+    fig, ax = _figure("3d")
+    ax.plot(x[0], x[1], z, 'b--', label="Trajectoire optimisée")
+    ax.scatter(x[0, 0], x[1, 0], z[0], color='green', label='Départ')
+    ax.scatter(x[0, -1], x[1, -1], z[-1], color='red', label='Arrivée')
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_zlabel("z (m)")
+    ax.set_title("Trajectoire 3D")
+    ax.legend()
+    return _png(fig)
+
+
+def animation_gif(x, z, duree_image=DUREE_IMAGE):
+    """
+    Anime la descente en 3D : la trajectoire se dessine pas à pas derrière le parachute.
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :param z: Altitude (N,).
+    :type z: np.ndarray
+    :param duree_image: Durée d'une image (ms).
+    :type duree_image: int
+    :return: Animation GIF.
+    :rtype: bytes
+    """
+    from PIL import Image
+
+    fig, ax = _figure("3d")
+    ligne, = ax.plot([], [], [], lw=2, label="Trajectoire", linestyle=':')
+    point, = ax.plot([], [], [], 'ro', label="Parachute")
+    ax.set_xlim(x[0].min(), x[0].max())
+    ax.set_ylim(x[1].min(), x[1].max())
+    ax.set_zlim(0, z.max())
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_zlabel("z (m)")
+    ax.set_title("Animation 3D de la trajectoire")
+    ax.legend()
+
+    # Fond (axes, légende) dessiné une fois, sans les deux tracés animés
+    canevas = fig.canvas
+    ligne.set_animated(True)
+    point.set_animated(True)
+    canevas.draw()
+    fond = canevas.copy_from_bbox(fig.bbox)
+
+    def image(k):
+        canevas.restore_region(fond)
+        ligne.set_data_3d(x[0, :k], x[1, :k], z[:k])
+        point.set_data_3d(x[0, k:k + 1], x[1, k:k + 1], z[k:k + 1])
+        ax.draw_artist(ligne)
+        ax.draw_artist(point)
+        return Image.frombuffer("RGBA", canevas.get_width_height(), canevas.buffer_rgba()).convert("RGB")
+
+    # Palette commune, prise sur la dernière image (tous les éléments y sont visibles)
+    palette = image(x.shape[1] - 1).quantize(colors=255, dither=Image.Dither.NONE)
+    images = [image(k).quantize(palette=palette, dither=Image.Dither.NONE) for k in range(x.shape[1])]
+    tampon = io.BytesIO()
+    images[0].save(tampon, format="gif", save_all=True, append_images=images[1:], duration=duree_image, loop=0,
+                   optimize=False)
+    return tampon.getvalue()
+
+
+def figure_animee(x, z, duree_image=DUREE_IMAGE):
+    """
+    Construit une figure Plotly 3D animée de la descente (boutons lecture/pause et curseur), rendue par
+    le navigateur : la trajectoire complète est fixe et seules les positions du parachute changent.
+
+    :param x: Trajectoire (2, N).
+    :type x: np.ndarray
+    :param z: Altitude (N,).
+    :type z: np.ndarray
+    :param duree_image: Durée d'une image (ms).
+    :type duree_image: int
+    :return: Figure Plotly.
+    :rtype: plotly.graph_objects.Figure
+    """
+    import plotly.graph_objects as go
+
+    x, z = np.asarray(x, dtype=float), np.asarray(z, dtype=float)
+    parachute = lambda k: go.Scatter3d(x=x[0, k:k + 1], y=x[1, k:k + 1], z=z[k:k + 1], mode="markers",
+                                       marker={"color": "red", "size": 5}, name="Parachute")
+    images = [go.Frame(data=[parachute(k)], traces=[1], name=str(k)) for k in range(x.shape[1])]
+    lecture = {"frame": {"duration": duree_image, "redraw": True}, "fromcurrent": True, "transition": {"duration": 0}}
+    pause = {"frame": {"duration": 0, "redraw": False}, "mode": "immediate"}
+    fig = go.Figure(
+        data=[go.Scatter3d(x=x[0], y=x[1], z=z, mode="lines", line={"dash": "dot", "width": 4}, name="Trajectoire"),
+              parachute(0)],
+        frames=images,
+        layout=go.Layout(
+            title="Animation 3D de la trajectoire",
+            scene={"xaxis_title": "x (m)", "yaxis_title": "y (m)", "zaxis": {"title": "z (m)", "range": [0, z.max()]}},
+            updatemenus=[{"type": "buttons", "showactive": False,
+                          "buttons": [{"label": "▶", "method": "animate", "args": [None, lecture]},
+                                      {"label": "⏸", "method": "animate", "args": [[None], pause]}]}],
+            sliders=[{"steps": [{"label": f"{k}", "method": "animate", "args": [[f"{k}"], pause]}
+                                for k in range(x.shape[1])],
+                      "currentvalue": {"prefix": "Pas "}}]))
+    return fig
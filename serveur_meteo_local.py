@@ -0,0 +1,133 @@
+"""
+serveur_meteo_local.py - Serveur HTTP local qui imite l'API de prévision Open-Meteo.
+
+Utilisé pour tester et chronométrer la récupération du vent sans réseau :
+    - répond à `/v1/forecast?latitude=..&longitude=..` comme l'API (objet pour un site,
+      liste d'objets pour plusieurs sites séparés par des virgules),
+    - génère des prévisions horaires déterministes à partir des coordonnées,
+    - peut renvoyer des erreurs 503 sur les premières requêtes pour exercer les nouvelles tentatives,
+    - compte les requêtes reçues.
+
+Usage :
+    with ServeurMeteoLocal() as serveur:
+        vents = ImportVentMultiSites(url_base=serveur.url).import_vent([(48.85, 2.35), (45.76, 4.84)])
+
+    python serveur_meteo_local.py 8765
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import json
+import sys
+import threading
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+ALTITUDES = [10, 80, 120, 180]
+HEURES = 168
+
+
+def prevision_synthetique(lat, lon, heures=HEURES):
+    """
+    Construit une réponse Open-Meteo reproductible pour un site.
+
+    :param lat: Latitude.
+    :type lat: float
+    :param lon: Longitude.
+    :type lon: float
+    :param heures: Nombre d'heures de prévision.
+    :type heures: int
+    :return: Réponse au format de l'API.
+    :rtype: dict
+    """
+    rng = np.random.default_rng(zlib.crc32(f"{lat:.4f},{lon:.4f}".encode()))
+    debut = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    hourly = {"time": [(debut + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(heures)]}
+    base_vitesse = rng.uniform(5, 25)
+    base_direction = rng.uniform(0, 360)
+    t = np.arange(heures)
+    for a in ALTITUDES:
+        facteur = (a / 10) ** 0.14
+        vitesse = base_vitesse * facteur * (1 + 0.3 * np.sin(2 * np.pi * t / 24)) + rng.normal(0, 1, heures)
+        direction = (base_direction + 10 * np.log(a) + 20 * np.sin(2 * np.pi * t / 48)) % 360
+        hourly[f"wind_speed_{a}m"] = np.round(np.abs(vitesse), 1).tolist()
+        hourly[f"wind_direction_{a}m"] = np.round(direction).astype(int).tolist()
+    return {"latitude": lat, "longitude": lon, "timezone": "GMT", "hourly": hourly}
+
+
+class ServeurMeteoLocal:
+    """
+    Serveur Open-Meteo local, lancé dans un fil d'exécution d'arrière-plan.
+
+    :param port: Port d'écoute (0 : port libre choisi par le système).
+    :type port: int
+    :param erreurs_initiales: Nombre de premières requêtes qui reçoivent une erreur 503.
+    :type erreurs_initiales: int
+
+    :ivar url: Adresse à passer en `url_base` aux fonctions de récupération.
+    :ivar requetes: Nombre de requêtes reçues.
+    """
+
+    def __init__(self, port=0, erreurs_initiales=0):
+        self.erreurs_restantes = erreurs_initiales
+        self.requetes = 0
+        self._verrou = threading.Lock()
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with serveur._verrou:
+                    serveur.requetes += 1
+                    en_erreur = serveur.erreurs_restantes > 0
+                    serveur.erreurs_restantes -= en_erreur
+                requete = urlparse(self.path)
+                if requete.path != "/v1/forecast":
+                    self.send_error(404)
+                    return
+                if en_erreur:
+                    self.send_error(503)
+                    return
+                parametres = parse_qs(requete.query)
+                lats = [float(v) for v in parametres["latitude"][0].split(",")]
+                lons = [float(v) for v in parametres["longitude"][0].split(",")]
+                reponses = [prevision_synthetique(lat, lon) for lat, lon in zip(lats, lons)]
+                corps = json.dumps(reponses if len(reponses) > 1 else reponses[0]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Gestionnaire)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/v1/forecast"
+        self._fil = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def demarrer(self):
+        """Démarre le serveur en arrière-plan."""
+        self._fil.start()
+        return self
+
+    def arreter(self):
+        """Arrête le serveur et libère le port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.demarrer()
+
+    def __exit__(self, *exc):
+        self.arreter()
+
+
+if __name__ == "__main__":
+    serveur = ServeurMeteoLocal(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Serveur Open-Meteo local sur {serveur.url}")
+    serveur._httpd.serve_forever()
@@ -11,14 +11,9 @@ Ce module permet :
 :date: 26/06/2026
 """
 
-# Importations nécessaires
+# Importations nécessaires (cvxpy et matplotlib sont importés à l'appel de `simuler_trajectoire`)
 import numpy as np
 from importer_vent import import_vent
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.animation import FuncAnimation, PillowWriter
-import cvxpy as cvx
 
 def simuler_trajectoire(lat=47.3388, lon=-81.9141, N=31):
     """
@@ -48,6 +43,10 @@ def simuler_trajectoire(lat=47.3388, lon=-81.9141, N=31):
         - time: Vecteur temporel utilisé dans la simulation.
     :rtype: tuple
     """
+    import cvxpy as cvx
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation, PillowWriter
+
 
     W, z_t, time, _ = import_vent(lat, lon, N)
     z0 = 1200
@@ -234,5 +233,6 @@ def simuler_trajectoire(lat=47.3388, lon=-81.9141, N=31):
 
     return x_star, erreur, (xf, yf), z_t, time
 
-# Appel principal pour test local
-X, erreur, (xf, yf), z_t, time = simuler_trajectoire()
+# Appel principal pour test local (jamais à l'import)
+if __name__ == "__main__":
+    X, erreur, (xf, yf), z_t, time = simuler_trajectoire()
@@ -7,17 +7,26 @@ Contient :
     - L'optimisation convexe de la trajectoire avec cvxpy.
     - Le dessin 2D, 3D et une animation de la trajectoire.
 
+Rien n'est calculé à l'import, et ni cvxpy ni matplotlib ne sont importés : le backend cvxpy est chargé
+à la première optimisation qui l'utilise, matplotlib au premier dessin. Les dessins sont rendus en mémoire
+et sans fenêtre par le module `rendu`, puis écrits dans le dossier courant ou renvoyés en octets.
+
 :author: Syrine Boudef, Wilson David Parra Oliveros, Linda Ghazouani
 :date: 26/06/2026
 """
 
+from time import perf_counter
+
 import numpy as np
-from importer_vent import import_vent
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.animation import FuncAnimation, PillowWriter
-import cvxpy as cvx
+import rendu
+from importer_vent import ProfilVent, import_vent
+from gabarit_scp import obtenir_gabarit
+from socp_direct import obtenir_socp_direct
+from solveurs import OPTIONS_SOLVEURS, choisir_solveur, options_solveur
+from pilote_scp import PiloteSCP, cout_controle, cout_reel
+
+# Backends de résolution : problème cvxpy paramétré, ou matrices coniques assemblées pour ECOS
+_BACKENDS = {"cvxpy": obtenir_gabarit, "direct": obtenir_socp_direct}
 
 class SimulerTrajectoire:
     """
@@ -32,16 +41,36 @@ class SimulerTrajectoire:
     :type N: int
     :param random_range: Amplitude aléatoire pour la position de départ.
     :type random_range: int
+    :param backend: "cvxpy" (par défaut) ou "direct" (assemblage creux sans cvxpy, plus rapide).
+    :type backend: str
+    :param solveur: Solveur conique ("ECOS", "CLARABEL", "SCS"...) ou "auto" pour le plus rapide
+        d'après la calibration enregistrée (voir `solveurs`). Le backend "direct" n'utilise qu'ECOS.
+    :type solveur: str
+    :param hour_index: Index horaire de largage dans la prévision, éventuellement fractionnaire.
+    :type hour_index: float
+    :param profil_vent: Champ de vent précalculé de toutes les heures (voir `ImportVent.profil_vent`) ;
+        s'il est fourni, le vent est pris dans ce profil sans nouvelle requête.
+    :type profil_vent: ProfilVent
+    :param x_0: Position de départ imposée ; par défaut, tirée au hasard à `random_range` de la cible
+        (`carp.placer_largage` la remplace par le point de largage optimal).
+    :type x_0: array-like
     """
 
-    def __init__(self, lat=13, lon=50, N=31, random_range=600):
+    def __init__(self, lat=13, lon=50, N=31, random_range=600, backend="cvxpy", solveur="ECOS",
+                 hour_index=0, profil_vent=None, x_0=None):
         self.lat = lat
         self.lon = lon
         self.N = N
+        self.backend = backend
+        self.solveur = solveur
+        self.hour_index = hour_index
+        self.profil_vent = profil_vent
         self.z0 = 1200
-        random_lat = np.random.uniform(-random_range, random_range)
-        random_lon = np.random.uniform(-random_range, random_range)
-        self.x_0 = np.array([[lat + random_lat], [lon + random_lon]])
+        if x_0 is None:
+            random_lat = np.random.uniform(-random_range, random_range)
+            random_lon = np.random.uniform(-random_range, random_range)
+            x_0 = [lat + random_lat, lon + random_lon]
+        self.x_0 = np.reshape(np.asarray(x_0, dtype=float), (2, 1))
         self.cz = 2.256E-5
         self.ce = 4.2559
         self.cf = self.ce / 2 + 1
@@ -87,84 +116,259 @@ class SimulerTrajectoire:
         """
         return self.vz0 * np.sqrt(self.rho0 / self.calcul_densite(z))
 
-    def optimiser_trajectoire(self):
+    def options_resolution(self):
+        """
+        Détermine le solveur effectif et ses options pour le backend choisi.
+
+        :return: Tuple (nom du solveur, options à transmettre à `resoudre`).
+        :rtype: tuple
+        """
+        if self.backend == "direct":
+            if self.solveur.upper() not in ("ECOS", "AUTO"):
+                raise ValueError(f"Le backend direct n'utilise qu'ECOS (solveur demandé : {self.solveur})")
+            return "ECOS", dict(OPTIONS_SOLVEURS["ECOS"])
+        nom = choisir_solveur(self.N) if self.solveur.lower() == "auto" else self.solveur.upper()
+        return nom, options_solveur(nom)
+
+    def champ_vent(self):
+        """
+        Renvoie le vent de l'heure de largage, pris dans `profil_vent` s'il existe, sinon importé.
+
+        :return: Tuple (W, z_t, time).
+        :rtype: tuple
+        """
+        if self.profil_vent is None:
+            W, z_t, time, _ = import_vent(self.lat, self.lon, self.hour_index, self.N)
+            return W, z_t, time
+        if self.profil_vent.tenseur.shape[2] != self.N:
+            raise ValueError(f"Le profil de vent a {self.profil_vent.tenseur.shape[2]} étapes, N = {self.N}")
+        return self.profil_vent.W(self.hour_index), self.profil_vent.z_t, self.profil_vent.time
+
+    def optimiser_trajectoire(self, u_bar_init=None, x_init=None, arret=None, budget=None, scenarios=None,
+                              critere="pire", suivi=None, **reglages):
         """
         Réalise l'optimisation convexe de la trajectoire pour atteindre la cible GPS.
 
+        Le problème est pris dans le cache du backend choisi (`gabarit_scp` pour "cvxpy",
+        `socp_direct` pour "direct") : seules ses données sont mises à jour avant chaque résolution.
+        La convexification successive est conduite par `PiloteSCP` (région de confiance, arrêt garanti) ;
+        son bilan est dans `self.bilan` et `self.converge` indique si la boucle a stagné sur un pas accepté
+        avant `MAX_ITER` résolutions ou la fin du budget (un pas rejeté à la dernière étape ne compte pas).
+
+        :param u_bar_init: Commande (2, N) servant de première linéarisation, à la place du cap constant `psi_0`.
+        :type u_bar_init: np.ndarray
+        :param x_init: Trajectoire (2, N) transmise avec `u_bar_init` comme point de départ des solveurs
+            qui acceptent un warm start.
+        :type x_init: np.ndarray
+        :param arret: Fonction appelée après chaque itération avec (itération, étape, coût) ; si elle renvoie
+            vrai, la boucle s'arrête et `self.interrompu` vaut True.
+        :type arret: callable
+        :param budget: Temps maximal de la boucle en secondes (None : pas de limite).
+        :type budget: float
+        :param scenarios: Scénarios de vent (K, 2, N) (membres d'ensemble, vents perturbés, voir
+            `dispersion.scenarios_vent`) à la place du vent de `champ_vent` : la commande, commune, minimise
+            l'écart final le pire ou moyen. `x_star` est alors la trajectoire sous le vent moyen, celles des
+            scénarios sont dans `self.trajectoires_scenarios` et leurs erreurs dans `self.erreurs_scenarios`.
+        :type scenarios: np.ndarray
+        :param critere: Agrégation des écarts des scénarios : "pire" ou "moyenne".
+        :type critere: str
+        :param suivi: Fonction appelée avec chaque itéré complet (voir `iterer_trajectoire`) ; si elle renvoie
+            vrai, la boucle s'arrête comme avec `arret`.
+        :type suivi: callable
+        :param reglages: Autres paramètres de `PiloteSCP` (rayon_initial, tolérances, max_iter...).
         :return: Tuple contenant la trajectoire optimisée, l'erreur, les coordonnées finales, le profil z et le temps.
         :rtype: tuple
         """
-        W, z_t, time, _ = import_vent(self.lat, self.lon, self.N)
+        iterations = self.iterer_trajectoire(u_bar_init, x_init, arret, budget, scenarios, critere, **reglages)
+        arreter = None
+        while True:
+            try:
+                iteration = iterations.send(arreter)
+            except StopIteration as fin:
+                return fin.value
+            arreter = suivi is not None and suivi(iteration)
+
+    def iterer_trajectoire(self, u_bar_init=None, x_init=None, arret=None, budget=None, scenarios=None,
+                           critere="pire", **reglages):
+        """
+        Variante de `optimiser_trajectoire` qui produit chaque itéré de la convexification successive dès sa
+        résolution, pour tracer la trajectoire pendant qu'elle converge ou s'arrêter dès que l'erreur
+        d'atterrissage suffit.
+
+        Envoyer une valeur vraie au générateur (`send(True)`) ou le fermer (`close`) arrête la boucle : le
+        meilleur itéré obtenu est alors installé comme après une optimisation interrompue par `arret`. Le
+        problème en cache reste verrouillé tant que le générateur n'est ni épuisé ni fermé.
+
+        :param u_bar_init: Voir `optimiser_trajectoire`.
+        :param x_init: Voir `optimiser_trajectoire`.
+        :param arret: Voir `optimiser_trajectoire`.
+        :param budget: Voir `optimiser_trajectoire`.
+        :param scenarios: Voir `optimiser_trajectoire`.
+        :param critere: Voir `optimiser_trajectoire`.
+        :param reglages: Autres paramètres de `PiloteSCP`.
+        :return: Générateur d'itérés (voir `PiloteSCP.iterer` : iteration, etape, rayon, x, u, cout, termes
+            du coût dont `final_position`, l'erreur d'atterrissage en mètres, durées), dont la valeur de
+            retour est celle de `optimiser_trajectoire`.
+        :rtype: generator
+        """
+        W, z_t, time = self.champ_vent()
+        if scenarios is not None:
+            scenarios = np.asarray(scenarios, dtype=float)
+            W = scenarios.mean(axis=0)
+        self.W = W
+        self.scenarios = scenarios
         self.time = time
         self.z_t = z_t
         tf = self.time[-1]
         dt = tf / (self.N - 1)
         z = self.calcul_altitude(self.time)
         v = self.calcul_profil_vitesse(z)
+        self.v = v
+        self.dt = dt
 
-        A = np.eye(2)
-        B_p = np.eye(2) * dt * 0.5
-        B_m = np.eye(2) * dt * 0.5
-        phid_max = 0.14
         u_0 = np.array([[v[0] * np.cos(self.psi_0)], [v[0] * np.sin(self.psi_0)]])
 
-        eps_convergence = 0.01
-        alpha_1, alpha_2, alpha_3 = 100, 10, 1
-
-        x = cvx.Variable((2, self.N))
-        u = cvx.Variable((2, self.N))
-        eps_h = cvx.Variable(nonneg=True)
-        u_bar = cvx.Parameter((2, self.N))
-        u_init = np.array([v * np.cos(self.psi_0), v * np.sin(self.psi_0)])
+        if u_bar_init is None:
+            u_init = np.array([v * np.cos(self.psi_0), v * np.sin(self.psi_0)])
+        else:
+            u_init = np.asarray(u_bar_init, dtype=float)
         norms = np.linalg.norm(u_init, axis=0)
         norms[norms == 0] = 1e-6
-        u_bar.value = np.divide(u_init, norms)
-
-        const = [x[:, [0]] == self.x_0, u[:, [0]] == u_0]
-        const += [x[:, [k + 1]] == A @ x[:, [k]] + (B_m @ u[:, [k]] + B_p @ u[:, [k + 1]]) + [W[:, k]]
-                  for k in range(self.N - 1)]
-        const += [(cvx.norm2(cvx.diff(u, axis=1), axis=0) / dt / v[k])[k] <= phid_max for k in range(self.N - 1)]
-        const += [u_bar[:, [k]].T @ u[:, [k]] - v[k] >= -eps_h for k in range(self.N)]
-        const += [cvx.norm(u[:, [k]]) - v[k] <= eps_h for k in range(self.N)]
 
         target = np.array([[self.lat], [self.lon]])
-        final_position = cvx.norm(x[:, [-1]] - target)
-        final_angle = 2 - u[1, [-1]] / np.linalg.norm(v[-1])
-        control_cost = cvx.sum_squares(cvx.norm(cvx.diff(u, axis=1), axis=0) / v[:-1]) / dt
-        cost = alpha_1 * final_position + alpha_2 * final_angle + control_cost
-
-        MAX_ITER = 50
-        it_cost = np.empty(MAX_ITER)
-        X = np.empty((2, self.N, MAX_ITER))
-
-        problem = cvx.Problem(cvx.Minimize(cost), const + [eps_h == 0.1])
-        first_stage_converged = False
-
-        for i in range(MAX_ITER):
-            s = problem.solve(solver=cvx.ECOS, verbose=True, warm_start=True)
-            if u.value is None:
-                raise ValueError(f"ECOS n'a pas trouvé de solution à l'itération {i}")
-
-            u_bar.value = np.divide(u.value, np.linalg.norm(u.value, axis=0))
-            X[:, :, i] = x.value
-            it_cost[i] = cost.value
-
-            if (i > 0 and abs(it_cost[i] - it_cost[i - 1]) < eps_convergence):
-                if first_stage_converged:
-                    n_iter = i
+        if self.backend not in _BACKENDS:
+            raise ValueError(f"Backend inconnu : {self.backend} (choix : {', '.join(_BACKENDS)})")
+        K = 1 if scenarios is None else len(scenarios)
+        modele = _BACKENDS[self.backend](self.N, K, critere)
+        nom_solveur, options = self.options_resolution()
+
+        with modele.verrou:
+            modele.charger(W if scenarios is None else scenarios, self.x_0, target, v, dt, u_0,
+                           np.divide(u_init, norms))
+            if x_init is not None:
+                modele.amorcer(x_init, u_init)
+            pilote = PiloteSCP(modele, options, budget=budget, arret=arret, **reglages)
+            iterations = pilote.iterer(target, v, dt)
+            arreter = None
+            while True:
+                try:
+                    iteration = iterations.send(arreter)
+                except StopIteration as fin:
+                    bilan = fin.value
                     break
-                else:
-                    cost += alpha_3 * eps_h
-                    problem = cvx.Problem(cvx.Minimize(cost), const)
-                    first_stage_converged = True
-
-        self.x_star = X[:, :, n_iter]
+                try:
+                    arreter = yield iteration
+                except GeneratorExit:
+                    # Fermeture : la boucle s'arrête sur cet itéré et le meilleur est installé sans rien produire
+                    try:
+                        iterations.send(True)
+                    except StopIteration as fin:
+                        bilan = fin.value
+                    if bilan["u"] is not None:
+                        self._installer(bilan, nom_solveur, z_t, time, scenarios, W)
+                    return
+
+        return self._installer(bilan, nom_solveur, z_t, time, scenarios, W)
+
+    def _installer(self, bilan, nom_solveur, z_t, time, scenarios, W):
+        """Installe le bilan de `PiloteSCP` dans les attributs du simulateur (voir `optimiser_trajectoire`)."""
+        if bilan["u"] is None:
+            raise ValueError(f"{nom_solveur} n'a pas trouvé de solution en {bilan['n_iter']} itérations")
+        self.bilan = bilan
+        self.x_star = bilan["x"]
+        self.u_star = bilan["u"]
+        self.cout = bilan["cout"]
+        self.converge = bilan["converge"]
+        self.interrompu = bilan["interrompu"]
+        n_iter = bilan["n_iter"]
         self.z_t = z_t
         self.time = time
         self.target = np.array([self.lat, self.lon])
         self.n_iter = n_iter
+        if scenarios is not None:
+            ecarts = np.cumsum(scenarios[:, :, :self.N - 1] - W[:, :self.N - 1], axis=2)
+            self.trajectoires_scenarios = self.x_star + np.pad(ecarts, ((0, 0), (0, 0), (1, 0)))
+            self.erreurs_scenarios = np.linalg.norm(self.trajectoires_scenarios[:, :, -1] - self.target, axis=1)
         return self.x_star, self.calcul_erreur(), (self.x_star[0, -1], self.x_star[1, -1]), self.z_t, self.time
 
+    def adopter(self, x_star, u_star, W, z_t, time, n_iter=0, cout=None):
+        """
+        Installe une solution obtenue hors de `optimiser_trajectoire` (autre processus, cache de plans),
+        avec les mêmes attributs qu'après une optimisation.
+
+        :param x_star: Trajectoire (2, N).
+        :type x_star: np.ndarray
+        :param u_star: Commande (2, N).
+        :type u_star: np.ndarray
+        :param W: Vent (2, N) de la solution.
+        :type W: np.ndarray
+        :param z_t: Profil d'altitude.
+        :type z_t: np.ndarray
+        :param time: Vecteur temps.
+        :type time: np.ndarray
+        :param n_iter: Nombre de résolutions ayant produit la solution (0 : aucune).
+        :type n_iter: int
+        :param cout: Coût du problème non convexe (recalculé si None).
+        :type cout: float
+        :return: Même résultat que `optimiser_trajectoire`.
+        :rtype: tuple
+        """
+        self.W, self.z_t, self.time = W, z_t, time
+        self.scenarios = None
+        self.dt = time[-1] / (self.N - 1)
+        self.v = self.calcul_profil_vitesse(self.calcul_altitude(time))
+        self.target = np.array([self.lat, self.lon])
+        self.x_star, self.u_star = x_star, u_star
+        self.cout = cout_reel(x_star, u_star, self.target, self.v, self.dt) if cout is None else cout
+        self.n_iter = n_iter
+        self.converge, self.interrompu = True, False
+        return self.x_star, self.calcul_erreur(), (self.x_star[0, -1], self.x_star[1, -1]), self.z_t, self.time
+
+    def optimiser_multiresolution(self, n_min=31, facteur=2):
+        """
+        Optimise d'abord sur une grille temporelle grossière, puis raffine jusqu'à N étapes.
+
+        Chaque niveau divise le nombre de pas par `facteur` jusqu'à `n_min` étapes. La solution d'un
+        niveau, interpolée sur la grille suivante, sert de linéarisation initiale (`u_bar`) et de
+        warm start. Le vent d'un niveau est celui de la grille fine interpolé en temps ; le modèle
+        ajoutant W à chaque pas, il est multiplié par le rapport des nombres de pas pour conserver
+        la dérive totale.
+
+        :param n_min: Nombre d'étapes du niveau le plus grossier (au moins).
+        :type n_min: int
+        :param facteur: Rapport du nombre de pas entre deux niveaux.
+        :type facteur: int
+        :return: Même résultat que `optimiser_trajectoire` ; le détail par niveau (N, itérations,
+            durée) est dans `self.niveaux`.
+        :rtype: tuple
+        """
+        W, _, time = self.champ_vent()
+        tailles = [self.N]
+        while (tailles[-1] - 1) // facteur + 1 >= n_min:
+            tailles.append((tailles[-1] - 1) // facteur + 1)
+
+        self.niveaux = []
+        u = x = t_prec = None
+        for n in reversed(tailles):
+            t_n = np.linspace(time[0], time[-1], n)
+            if n == self.N:
+                niveau = self
+            else:
+                W_n = np.array([np.interp(t_n, time, w) for w in W]) * (self.N - 1) / (n - 1)
+                niveau = SimulerTrajectoire(self.lat, self.lon, n, backend=self.backend, solveur=self.solveur,
+                                            profil_vent=ProfilVent(W_n[None], self.calcul_altitude(t_n), t_n),
+                                            x_0=self.x_0)
+                niveau.psi_0 = self.psi_0
+            if u is not None:
+                u = np.array([np.interp(t_n, t_prec, c) for c in u])
+                x = np.array([np.interp(t_n, t_prec, c) for c in x])
+            debut = perf_counter()
+            # Un niveau amorcé part déjà près de la solution : région de confiance au rayon minimal
+            resultat = niveau.optimiser_trajectoire(u, x, **({} if u is None else {"rayon_initial": 0.}))
+            self.niveaux.append({"N": n, "n_iter": niveau.n_iter, "duree": perf_counter() - debut})
+            u, x, t_prec = niveau.u_star, niveau.x_star, t_n
+        return resultat
+
     def calcul_erreur(self):
         """
         Calcule l'erreur à la cible finale.
@@ -177,85 +381,66 @@ class SimulerTrajectoire:
         tx, ty = self.target[0], self.target[1]
         return np.sqrt((xf - tx) ** 2 + (yf - ty) ** 2)
 
-    def dessin_trajectoire_2D(self):
+    def calcul_cout_controle(self):
         """
-        Trace et sauvegarde une figure 2D de la trajectoire au sol.
+        Calcule le coût de commande de la trajectoire optimisée (terme `control_cost` du problème,
+        sans pondération) : somme des variations de cap au carré, normalisées par v * sqrt(dt).
 
-        :return: Nom du fichier image généré.
-        :rtype: str
+        :return: Coût de commande.
+        :rtype: float
         """
-        filename = f"graph2D_{self.lat:.2f}_{self.lon:.2f}.png"
-        plt.figure()
-        plt.plot(self.x_star[0, :], self.x_star[1, :], 'b--', label="Trajectoire optimisée")
-        plt.plot(self.x_star[0, 0], self.x_star[1, 0], 'go', label="Départ")
-        plt.plot(self.x_star[0, -1], self.x_star[1, -1], 'ro', label="Arrivée")
-        plt.xlabel("x (m)")
-        plt.ylabel("y (m)")
-        plt.title("Trajectoire 2D au sol")
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(filename)
-        plt.show()
-        plt.close()
-        return filename
+        return float(cout_controle(self.u_star, self.v, self.dt))
 
-    def dessin_trajectoire_3D(self):
+    def dessin_trajectoire_2D(self, en_memoire=False):
         """
-        Trace et sauvegarde une figure 3D de la trajectoire avec altitude.
+        Trace et sauvegarde une figure 2D de la trajectoire au sol (voir `rendu.image_2d`).
 
-        :return: Nom du fichier image généré.
-        :rtype: str
+        :param en_memoire: Renvoyer l'image au lieu de l'écrire dans le dossier courant.
+        :type en_memoire: bool
+        :return: Nom du fichier image généré, ou image PNG avec `en_memoire`.
+        :rtype: str or bytes
         """
-        filename = f"graph3D_{self.lat:.2f}_{self.lon:.2f}.png"
-        fig = plt.figure()
-        ax3d = fig.add_subplot(111, projection='3d')
-        ax3d.plot(self.x_star[0, :], self.x_star[1, :], self.z_t, 'b--', label="Trajectoire optimisée")
-        ax3d.scatter(self.x_star[0, 0], self.x_star[1, 0], self.z_t[0], color='green', label='Départ')
-        ax3d.scatter(self.x_star[0, -1], self.x_star[1, -1], self.z_t[-1], color='red', label='Arrivée')
-        ax3d.set_xlabel("x (m)")
-        ax3d.set_ylabel("y (m)")
-        ax3d.set_zlabel("z (m)")
-        ax3d.set_title("Trajectoire 3D")
-        ax3d.legend()
-        plt.savefig(filename)
-        plt.show()
-        plt.close()
-        return filename
+        return self._ecrire(rendu.image_2d(self.x_star), f"graph2D_{self.lat:.2f}_{self.lon:.2f}.png", en_memoire)
 
-    def animation_trajectoire(self):
+    def dessin_trajectoire_3D(self, en_memoire=False):
         """
-        Crée une animation 3D de la trajectoire et la sauvegarde au format .gif.
+        Trace et sauvegarde une figure 3D de la trajectoire avec altitude (voir `rendu.image_3d`).
 
-        :return: Nom du fichier gif généré.
-        :rtype: str
+        :param en_memoire: Renvoyer l'image au lieu de l'écrire dans le dossier courant.
+        :type en_memoire: bool
+        :return: Nom du fichier image généré, ou image PNG avec `en_memoire`.
+        :rtype: str or bytes
         """
-        filename = f"trajectoire_{self.lat:.2f}_{self.lon:.2f}.gif"
-        fig = plt.figure()
-        ax = fig.add_subplot(111, projection='3d')
-        line, = ax.plot([], [], [], lw=2, label="Trajectoire", linestyle=':')
-        point, = ax.plot([], [], [], 'ro', label="Parachute")
-
-        x_traj = self.x_star[0, :]
-        y_traj = self.x_star[1, :]
-        z_traj = self.calcul_altitude(self.time)
-
-        ax.set_xlim(min(x_traj), max(x_traj))
-        ax.set_ylim(min(y_traj), max(y_traj))
-        ax.set_zlim(0, max(z_traj))
-        ax.set_xlabel("x (m)")
-        ax.set_ylabel("y (m)")
-        ax.set_zlabel("z (m)")
-        ax.set_title("Animation 3D de la trajectoire")
-
-        def update(frame):
-            line.set_data(x_traj[:frame], y_traj[:frame])
-            line.set_3d_properties(z_traj[:frame])
-            point.set_data(x_traj[frame:frame + 1], y_traj[frame:frame + 1])
-            point.set_3d_properties(z_traj[frame:frame + 1])
-            return line, point
-
-        ani = FuncAnimation(fig, update, frames=len(self.time), interval=170, blit=False)
-        plt.legend()
-        plt.close()
-        ani.save(filename, writer=PillowWriter(fps=5))
-        return filename
\ No newline at end of file
+        return self._ecrire(rendu.image_3d(self.x_star, self.z_t), f"graph3D_{self.lat:.2f}_{self.lon:.2f}.png",
+                            en_memoire)
+
+    def animation_trajectoire(self, en_memoire=False):
+        """
+        Crée une animation 3D de la trajectoire et la sauvegarde au format .gif (voir `rendu.animation_gif`).
+
+        :param en_memoire: Renvoyer l'animation au lieu de l'écrire dans le dossier courant.
+        :type en_memoire: bool
+        :return: Nom du fichier gif généré, ou animation GIF avec `en_memoire`.
+        :rtype: str or bytes
+        """
+        return self._ecrire(rendu.animation_gif(self.x_star, self.calcul_altitude(self.time)),
+                            f"trajectoire_{self.lat:.2f}_{self.lon:.2f}.gif", en_memoire)
+
+    def figure_animee(self):
+        """
+        Construit l'animation 3D de la trajectoire sous forme de figure Plotly, rendue par le navigateur
+        (voir `rendu.figure_animee`).
+
+        :return: Figure Plotly.
+        :rtype: plotly.graph_objects.Figure
+        """
+        return rendu.figure_animee(self.x_star, self.calcul_altitude(self.time))
+
+    @staticmethod
+    def _ecrire(image, filename, en_memoire):
+        """Renvoie l'image, ou l'écrit sous `filename` et renvoie ce nom."""
+        if en_memoire:
+            return image
+        with open(filename, "wb") as f:
+            f.write(image)
+        return filename
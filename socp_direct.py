@@ -0,0 +1,272 @@
+"""
+Ce module définit la classe `SOCPDirect`, qui assemble directement les matrices coniques creuses
+du problème de guidage et appelle ECOS sans passer par cvxpy.
+
+Le problème résolu est le même que celui de `GabaritSCP` :
+    min  ALPHA_1 ||x_N - cible|| + ALPHA_2 (2 - u_y,N / v_N) + sum_k (||u_k+1 - u_k|| / (v_k sqrt(dt)))^2
+         (+ ALPHA_3 eps_h à l'étape 2)
+    s.c. dynamique, vitesse de virage bornée, u_bar_k . u_k >= v_k - eps_h, ||u_k|| <= v_k + eps_h.
+
+Variables concaténées dans z = [x (2N), u (2N), eps_h, r, t], où r est l'épigraphe de l'effort de
+contrôle (cône quadratique tourné) et t celui de la distance finale.
+
+Avec K scénarios de vent (voir `gabarit_scp.decomposer_scenarios`), la dynamique est celle du vent
+moyen et le cône de la distance finale est répété K fois, décalé de la dérive de chaque scénario :
+||x_N + d_s - cible|| <= t (critère "pire", un seul t) ou <= t_s (critère "moyenne", coût
+ALPHA_1 / K par t_s). Les K cônes sont assemblés en un bloc vectorisé, le reste de G est inchangé.
+
+La structure creuse de G et A est construite une seule fois ; à chaque itération SCP seules les
+valeurs `u_bar` de G sont modifiées sur place.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import threading
+
+import numpy as np
+
+from gabarit_scp import ALPHA_1, ALPHA_2, ALPHA_3, CRITERES, decomposer_scenarios
+
+# Cache des problèmes assemblés, partagé par tout le processus (clé : N, scénarios, critère)
+_PROBLEMES = {}
+_VERROU_CACHE = threading.Lock()
+
+# Codes de sortie ECOS acceptés : optimal, optimal à précision réduite
+_SORTIES_ECOS_VALIDES = (0, 10)
+
+
+def _assembler(lignes, colonnes, valeurs, forme):
+    """
+    Construit une matrice CSC et la position de chaque triplet dans son tableau `data`.
+
+    :param lignes: Indices de ligne des triplets (sans doublon).
+    :type lignes: np.ndarray
+    :param colonnes: Indices de colonne des triplets.
+    :type colonnes: np.ndarray
+    :param valeurs: Valeurs des triplets (les zéros sont conservés dans la structure).
+    :type valeurs: np.ndarray
+    :param forme: Dimensions de la matrice.
+    :type forme: tuple
+    :return: Tuple (matrice CSC, positions des triplets dans `data`).
+    :rtype: tuple
+    """
+    import scipy.sparse as sp
+
+    marqueurs = sp.csc_matrix((np.arange(1, len(lignes) + 1, dtype=float), (lignes, colonnes)), shape=forme)
+    ordre = marqueurs.data.astype(int) - 1
+    positions = np.empty_like(ordre)
+    positions[ordre] = np.arange(len(ordre))
+    marqueurs.data = np.asarray(valeurs, dtype=float)[ordre]
+    return marqueurs, positions
+
+
+class SOCPDirect:
+    """
+    Problème de guidage assemblé sous forme conique standard d'ECOS pour N étapes.
+
+    ECOS résout min c'z s.c. A z = b, h - G z dans K, où K est le produit de l'orthant
+    positif (`l` lignes) et de cônes du second ordre (`q`).
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param scenarios: Nombre de scénarios de vent partageant la commande (1 : vent unique).
+    :type scenarios: int
+    :param critere: Agrégation des écarts finaux des scénarios : "pire" (maximum) ou "moyenne".
+    :type critere: str
+
+    :ivar verrou: Verrou à tenir pendant toute une boucle SCP, le problème étant partagé.
+    :ivar derives: Dérives finales (2, K) des scénarios chargés par rapport au vent moyen.
+    """
+
+    def __init__(self, N, scenarios=1, critere="pire"):
+        if critere not in CRITERES:
+            raise ValueError(f"Critère inconnu : {critere} (choix : {', '.join(CRITERES)})")
+        self.N = N
+        self.scenarios = K = scenarios
+        self.critere = critere
+        self.derives = np.zeros((2, K))
+        self.verrou = threading.Lock()
+        self.options = {}
+
+        k_n = np.arange(N)
+        k_m = np.arange(N - 1)
+
+        def ix(i, k):
+            return 2 * k + i
+
+        def iu(i, k):
+            return 2 * N + 2 * k + i
+
+        # Un épigraphe de distance finale pour le pire cas, un par scénario pour la moyenne
+        n_t = K if critere == "moyenne" else 1
+        self.i_eps, self.i_r = 4 * N, 4 * N + 1
+        self.i_t = 4 * N + 2 + np.arange(n_t)
+        self.i_u_final = iu(1, N - 1)
+        self.n = 4 * N + 2 + n_t
+
+        # Inégalités : orthant (N + 1 lignes) puis cônes (K positions finales, virage, vitesse, effort)
+        self.l = N + 1
+        self.q = [3] * K + [3] * (N - 1) + [3] * N + [2 + 2 * (N - 1)]
+        s_k = np.arange(K)
+        self._lignes_cible = self.l + 3 * s_k[:, None] + [1, 2]
+        self.base_virage = self.l + 3 * K
+        self.base_vitesse = self.base_virage + 3 * (N - 1)
+        self.base_effort = self.base_vitesse + 3 * N
+        m = self.base_effort + 2 + 2 * (N - 1)
+
+        blocs = [
+            # u_bar_k . u_k + eps_h >= v_k (lignes à modifier à chaque itération)
+            (k_n, iu(0, k_n)), (k_n, iu(1, k_n)), (k_n, np.full(N, self.i_eps)),
+            # eps_h >= 0
+            ([N], [self.i_eps]),
+            # ||x_N + d_s - cible|| <= t (ou t_s), pour chaque scénario s
+            (self.l + 3 * s_k, self.i_t[s_k % n_t]),
+            (self._lignes_cible[:, 0], np.full(K, ix(0, N - 1))), (self._lignes_cible[:, 1], np.full(K, ix(1, N - 1))),
+        ]
+        for i in range(2):
+            ligne = self.base_virage + 3 * k_m + 1 + i
+            blocs += [(ligne, iu(i, k_m + 1)), (ligne, iu(i, k_m))]
+        blocs.append((self.base_vitesse + 3 * k_n, np.full(N, self.i_eps)))
+        for i in range(2):
+            blocs.append((self.base_vitesse + 3 * k_n + 1 + i, iu(i, k_n)))
+        blocs += [([self.base_effort], [self.i_r]), ([self.base_effort + 1], [self.i_r])]
+        for i in range(2):
+            ligne = self.base_effort + 2 + 2 * k_m + i
+            blocs += [(ligne, iu(i, k_m + 1)), (ligne, iu(i, k_m))]
+
+        lignes = np.concatenate([np.asarray(b[0]) for b in blocs])
+        colonnes = np.concatenate([np.asarray(b[1]) for b in blocs])
+        valeurs = np.concatenate([
+            np.zeros(2 * N), -np.ones(N), [-1.], -np.ones(3 * K),
+            np.tile([-1.] * (N - 1) + [1.] * (N - 1), 2), -np.ones(N), -np.ones(2 * N), [-1., -1.],
+            np.zeros(4 * (N - 1)),
+        ])
+        self.G, positions = _assembler(lignes, colonnes, valeurs, (m, self.n))
+        self._pos_u_bar = positions[:2 * N].reshape(2, N)
+        debut_effort = len(valeurs) - 4 * (N - 1)
+        self._pos_effort = positions[debut_effort:].reshape(2, 2, N - 1)
+        self.h = np.zeros(m)
+        self.h[self.base_effort:self.base_effort + 2] = [1., -1.]
+
+        # Égalités : départ, commande initiale, dynamique, puis eps_h fixé (étape 1 seulement)
+        blocs = [([0, 1], [ix(0, 0), ix(1, 0)]), ([2, 3], [iu(0, 0), iu(1, 0)])]
+        for i in range(2):
+            ligne = 4 + 2 * k_m + i
+            blocs += [(ligne, ix(i, k_m + 1)), (ligne, ix(i, k_m)), (ligne, iu(i, k_m)), (ligne, iu(i, k_m + 1))]
+        m_eq = 4 + 2 * (N - 1)
+        blocs.append(([m_eq], [self.i_eps]))
+        lignes = np.concatenate([np.asarray(b[0]) for b in blocs])
+        colonnes = np.concatenate([np.asarray(b[1]) for b in blocs])
+        valeurs = np.concatenate([np.ones(4), np.tile(np.repeat([1., -1., 0., 0.], N - 1), 2), [1.]])
+        A, positions = _assembler(lignes, colonnes, valeurs, (m_eq + 1, self.n))
+        self._pos_dt = positions[4:4 + 8 * (N - 1)].reshape(2, 4, N - 1)[:, 2:]
+        self.A_etape_1 = A
+        self.b = np.zeros(m_eq + 1)
+        self.A_etape_2 = None
+
+        self.c = np.zeros(self.n)
+        self.c[self.i_t] = ALPHA_1 / n_t
+        self.c[self.i_r] = 1.
+        self.poids_eps = ALPHA_3
+        self.constante = 2 * ALPHA_2
+
+    def charger(self, W, x_0, cible, v, dt, u_0, u_bar, phid_max=0.14, eps_h=0.1, poids_eps=ALPHA_3):
+        """
+        Met à jour les données du problème pour un nouveau cas de guidage.
+
+        Mêmes arguments que `GabaritSCP.charger`.
+        """
+        N = self.N
+        self.b[0:2] = np.ravel(x_0)
+        self.b[2:4] = np.ravel(u_0)
+        W, self.derives = decomposer_scenarios(W, N, self.scenarios)
+        self.b[4:4 + 2 * (N - 1)] = W.ravel(order='F')
+        self.b[-1] = eps_h
+        self.A_etape_1.data[self._pos_dt] = -0.5 * dt
+        self.A_etape_2 = self.A_etape_1[:-1]
+
+        self.h[:N] = -v
+        self.h[self._lignes_cible] = self.derives.T - np.ravel(cible)
+        self.h[self.base_virage + 3 * np.arange(N - 1)] = phid_max * dt * v[:-1]
+        self.h[self.base_vitesse + 3 * np.arange(N)] = v
+        poids = 2 / (v[:-1] * np.sqrt(dt))
+        self.G.data[self._pos_effort[:, 0]] = -poids
+        self.G.data[self._pos_effort[:, 1]] = poids
+
+        self.c[self.i_u_final] = -ALPHA_2 / abs(v[-1])
+        self.poids_eps = poids_eps
+        self.fixer_u_bar(u_bar)
+
+    def fixer_u_bar(self, u_bar):
+        """
+        Remplace sur place les coefficients de linéarisation `u_bar` dans G.
+
+        :param u_bar: Directions de linéarisation (2, N).
+        :type u_bar: np.ndarray
+        """
+        self.G.data[self._pos_u_bar] = -u_bar
+
+    def fixer_eps_h(self, eps_h):
+        """
+        Change la marge de vitesse imposée à l'étape 1 (rayon de la région de confiance, voir `pilote_scp`).
+
+        :param eps_h: Marge de vitesse (m/s).
+        :type eps_h: float
+        """
+        self.b[-1] = eps_h
+
+    def amorcer(self, x, u):
+        """
+        Sans effet : ECOS (point intérieur) ne prend pas de point de départ. Présent pour offrir
+        la même interface que `GabaritSCP`.
+        """
+
+    def resoudre(self, etape, **options):
+        """
+        Résout l'une des deux étapes avec ECOS.
+
+        :param etape: 1 (eps_h fixé) ou 2 (eps_h pénalisé).
+        :type etape: int
+        :param options: Options transmises à `ecos.solve` (tolérances, verbose...).
+        :return: Tuple (valeur optimale, x, u) ; x et u valent None en cas d'échec.
+        :rtype: tuple
+        """
+        import ecos
+
+        c = self.c.copy()
+        if etape == 1:
+            A, b = self.A_etape_1, self.b
+        else:
+            A, b = self.A_etape_2, self.b[:-1]
+            c[self.i_eps] = self.poids_eps
+        options = {"verbose": False, **self.options, **options}
+        dims = {"l": self.l, "q": self.q, "e": 0}
+        solution = ecos.solve(c, self.G, self.h, dims, A, b, **options)
+        if solution["info"]["exitFlag"] not in _SORTIES_ECOS_VALIDES:
+            return None, None, None
+        z = solution["x"]
+        x = z[:2 * self.N].reshape(2, self.N, order='F')
+        u = z[2 * self.N:4 * self.N].reshape(2, self.N, order='F')
+        return c @ z + self.constante, x, u
+
+
+def obtenir_socp_direct(N, scenarios=1, critere="pire"):
+    """
+    Renvoie le problème assemblé associé à (N, scenarios, critere), en le construisant au premier appel.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param scenarios: Nombre de scénarios de vent.
+    :type scenarios: int
+    :param critere: Agrégation des écarts finaux ("pire" ou "moyenne").
+    :type critere: str
+    :return: Problème partagé du processus.
+    :rtype: SOCPDirect
+    """
+    cle = (N, scenarios, critere if scenarios > 1 else "pire")
+    with _VERROU_CACHE:
+        probleme = _PROBLEMES.get(cle)
+        if probleme is None:
+            probleme = _PROBLEMES[cle] = SOCPDirect(*cle)
+        return probleme
@@ -0,0 +1,220 @@
+"""
+Ce module regroupe les solveurs coniques utilisables pour l'optimisation de trajectoire.
+
+Responsable de :
+    - lister les solveurs installés capables de traiter des cônes du second ordre,
+    - fournir pour chacun des options homogènes (tolérances, sortie silencieuse, warm start),
+    - calibrer les solveurs sur un cas synthétique et enregistrer les temps mesurés,
+    - choisir automatiquement ("auto") le solveur le plus rapide qui converge pour un N donné.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from gabarit_scp import GabaritSCP
+
+# Tolérances comparables d'un solveur à l'autre (noms d'options propres à chaque solveur)
+OPTIONS_SOLVEURS = {
+    "ECOS": {"abstol": 1e-7, "reltol": 1e-6, "feastol": 1e-7},
+    "CLARABEL": {"tol_gap_abs": 1e-7, "tol_gap_rel": 1e-6, "tol_feas": 1e-7},
+    "SCS": {"eps_abs": 1e-5, "eps_rel": 1e-5, "max_iters": 20000},
+    "MOSEK": {},
+}
+
+# Solveurs pour lesquels cvxpy transmet la solution précédente comme point de départ
+SOLVEURS_WARM_START = {"SCS", "OSQP", "GUROBI", "MOSEK", "XPRESS"}
+
+# ECOS_BB est la variante branch-and-bound d'ECOS, inutile ici
+_SOLVEURS_EXCLUS = {"ECOS_BB"}
+
+SOLVEUR_PAR_DEFAUT = "ECOS"
+FICHIER_CALIBRATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration_solveurs.json")
+TOLERANCE_CONVERGENCE = 1e-2
+
+_calibration = None
+
+
+def solveurs_coniques_installes():
+    """
+    Liste les solveurs installés qui acceptent des contraintes de cône du second ordre.
+
+    :return: Noms des solveurs au sens de cvxpy.
+    :rtype: list
+    """
+    from cvxpy.constraints import SOC
+    from cvxpy.reductions.solvers.defines import INSTALLED_CONIC_SOLVERS, SOLVER_MAP_CONIC
+
+    return [nom for nom in INSTALLED_CONIC_SOLVERS
+            if nom not in _SOLVEURS_EXCLUS and SOC in SOLVER_MAP_CONIC[nom].SUPPORTED_CONSTRAINTS]
+
+
+def options_solveur(nom, **surcharges):
+    """
+    Construit les options de `cvx.Problem.solve` pour un solveur donné.
+
+    :param nom: Nom du solveur (ex : "ECOS", "CLARABEL", "SCS").
+    :type nom: str
+    :param surcharges: Options qui remplacent les valeurs par défaut.
+    :return: Dictionnaire d'options.
+    :rtype: dict
+    """
+    nom = nom.upper()
+    if nom not in solveurs_coniques_installes():
+        raise ValueError(f"Solveur conique non installé : {nom} (disponibles : {', '.join(solveurs_coniques_installes())})")
+    options = {"solver": nom, "verbose": False, "warm_start": nom in SOLVEURS_WARM_START}
+    options.update(OPTIONS_SOLVEURS.get(nom, {}))
+    options.update(surcharges)
+    return options
+
+
+def cas_synthetique(N, graine=0):
+    """
+    Construit un cas de guidage reproductible, sans appel réseau, proche d'une descente réelle
+    (environ 156 s depuis 1200 m, départ à quelques centaines de mètres de la cible, cap initial nul).
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param graine: Graine du générateur aléatoire.
+    :type graine: int
+    :return: Arguments positionnels de `charger` (W, x_0, cible, v, dt, u_0, u_bar).
+    :rtype: tuple
+    """
+    rng = np.random.default_rng(graine)
+    v = np.linspace(18.5, 17.45, N)
+    W = rng.normal(0., 3., (2, N))
+    u_bar = np.vstack([np.ones(N), np.zeros(N)])
+    return W, [350., -420.], [0., 0.], v, 156.4 / (N - 1), [v[0], 0.], u_bar
+
+
+def mesurer_solveur(gabarit, nom, donnees, iterations=5):
+    """
+    Mesure le temps moyen de résolution sur quelques itérations SCP de chaque étape.
+
+    Une première résolution non chronométrée absorbe la compilation cvxpy, puis le cas est
+    rechargé et `iterations` itérations de chaque étape sont enchaînées avec mise à jour de `u_bar`.
+
+    :param gabarit: Gabarit de la taille du cas.
+    :type gabarit: GabaritSCP
+    :param nom: Nom du solveur.
+    :type nom: str
+    :param donnees: Arguments de `charger` (voir `cas_synthetique`).
+    :type donnees: tuple
+    :param iterations: Nombre d'itérations SCP par étape.
+    :type iterations: int
+    :return: Tuple (temps moyen par résolution en secondes, valeurs optimales en fin de chaque étape),
+        ou (None, None) si le solveur échoue.
+    :rtype: tuple
+    """
+    import cvxpy as cvx
+
+    options = options_solveur(nom)
+    valeurs = []
+    try:
+        gabarit.charger(*donnees)
+        gabarit.resoudre(1, **options)
+        gabarit.charger(*donnees)
+        debut = time.perf_counter()
+        for etape in (1, 2):
+            for _ in range(iterations):
+                valeur, _, u = gabarit.resoudre(etape, **options)
+                if u is None:
+                    return None, None
+                gabarit.fixer_u_bar(u / np.linalg.norm(u, axis=0))
+            valeurs.append(valeur)
+    except cvx.error.SolverError:
+        return None, None
+    return (time.perf_counter() - debut) / (2 * iterations), valeurs
+
+
+def calibrer(valeurs_n=(31, 101, 301), solveurs=None, chemin=FICHIER_CALIBRATION, iterations=5):
+    """
+    Chronomètre chaque solveur sur le cas synthétique et enregistre les résultats en JSON.
+
+    Un solveur est retenu pour un N s'il résout les deux étapes et que ses valeurs optimales
+    restent à `TOLERANCE_CONVERGENCE` (relative) de celles d'ECOS.
+
+    :param valeurs_n: Tailles de problème à calibrer.
+    :type valeurs_n: iterable
+    :param solveurs: Solveurs à tester (par défaut : tous les solveurs coniques installés).
+    :type solveurs: list
+    :param chemin: Fichier de calibration à écrire (None pour ne rien écrire).
+    :type chemin: str
+    :param iterations: Nombre d'itérations SCP par étape et par solveur.
+    :type iterations: int
+    :return: Calibration {N: {solveur: temps moyen en secondes ou None}}.
+    :rtype: dict
+    """
+    global _calibration
+    import cvxpy as cvx
+
+    solveurs = solveurs or solveurs_coniques_installes()
+    temps = {}
+    for N in valeurs_n:
+        gabarit = GabaritSCP(N)
+        donnees = cas_synthetique(N)
+        _, reference = mesurer_solveur(gabarit, SOLVEUR_PAR_DEFAUT, donnees, iterations)
+        temps[str(N)] = {}
+        for nom in solveurs:
+            duree, valeurs = mesurer_solveur(gabarit, nom, donnees, iterations)
+            if valeurs is not None and reference is not None:
+                ecarts = [abs(a - b) / max(1., abs(b)) for a, b in zip(valeurs, reference)]
+                if max(ecarts) > TOLERANCE_CONVERGENCE:
+                    duree = None
+            temps[str(N)][nom] = duree
+
+    calibration = {"date": datetime.now().isoformat(timespec="seconds"), "cvxpy": cvx.__version__, "temps": temps}
+    if chemin:
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump(calibration, fichier, indent=2)
+        if chemin == FICHIER_CALIBRATION:
+            _calibration = calibration
+    return calibration
+
+
+def charger_calibration(chemin=FICHIER_CALIBRATION):
+    """
+    Lit la calibration enregistrée (une seule fois par processus pour le fichier par défaut).
+
+    :param chemin: Fichier de calibration.
+    :type chemin: str
+    :return: Calibration, ou None si le fichier n'existe pas.
+    :rtype: dict
+    """
+    global _calibration
+    if chemin == FICHIER_CALIBRATION and _calibration is not None:
+        return _calibration
+    if not os.path.exists(chemin):
+        return None
+    with open(chemin, encoding="utf-8") as fichier:
+        calibration = json.load(fichier)
+    if chemin == FICHIER_CALIBRATION:
+        _calibration = calibration
+    return calibration
+
+
+def choisir_solveur(N, chemin=FICHIER_CALIBRATION):
+    """
+    Renvoie le solveur installé le plus rapide qui a convergé pour la taille calibrée la plus proche de N.
+
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param chemin: Fichier de calibration.
+    :type chemin: str
+    :return: Nom du solveur ("ECOS" à défaut de calibration exploitable).
+    :rtype: str
+    """
+    calibration = charger_calibration(chemin)
+    if not calibration or not calibration["temps"]:
+        return SOLVEUR_PAR_DEFAUT
+    installes = solveurs_coniques_installes()
+    plus_proche = min(calibration["temps"], key=lambda n: abs(np.log(int(n) / N)))
+    candidats = {nom: duree for nom, duree in calibration["temps"][plus_proche].items()
+                 if duree is not None and nom in installes}
+    return min(candidats, key=candidats.get) if candidats else SOLVEUR_PAR_DEFAUT
@@ -7,23 +7,132 @@ Fonctionnalités :
 - Sélection d'une position sur carte interactive (folium),
 - Récupération météo (Open-Meteo API),
 - Affichage des profils vent/température/pression,
-- Simulation de trajectoire optimisée,
-- Visualisation en 2D, 3D et GIF.
+- Point de largage optimal (CARP) et région de largage sous le vent prévu (voir `carp`),
+- Simulation de trajectoire optimisée (amorcée par les plans déjà résolus voisins, voir `cache_trajectoires`),
+  exécutée en arrière-plan par la file de travaux partagée entre les sessions (voir `travaux`),
+- Aperçu immédiat de la trajectoire par une table précalculée (voir `apercu`), avant la résolution exacte,
+- Recherche de la meilleure heure de largage (balayage parallèle des heures de prévision),
+- Zone atteignable depuis le point de largage, superposée à la carte (voir `empreinte`),
+- Visualisation en 2D, 3D, et animation interactive (Plotly) ou GIF, rendues en mémoire (voir `rendu`).
+
+Les bibliothèques d'affichage (folium, plotly, pandas, matplotlib) ne sont importées que par les
+méthodes qui les utilisent, et rien n'est calculé à l'import : le module se charge sans elles.
+
+Streamlit ré-exécute le script à chaque interaction. Chaque étape coûteuse est donc mise en cache
+selon ses vraies entrées : prévision et profil de vent par (lat, lon, N), tableau, graphiques et
+cartes par (site, heure), point de largage par (site, heure, N). Les données sérialisables passent par `st.cache_data`, les objets
+partagés en lecture seule (profil, figures, cartes) par `st.cache_resource`, et les résultats affichés
+(simulation, balayage des heures) restent dans `st.session_state` d'une interaction à l'autre.
+
+La simulation (résolution et rendus) est confiée à la file de travaux du processus, clé (site, heure, N,
+backend, solveur, point de largage) : deux sessions qui demandent la même simulation partagent le même
+travail, et l'interface suit son état sans bloquer le script.
+
+Variable d'environnement : PARACHUTE_URL_METEO, adresse du service de prévision (défaut : l'API publique
+Open-Meteo ; par exemple un `ServeurMeteoLocal` pour les tests).
 
 Auteurs : Wilson David Parra Oliveros, Syrine Boudef, Linda Ghazouani
 Date : 26/06/2026
 """
 
+import os
 import streamlit as st
-from streamlit_folium import st_folium
-import folium
-import requests
 from datetime import datetime, timedelta
-import pytz
-import pandas as pd
-import plotly.express as px
-from importer_vent import *
-from simultion_final import *
+from importer_vent import URL_OPEN_METEO, ImportVent, telecharger_meteo
+from simultion_final import SimulerTrajectoire
+from balayage_horaire import balayer_heures
+from travaux import file_travaux_par_defaut, tache_simulation
+from apercu import table_apercu
+from empreinte import Empreinte, empreinte
+from carp import placer_largage
+from rendu import figure_animee
+import numpy as np
+
+# Même durée de vie que le cache disque des prévisions (voir `cache_vent`)
+TTL_METEO = float(os.environ.get("PARACHUTE_VENT_TTL", 3600))
+MAX_ENTREES = 64
+URL_METEO = os.environ.get("PARACHUTE_URL_METEO", URL_OPEN_METEO)
+# Origine du plan d'une simulation, voir `travaux.tache_simulation`
+PLANS = {"servi": "♻️ Plan enregistré resservi sans résolution",
+         "amorcé": "♻️ Résolution amorcée par les plans voisins enregistrés",
+         "résolu": "Résolution complète (aucun plan voisin enregistré)"}
+
+
+@st.cache_data(ttl=TTL_METEO, max_entries=MAX_ENTREES, show_spinner=False)
+def _meteo(lat, lon):
+    """Prévision Open-Meteo brute d'un site (sans appel réseau ni lecture disque tant qu'elle est en cache)."""
+    return telecharger_meteo(lat, lon, url_base=URL_METEO)
+
+
+@st.cache_resource(ttl=TTL_METEO, max_entries=MAX_ENTREES, show_spinner=False)
+def _profil_vent(lat, lon, N=31):
+    """Profil de vent de toutes les heures d'un site, partagé en lecture seule."""
+    return ImportVent(lat, lon, N=N).profil_vent(_meteo(lat, lon))
+
+
+@st.cache_resource(show_spinner=False)
+def _carte_selection():
+    """Carte de sélection du point de livraison, construite une fois par processus."""
+    import folium
+
+    m = folium.Map(location=[48.85, 2.35], zoom_start=4)
+    folium.LatLngPopup().add_to(m)
+    return m
+
+
+@st.cache_resource(ttl=TTL_METEO, max_entries=MAX_ENTREES, show_spinner=False)
+def _affichage_meteo(_interface, lat, lon, index_horaire):
+    """Tableau stylé et graphiques météo d'une heure d'un site (voir `InterfaceStreamlit.afficher_meteo`)."""
+    import pandas as pd
+    import plotly.express as px
+
+    hourly = _meteo(lat, lon)["hourly"]
+    altitudes = [10, 80, 120, 180]
+    meteo_multi_alt = []
+    for alt in altitudes:
+        vitesse = hourly.get(f"wind_speed_{alt}m")[index_horaire]
+        direction = hourly.get(f"wind_direction_{alt}m")[index_horaire]
+        meteo_multi_alt.append({
+            "Altitude (m)": alt,
+            "Vitesse (m/s)": round(vitesse, 2),
+            "Direction (°)": round(direction),
+            "Direction": _interface.angle_de_direction(direction),
+            "Température (°C)": round(_interface.temperature_standard(alt) - 273.15, 2),
+            "Pression (kPa)": round(_interface.pression_standard(alt) / 10, 2)
+        })
+
+    df = pd.DataFrame(sorted(meteo_multi_alt, key=lambda x: x['Altitude (m)'], reverse=True))
+    tableau = (df.style
+               .background_gradient(subset=["Vitesse (m/s)"], cmap="Blues")
+               .background_gradient(subset=["Température (°C)"], cmap="Reds"))
+    fig_vitesse = px.line(df, x="Altitude (m)", y="Vitesse (m/s)", title="Vitesse du vent", markers=True)
+    fig_rose = None
+    if all(df["Direction (°)"].notna()):
+        fig_rose = px.bar_polar(df, r="Vitesse (m/s)", theta="Direction (°)", color="Altitude (m)", title="Tendance du vent", template="plotly_dark")
+    return tableau, fig_vitesse, fig_rose
+
+
+@st.cache_resource(ttl=TTL_METEO, max_entries=MAX_ENTREES, show_spinner="Calcul de la zone atteignable...")
+def _carte_localisation(_interface, lat, lon, index_horaire, N, legende, avec_empreinte):
+    """Carte du point de livraison, avec ou sans empreinte, et légende de l'empreinte (None sans elle)."""
+    import folium
+
+    m = folium.Map(location=[lat, lon], zoom_start=10)
+    folium.Marker([lat, lon], popup=legende, icon=folium.Icon(color="green", icon="truck")).add_to(m)
+    resume = _interface.ajouter_empreinte(m) if avec_empreinte else None
+    return m, resume
+
+
+@st.cache_data(ttl=TTL_METEO, max_entries=MAX_ENTREES, show_spinner="Calcul du point de largage...")
+def _point_largage(lat, lon, index_horaire, N, avec_table):
+    """
+    Point de largage optimal (CARP) d'un site à une heure, avec la commande prévue pour amorcer la résolution.
+    Tant que la table d'aperçu se construit, recherche rapide de `carp.point_largage_virage` ; `avec_table`
+    est dans la clé du cache pour que le point soit recalculé dès que la table existe.
+    """
+    simulateur = SimulerTrajectoire(lat=lat, lon=lon, N=N, hour_index=index_horaire, profil_vent=_profil_vent(lat, lon, N))
+    return placer_largage(simulateur, attendre=False)
+
 
 class InterfaceStreamlit:
     """
@@ -40,6 +149,9 @@ class InterfaceStreamlit:
         self.heure_selectionnee = None
         self.index_horaire = None
         self.response = None
+        self.N = 31
+        self.backend = "cvxpy"
+        self.solveur = "ECOS"
 
     def temperature_standard(self, h):
         """
@@ -90,6 +202,8 @@ class InterfaceStreamlit:
         Affiche l'interface Streamlit principale : carte,
         sélection date/heure, lancement de simulation.
         """
+        from streamlit_folium import st_folium
+
         st.set_page_config(layout="centered", page_title="Météo Drone Delivery")
         st.markdown("""<style>html, body, [class*='st-'], .stApp {color: red !important;}</style>""", unsafe_allow_html=True)
         st.markdown("""<style>.element-container iframe {height: 500px !important;}</style>""", unsafe_allow_html=True)
@@ -97,10 +211,14 @@ class InterfaceStreamlit:
         self.set_background_image()
         st.title("🌍 Sélectionnez un point de livraison sur la carte")
 
-        m = folium.Map(location=[48.85, 2.35], zoom_start=4)
-        folium.LatLngPopup().add_to(m)
         st.markdown('<p style="color:blue">Cliquez sur la carte...</p>', unsafe_allow_html=True)
-        map_data = st_folium(m, width=700, height=500)
+        map_data = st_folium(_carte_selection(), width=700, height=500)
+
+        with st.expander("⚙️ Réglages de résolution"):
+            self.N = st.select_slider("Nombre d'étapes N", [31, 61, 101], value=31)
+            self.backend = st.radio("Backend", ["cvxpy", "direct"], horizontal=True)
+            solveurs = ["ECOS"] if self.backend == "direct" else ["ECOS", "CLARABEL", "SCS", "auto"]
+            self.solveur = st.selectbox("Solveur", solveurs)
 
         if map_data and map_data["last_clicked"]:
             self.lat = map_data["last_clicked"]["lat"]
@@ -115,34 +233,235 @@ class InterfaceStreamlit:
             st.session_state.clicked_point = map_data["last_clicked"]
 
         if st.session_state.clicked_point:
+            largage = st.radio("Point de largage", ["Optimal (CARP)", "Aléatoire"], horizontal=True)
             if st.button("🚀 Lancer la simulation"):
                 lat = st.session_state.clicked_point["lat"]
                 lon = st.session_state.clicked_point["lng"]
-                st.write(f"Simulation pour : lat = {lat:.4f}, lon = {lon:.4f}")
+                st.session_state.simulation = self.simuler(lat, lon, largage)
+            if st.session_state.get("simulation"):
+                self.afficher_simulation(st.session_state.simulation)
+
+            self.afficher_balayage()
+
+    def simuler(self, lat, lon, largage):
+        """
+        Calcule le point de largage et l'aperçu (chaque étape servie par son cache si ses entrées n'ont pas
+        changé), puis confie la trajectoire exacte et ses rendus à la file de travaux. La simulation encore
+        attendue par une demande précédente de la session est annulée si la nouvelle en diffère.
+
+        :param lat: Latitude de la cible.
+        :type lat: float
+        :param lon: Longitude de la cible.
+        :type lon: float
+        :param largage: "Optimal (CARP)" ou "Aléatoire".
+        :type largage: str
+        :return: Résultat à afficher (conservé dans `st.session_state.simulation`), complété par le travail
+            quand il est terminé.
+        :rtype: dict
+        """
+        index_horaire = self.index_horaire or 0
+        resultat = {"lat": lat, "lon": lon, "carp": None}
+        simulateur = SimulerTrajectoire(lat=lat, lon=lon, N=self.N, hour_index=index_horaire,
+                                        profil_vent=_profil_vent(lat, lon, self.N))
+        if largage == "Optimal (CARP)":
+            carp = _point_largage(lat, lon, index_horaire, self.N, table_apercu(self.N) is not None)
+            simulateur.x_0, simulateur.carp = carp["x_0"].reshape(2, 1), carp
+            resultat["carp"] = carp["effort"]
+        resultat["x_0"] = tuple(simulateur.x_0.ravel())
+        resultat["apercu"], amorce = self.afficher_apercu(simulateur)
+        if amorce is None and hasattr(simulateur, "carp"):
+            # Sans table d'aperçu, le plan à virage constant de `point_largage_virage` amorce la résolution
+            amorce = simulateur.carp.get("amorce")
 
-                with st.spinner("Simulation en cours..."):
-                    simulateur = SimulerTrajectoire(lat=lat, lon=lon)
-                    x_star, erreur, (xf, yf), z_t, time = simulateur.optimiser_trajectoire()
-                    fig2d = simulateur.dessin_trajectoire_2D()
-                    fig3d = simulateur.dessin_trajectoire_3D()
-                    gif = simulateur.animation_trajectoire()
+        file = file_travaux_par_defaut()
+        cle = ("simulation", lat, lon, index_horaire, self.N, self.backend, self.solveur, resultat["x_0"])
+        precedente = st.session_state.get("simulation")
+        if precedente and "gif" not in precedente and "travail" in precedente:
+            if precedente["travail"] == cle:
+                return precedente
+            file.annuler(precedente["travail"])
+        try:
+            resultat["travail"] = file.soumettre(cle, tache_simulation, lat, lon, index_horaire, self.N, self.backend,
+                                                 self.solveur, resultat["x_0"], _profil_vent(lat, lon, self.N), amorce,
+                                                 avec_canal=True)
+        except RuntimeError as e:
+            resultat["refus"] = str(e)
+        return resultat
+
+    def afficher_simulation(self, resultat):
+        """
+        Affiche le résultat d'une simulation, à chaque interaction tant qu'aucune autre n'est lancée, ou l'état
+        de son travail tant qu'il n'est pas terminé.
+
+        :param resultat: Résultat de `simuler`.
+        :type resultat: dict
+        """
+        st.write(f"Simulation pour : lat = {resultat['lat']:.4f}, lon = {resultat['lon']:.4f}")
+        if resultat["carp"] is not None:
+            est, nord = np.subtract(resultat["x_0"], [resultat["lat"], resultat["lon"]])
+            st.caption(f"🪂 Largage à {est:.0f} m à l'est et {nord:.0f} m au nord de la cible, "
+                       f"effort de contrôle prévu {resultat['carp']:.4f}")
+        if resultat["apercu"] is not None:
+            figure, erreur_prevue = resultat["apercu"]
+            st.plotly_chart(figure)
+            st.metric("Erreur d'atterrissage prévue (m)", f"{erreur_prevue:.2f}")
+        if "refus" in resultat:
+            st.warning(f"⏳ {resultat['refus']} : relancez la simulation dans un instant.")
+        elif "echec" in resultat:
+            st.error(f"La simulation a échoué : {resultat['echec']}")
+        elif "gif" not in resultat:
+            self.suivre_simulation(resultat)
+        else:
+            st.caption(PLANS[resultat["plan"]])
+            if resultat["interrompu"]:
+                st.caption("⏹️ Résolution arrêtée avant convergence : meilleur itéré obtenu.")
+            if st.radio("Animation", ["Interactive", "GIF"], horizontal=True) == "Interactive":
+                # Construite une fois par simulation et animée par le navigateur
+                if "figure_animee" not in resultat:
+                    resultat["figure_animee"] = figure_animee(resultat["x"], resultat["z"])
+                st.plotly_chart(resultat["figure_animee"])
+            else:
+                st.image(resultat["gif"], caption="🎮 Animation 3D")
+            st.image(resultat["fig2d"], caption="📉 Trajectoire au sol (2D)")
+            st.image(resultat["fig3d"], caption="📊 Trajectoire complète (3D)")
+
+    @st.fragment(run_every=1.)
+    def suivre_simulation(self, resultat):
+        """
+        Affiche l'état du travail d'une simulation, chaque seconde et sans ré-exécuter le reste du script :
+        pendant la résolution, le dernier itéré de la convexification successive (trajectoire, erreur
+        d'atterrissage, coût), avec un bouton pour s'arrêter là en gardant le meilleur itéré et un bouton
+        d'annulation ; quand le travail est terminé, son résultat complète `resultat` et la page est
+        réaffichée.
 
-                st.image(gif, caption="🎮 Animation 3D")
-                st.image(fig2d, caption="📉 Trajectoire au sol (2D)")
-                st.image(fig3d, caption="📊 Trajectoire complète (3D)")
+        :param resultat: Résultat de `simuler`, en attente de son travail.
+        :type resultat: dict
+        """
+        file = file_travaux_par_defaut()
+        etat = file.etat(resultat["travail"])
+        if etat is None:
+            st.warning("Simulation annulée ou expirée : relancez-la.")
+            return
+        if etat["etat"] in ("terminé", "échec"):
+            try:
+                resultat.update(file.resultat(resultat["travail"]))
+            except Exception as e:
+                resultat["echec"] = str(e)
+            st.rerun()
+        if etat["etat"] == "en attente":
+            st.info(f"⏳ Simulation en attente : {etat['position']} travail(s) avant elle, "
+                    f"{file.profondeur()} dans la file ({file.processus} processus).")
+        else:
+            partage = f", partagée par {etat['abonnes']} demandes" if etat["abonnes"] > 1 else ""
+            st.info(f"⚙️ Simulation en cours depuis {etat['duree']:.0f} s{partage}.")
+        iteration = etat["progression"]
+        if iteration is not None:
+            import plotly.express as px
+
+            fig = px.line(x=iteration["x"][0], y=iteration["x"][1], labels={"x": "x (m)", "y": "y (m)"},
+                          title=f"Itération {iteration['iteration']} (étape {iteration['etape']})")
+            fig.add_scatter(x=[resultat["lat"]], y=[resultat["lon"]], mode="markers", name="Cible")
+            st.plotly_chart(fig)
+            st.caption(f"Erreur d'atterrissage {iteration['termes']['final_position']:.2f} m, "
+                       f"effort de contrôle {iteration['termes']['control_cost']:.4f}, coût {iteration['cout']:.2f}")
+        arret, annulation = st.columns(2)
+        if iteration is not None and arret.button("⏹️ Arrêter ici"):
+            file.arreter(resultat["travail"])
+        if annulation.button("✖️ Annuler la simulation"):
+            file.annuler(resultat["travail"])
+            del st.session_state.simulation
+            st.rerun()
+
+    def afficher_apercu(self, simulateur):
+        """
+        Prépare la trajectoire et l'erreur prévues par la table d'aperçu, avant la résolution exacte ;
+        la table est construite en arrière-plan lors de la première utilisation.
+
+        :param simulateur: Simulateur de la simulation demandée.
+        :type simulateur: SimulerTrajectoire
+        :return: Tuple ((figure, erreur prévue) à afficher, (commande, trajectoire) prévues pour amorcer la
+            résolution exacte), ou (None, None) sans table.
+        :rtype: tuple
+        """
+        import plotly.express as px
+
+        table = table_apercu(simulateur.N, simulateur.psi_0)
+        if table is None:
+            st.caption("⏳ Table d'aperçu en cours de construction : l'aperçu sera disponible aux prochaines simulations.")
+            return None, None
+        W, _, _ = simulateur.champ_vent()
+        prevision = table.predire(simulateur.x_0, [simulateur.lat, simulateur.lon], W)
+        trajectoire = prevision["trajectoire"][0]
+        fig = px.line(x=trajectoire[0], y=trajectoire[1], labels={"x": "x (m)", "y": "y (m)"},
+                      title="Aperçu de la trajectoire (table précalculée)")
+        fig.add_scatter(x=[simulateur.lat], y=[simulateur.lon], mode="markers", name="Cible")
+        if hasattr(simulateur, "carp"):
+            region = np.vstack([simulateur.carp["region"], simulateur.carp["region"][:1]])
+            fig.add_scatter(x=region[:, 0], y=region[:, 1], mode="lines", name="Région de largage")
+        return (fig, float(prevision["erreur"][0])), (prevision["commande"][0], trajectoire)
+
+    def afficher_balayage(self):
+        """
+        Affiche le panneau de recherche de la meilleure heure de largage : optimisation de chaque heure
+        de la fenêtre choisie en parallèle, barre de progression et tableau classé. Le dernier classement
+        est conservé dans `st.session_state` avec ses entrées, et réaffiché tant qu'elles ne changent pas.
+        """
+        import pandas as pd
+
+        site = st.session_state.get("profil_vent_site")
+        if site is None:
+            return
+        profil = _profil_vent(*site, self.N)
+        if profil.heures is None:
+            return
+        with st.expander("⏱️ Meilleure heure de largage"):
+            heures_dt = [datetime.fromisoformat(h) for h in profil.heures]
+            fenetre = st.radio("Heures à évaluer", ["Date choisie", "7 prochains jours"], horizontal=True)
+            if fenetre == "Date choisie":
+                heures = [i for i, h in enumerate(heures_dt) if h.date() == self.date_selectionnee]
+            else:
+                heures = list(range(len(heures_dt)))
+            cle = (site, tuple(heures), self.N, self.backend, self.solveur)
+            if heures and st.button(f"🔎 Comparer {len(heures)} heures"):
+                barre = st.progress(0., text="Optimisation des heures...")
+                tableau = st.empty()
+                termines = []
+
+                def progression(fait, total, resultat):
+                    termines.append(resultat)
+                    barre.progress(fait / total, text=f"{fait}/{total} heures optimisées")
+                    tableau.dataframe(pd.DataFrame(termines)[["horodatage", "erreur", "cout_controle", "n_iter"]])
+
+                lat, lon = site
+                resultats = balayer_heures(lat, lon, heures, N=self.N, backend=self.backend, solveur=self.solveur,
+                                           profil=profil, progression=progression)
+                barre.empty()
+                tableau.empty()
+                st.session_state.balayage = (cle, resultats)
+
+            if st.session_state.get("balayage", (None,))[0] != cle:
+                return
+            resultats = st.session_state.balayage[1]
+            classement = pd.DataFrame(resultats)
+            st.dataframe(classement[["horodatage", "erreur", "cout_controle", "n_iter", "converge"]]
+                         .rename(columns={"horodatage": "Heure", "erreur": "Erreur (m)",
+                                          "cout_controle": "Coût de commande", "n_iter": "Itérations",
+                                          "converge": "Résolu"}), hide_index=True)
+            meilleure = next((r for r in resultats if r["converge"]), None)
+            if meilleure:
+                st.success(f"🏆 Meilleure heure : {meilleure['horodatage']} "
+                           f"(erreur {meilleure['erreur']:.2f} m, coût {meilleure['cout_controle']:.4f})")
 
     def recuperer_donnees(self):
         """
-        Récupère les données météo pour les coordonnées choisies via l'API Open-Meteo,
+        Récupère les données météo pour les coordonnées choisies via l'API Open-Meteo
+        (servies par le cache de session, puis par le cache disque si elles sont encore valides),
         puis permet à l'utilisateur de choisir une date/heure de livraison.
         """
         try:
-            url = (
-                f"https://api.open-meteo.com/v1/forecast?latitude={self.lat}&longitude={self.lon}"
-                f"&hourly=wind_speed_10m,wind_direction_10m,wind_speed_80m,wind_direction_80m,"
-                f"wind_speed_120m,wind_direction_120m,wind_speed_180m,wind_direction_180m&timezone=auto"
-            )
-            self.response = requests.get(url).json()
+            self.response = _meteo(self.lat, self.lon)
+            # Vent de toutes les heures calculé une fois par site (`_profil_vent`) : changer d'heure n'est qu'une tranche
+            st.session_state.profil_vent_site = (self.lat, self.lon)
             heures_disponibles = self.response["hourly"]["time"]
             heures_dt = [datetime.fromisoformat(h) for h in heures_disponibles]
 
@@ -164,43 +483,54 @@ class InterfaceStreamlit:
 
     def afficher_meteo(self):
         """
-        Affiche les données météo sous forme de tableau et de graphiques interactifs.
-        """
-        altitudes = [10, 80, 120, 180]
-        meteo_multi_alt = []
-        for alt in altitudes:
-            vitesse = self.response["hourly"].get(f"wind_speed_{alt}m")[self.index_horaire]
-            direction = self.response["hourly"].get(f"wind_direction_{alt}m")[self.index_horaire]
-            meteo_multi_alt.append({
-                "Altitude (m)": alt,
-                "Vitesse (m/s)": round(vitesse, 2),
-                "Direction (\u00b0)": round(direction),
-                "Direction": self.angle_de_direction(direction),
-                "Température (\u00b0C)": round(self.temperature_standard(alt) - 273.15, 2),
-                "Pression (kPa)": round(self.pression_standard(alt) / 10, 2)
-            })
-
-        df = pd.DataFrame(sorted(meteo_multi_alt, key=lambda x: x['Altitude (m)'], reverse=True))
+        Affiche les données météo sous forme de tableau et de graphiques interactifs
+        (construits une fois par site et par heure, voir `_affichage_meteo`).
+        """
+        from streamlit_folium import st_folium
+
+        tableau, fig_vitesse, fig_rose = _affichage_meteo(self, self.lat, self.lon, self.index_horaire)
         st.subheader("📊 Données météorologiques")
-        st.dataframe(
-            df.style
-            .background_gradient(subset=["Vitesse (m/s)"], cmap="Blues")
-            .background_gradient(subset=["Température (°C)"], cmap="Reds"),
-            width=800
-        )
+        st.dataframe(tableau, width=800)
         st.subheader("📈 Graphiques")
-        fig_vitesse = px.line(df, x="Altitude (m)", y="Vitesse (m/s)", title="Vitesse du vent", markers=True)
         st.plotly_chart(fig_vitesse, use_container_width=True)
-
-        if all(df["Direction (\u00b0)"].notna()):
-            fig_rose = px.bar_polar(df, r="Vitesse (m/s)", theta="Direction (\u00b0)", color="Altitude (m)", title="Tendance du vent", template="plotly_dark")
+        if fig_rose is not None:
             st.plotly_chart(fig_rose, use_container_width=True)
 
         st.subheader("📍 Localisation finale")
-        m = folium.Map(location=[self.lat, self.lon], zoom_start=10)
-        folium.Marker([self.lat, self.lon], popup=f"Livraison: {self.date_selectionnee} {self.heure_selectionnee.strftime('%H:%M')}", icon=folium.Icon(color="green", icon="truck")).add_to(m)
+        legende = f"Livraison: {self.date_selectionnee} {self.heure_selectionnee.strftime('%H:%M')}"
+        avec_empreinte = st.checkbox("🎯 Zone atteignable depuis ce point de largage")
+        m, resume = _carte_localisation(self, self.lat, self.lon, self.index_horaire, self.N, legende,
+                                        avec_empreinte)
+        if resume:
+            st.caption(resume)
         st_folium(m, width=700, height=300)
 
+    def ajouter_empreinte(self, carte):
+        """
+        Superpose à la carte l'empreinte atteignable depuis le point choisi comme point de largage, sous le
+        vent de l'heure choisie : carte de chaleur de la marge au bord (m) et contour.
+
+        :param carte: Carte folium centrée sur le point de largage.
+        :type carte: folium.Map
+        :return: Légende (dérive du vent, marge maximale).
+        :rtype: str
+        """
+        import folium
+        import matplotlib
+
+        zone = empreinte(self.lat, self.lon, self.index_horaire, _profil_vent(self.lat, self.lon, self.N), self.N)
+        xs, ys, marge = zone.raster()
+        couleurs = matplotlib.colormaps["YlGn"](marge / max(marge.max(), 1.))
+        couleurs[..., 3] = np.where(marge > 0, 0.6, 0.)
+        coins = Empreinte.en_geographique(self.lat, self.lon, [[xs[0], ys[0]], [xs[-1], ys[-1]]])
+        # Première ligne de l'image au nord
+        folium.raster_layers.ImageOverlay(np.flipud(couleurs), bounds=coins.tolist(), mercator_project=True,
+                                          name="Marge au bord (m)").add_to(carte)
+        folium.Polygon(Empreinte.en_geographique(self.lat, self.lon, zone.polygone()).tolist(), color="green",
+                       weight=2, fill=False, tooltip="Zone atteignable").add_to(carte)
+        carte.fit_bounds(coins.tolist())
+        return (f"Dérive du vent pendant la descente : {np.linalg.norm(zone.derive):.0f} m ; "
+                f"marge maximale au bord : {marge.max():.0f} m")
+
 if __name__ == "__main__":
     app = InterfaceStreamlit()
-    app.afficher_interface()
\ No newline at end of file
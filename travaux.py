@@ -0,0 +1,340 @@
+"""
+Ce module définit la classe `FileTravaux`, une file de travaux partagée exécutés sur un pool de processus,
+et la tâche de simulation de l'interface (`tache_simulation`).
+
+Responsable de :
+    - exécuter les calculs coûteux (résolution et rendus) hors du fil qui les demande, sur un pool de
+      processus : le fil de l'interface reste libre et le débit suit le nombre de cœurs,
+    - fusionner les demandes identiques : un travail est identifié par une clé (ses vraies entrées) ;
+      tant qu'il est en attente, en cours, ou terminé depuis moins de `conservation` secondes, une demande
+      de même clé rejoint ce travail au lieu d'en lancer un autre,
+    - donner l'état d'un travail (en attente avec sa position dans la file, en cours, terminé, échec,
+      annulé) et son résultat,
+    - annuler un travail quand plus personne ne l'attend,
+    - pour les travaux soumis avec un canal (un dictionnaire partagé entre processus), publier leur
+      progression (dernier itéré de la convexification successive) et leur demander de s'arrêter,
+    - refuser les nouveaux travaux au-delà de `profondeur_max` travaux non terminés.
+
+Un travail déjà confié à un processus ne peut pas être tué : son annulation le retire de la file, son
+résultat est ignoré, et il compte dans la profondeur jusqu'à ce que le processus soit libéré. Avec un
+canal, l'annulation lui demande aussi de s'arrêter à la prochaine itération. Le pool
+envoie un travail de plus que de processus à l'avance : celui-là peut être vu « en cours » un peu tôt.
+
+Configuration par variables d'environnement de la file par défaut :
+    - PARACHUTE_TRAVAUX_PROCESSUS : nombre de processus (défaut : nombre de cœurs),
+    - PARACHUTE_TRAVAUX_PROFONDEUR : nombre maximal de travaux non terminés (défaut : 4 par processus).
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cache_trajectoires import cache_trajectoires_par_defaut
+from simultion_final import SimulerTrajectoire
+
+ETATS = ("en attente", "en cours", "terminé", "échec", "annulé")
+
+_file_par_defaut = None
+_VERROU = threading.Lock()
+
+
+def tache_simulation(lat, lon, index_horaire, N, backend, solveur, x_0, profil, amorce=None, canal=None):
+    """
+    Résout la trajectoire depuis `x_0` (servie ou amorcée par le cache de trajectoires) et la dessine
+    (exécuté dans un processus du pool). Avec un canal, chaque itéré y est publié sous "iteration"
+    (iteration, etape, x, cout, termes, duree, voir `SimulerTrajectoire.iterer_trajectoire`) et la boucle
+    s'arrête, en gardant son meilleur itéré, dès que "arret" y est vrai ; si "annule" y est vrai, la tâche
+    s'arrête sans dessiner et renvoie None.
+
+    Les images sont rendues en mémoire et renvoyées en octets, avec la trajectoire et l'altitude pour
+    construire l'animation Plotly côté interface (`rendu.figure_animee`).
+
+    :param lat: Latitude de la cible.
+    :type lat: float
+    :param lon: Longitude de la cible.
+    :type lon: float
+    :param index_horaire: Index horaire de largage.
+    :type index_horaire: int
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param backend: Backend de résolution ("cvxpy" ou "direct").
+    :type backend: str
+    :param solveur: Solveur conique.
+    :type solveur: str
+    :param x_0: Point de largage.
+    :type x_0: array-like
+    :param profil: Profil de vent du site.
+    :type profil: ProfilVent
+    :param amorce: Commande et trajectoire prévues pour amorcer la résolution (voir `TableApercu.predire`).
+    :type amorce: tuple
+    :param canal: Dictionnaire partagé du travail (voir `FileTravaux.soumettre`).
+    :type canal: multiprocessing.managers.DictProxy
+    :return: Dictionnaire (erreur, cout_controle, plan : "servi", "amorcé" ou "résolu" par le cache de
+        trajectoires, interrompu : arrêt demandé avant convergence, gif, fig2d, fig3d : images en octets,
+        x : trajectoire (2, N), z : altitude (N,)).
+    :rtype: dict
+    """
+    def suivi(iteration):
+        canal["iteration"] = {cle: iteration[cle] for cle in ("iteration", "etape", "x", "cout", "termes", "duree")}
+        return canal.get("arret", False)
+
+    simulateur = SimulerTrajectoire(lat=lat, lon=lon, N=N, backend=backend, solveur=solveur,
+                                    hour_index=index_horaire, profil_vent=profil, x_0=x_0)
+    cache = cache_trajectoires_par_defaut()
+    servis, amorces = cache.succes, cache.amorces
+    _, erreur, _, _, _ = cache.optimiser(simulateur, amorce=amorce, suivi=None if canal is None else suivi)
+    plan = "servi" if cache.succes > servis else "amorcé" if cache.amorces > amorces else "résolu"
+
+    if canal is not None and canal.get("annule", False):
+        return None
+    return {"erreur": float(erreur), "cout_controle": simulateur.calcul_cout_controle(), "plan": plan,
+            "interrompu": simulateur.interrompu, "gif": simulateur.animation_trajectoire(en_memoire=True),
+            "fig2d": simulateur.dessin_trajectoire_2D(en_memoire=True),
+            "fig3d": simulateur.dessin_trajectoire_3D(en_memoire=True),
+            "x": simulateur.x_star, "z": simulateur.calcul_altitude(simulateur.time)}
+
+
+class FileTravaux:
+    """
+    File de travaux partagée, exécutés sur un pool de processus, avec fusion des demandes identiques.
+
+    :param processus: Nombre de processus du pool (par défaut : nombre de cœurs).
+    :type processus: int
+    :param profondeur_max: Nombre maximal de travaux non terminés (par défaut : 4 par processus).
+    :type profondeur_max: int
+    :param conservation: Durée (s) pendant laquelle un travail terminé est resservi.
+    :type conservation: float
+    :param max_termines: Nombre maximal de travaux terminés conservés.
+    :type max_termines: int
+
+    :ivar soumis: Nombre de demandes reçues.
+    :ivar fusionnes: Nombre de demandes rattachées à un travail existant.
+    :ivar refuses: Nombre de demandes refusées, file pleine.
+    """
+
+    def __init__(self, processus=None, profondeur_max=None, conservation=3600., max_termines=64):
+        self.processus = processus or os.cpu_count()
+        self.profondeur_max = profondeur_max or 4 * self.processus
+        self.conservation = conservation
+        self.max_termines = max_termines
+        self.soumis = 0
+        self.fusionnes = 0
+        self.refuses = 0
+        self._travaux = OrderedDict()
+        # Travaux annulés pendant leur exécution : ils occupent un processus jusqu'à leur fin
+        self._detaches = set()
+        self._pool = None
+        self._gestionnaire = None
+        # Réentrant : l'annulation d'un travail en attente appelle `_terminer` dans le même fil
+        self._verrou = threading.RLock()
+
+    def _nettoyer(self):
+        """Oublie les travaux terminés trop anciens ou en surnombre (appelé sous le verrou)."""
+        maintenant = time.monotonic()
+        termines = [c for c, t in self._travaux.items() if t["fin"] is not None]
+        for rang, cle in enumerate(termines):
+            if len(termines) - rang > self.max_termines or maintenant - self._travaux[cle]["fin"] > self.conservation:
+                del self._travaux[cle]
+
+    def profondeur(self):
+        """
+        Renvoie le nombre de travaux non terminés, y compris les travaux annulés encore en exécution.
+
+        :rtype: int
+        """
+        with self._verrou:
+            return sum(t["fin"] is None for t in self._travaux.values()) + len(self._detaches)
+
+    def soumettre(self, cle, fonction, *args, avec_canal=False, **kwargs):
+        """
+        Demande l'exécution de `fonction(*args, **kwargs)`, ou rejoint le travail de même clé s'il est en
+        attente, en cours ou terminé avec succès récemment.
+
+        :param cle: Clé du travail (hachable) : les vraies entrées du calcul.
+        :type cle: tuple
+        :param fonction: Fonction de module (transmise par nom aux processus).
+        :type fonction: callable
+        :param avec_canal: Transmettre à la fonction, en argument `canal`, un dictionnaire partagé où elle
+            publie sa progression sous "iteration" et lit les demandes d'arrêt "arret" et d'annulation
+            "annule".
+        :type avec_canal: bool
+        :return: Clé du travail.
+        :rtype: tuple
+        :raises RuntimeError: Si la file est pleine.
+        """
+        with self._verrou:
+            self._nettoyer()
+            self.soumis += 1
+            travail = self._travaux.get(cle)
+            if travail is not None and self._etat(travail) in ("en attente", "en cours", "terminé"):
+                travail["abonnes"] += 1
+                self.fusionnes += 1
+                return cle
+            en_cours = self.profondeur()
+            if en_cours >= self.profondeur_max:
+                self.refuses += 1
+                raise RuntimeError(f"File de travaux pleine ({en_cours} travaux en cours)")
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processus)
+            canal = None
+            if avec_canal:
+                if self._gestionnaire is None:
+                    self._gestionnaire = multiprocessing.Manager()
+                canal = kwargs["canal"] = self._gestionnaire.dict()
+            try:
+                futur = self._pool.submit(fonction, *args, **kwargs)
+            except BrokenProcessPool:
+                # Un processus a été tué : les travaux en cours sont perdus, le pool est recréé
+                self._pool = ProcessPoolExecutor(max_workers=self.processus)
+                futur = self._pool.submit(fonction, *args, **kwargs)
+            travail = {"futur": futur, "abonnes": 1, "debut": time.monotonic(), "fin": None, "canal": canal}
+            self._travaux[cle] = travail
+            self._travaux.move_to_end(cle)
+        futur.add_done_callback(lambda f: self._terminer(cle, f))
+        return cle
+
+    def _terminer(self, cle, futur):
+        """Date la fin d'un travail, ou libère un travail annulé pendant son exécution."""
+        with self._verrou:
+            travail = self._travaux.get(cle)
+            if travail is not None and travail["futur"] is futur:
+                travail["fin"] = time.monotonic()
+            self._detaches.discard(futur)
+
+    @staticmethod
+    def _etat(travail):
+        """Renvoie l'état d'un travail (voir `ETATS`)."""
+        futur = travail["futur"]
+        if futur.cancelled():
+            return "annulé"
+        if not futur.done():
+            return "en cours" if futur.running() else "en attente"
+        return "échec" if futur.exception() is not None else "terminé"
+
+    def etat(self, cle):
+        """
+        Renvoie l'état d'un travail.
+
+        :param cle: Clé du travail.
+        :type cle: tuple
+        :return: Dictionnaire (etat : voir `ETATS` ; position : rang dans la file des travaux en attente,
+            None sinon ; duree : secondes depuis la soumission, ou durée totale ; abonnes : demandes
+            rattachées ; progression : dernier itéré publié dans le canal, None sans canal ou avant la
+            première itération), ou None pour un travail inconnu, oublié ou annulé.
+        :rtype: dict
+        """
+        with self._verrou:
+            travail = self._travaux.get(cle)
+            if travail is None:
+                return None
+            etat = self._etat(travail)
+            position = None
+            if etat == "en attente":
+                attente = [c for c, t in self._travaux.items() if self._etat(t) == "en attente"]
+                position = attente.index(cle)
+            fin = travail["fin"] if travail["fin"] is not None else time.monotonic()
+        progression = None
+        if travail["canal"] is not None and etat == "en cours":
+            progression = travail["canal"].get("iteration")
+        return {"etat": etat, "position": position, "duree": fin - travail["debut"], "abonnes": travail["abonnes"],
+                "progression": progression}
+
+    def resultat(self, cle, delai=None):
+        """
+        Renvoie le résultat d'un travail, en l'attendant au plus `delai` secondes.
+
+        :param cle: Clé du travail.
+        :type cle: tuple
+        :param delai: Attente maximale (s) ; par défaut, jusqu'à la fin du travail.
+        :type delai: float
+        :return: Valeur renvoyée par la fonction du travail.
+        :raises KeyError: Si le travail est inconnu, oublié ou annulé.
+        :raises TimeoutError: Si le travail n'est pas terminé à temps.
+        """
+        with self._verrou:
+            travail = self._travaux.get(cle)
+        if travail is None:
+            raise KeyError(f"Travail inconnu : {cle}")
+        try:
+            return travail["futur"].result(timeout=delai)
+        except CancelledError:
+            raise KeyError(f"Travail annulé : {cle}") from None
+
+    def annuler(self, cle):
+        """
+        Retire une demande d'un travail ; le travail est annulé quand plus aucune demande ne l'attend.
+
+        :param cle: Clé du travail.
+        :type cle: tuple
+        :return: Vrai si le travail a été annulé.
+        :rtype: bool
+        """
+        with self._verrou:
+            travail = self._travaux.get(cle)
+            if travail is None or travail["fin"] is not None:
+                return False
+            travail["abonnes"] -= 1
+            if travail["abonnes"] > 0:
+                return False
+            del self._travaux[cle]
+            futur = travail["futur"]
+            if not futur.cancel():
+                self._detaches.add(futur)
+                if travail["canal"] is not None:
+                    travail["canal"].update(arret=True, annule=True)
+        if futur.done():
+            self._terminer(cle, futur)
+        return True
+
+    def arreter(self, cle):
+        """
+        Demande à un travail en cours, soumis avec un canal, de s'arrêter à la prochaine itération en gardant
+        son meilleur résultat (qui reste servi aux demandes de même clé).
+
+        :param cle: Clé du travail.
+        :type cle: tuple
+        :return: Vrai si la demande a été transmise.
+        :rtype: bool
+        """
+        with self._verrou:
+            travail = self._travaux.get(cle)
+            if travail is None or travail["fin"] is not None or travail["canal"] is None:
+                return False
+            travail["canal"]["arret"] = True
+            return True
+
+    def fermer(self):
+        """Annule les travaux en attente et arrête le pool et le gestionnaire des canaux."""
+        with self._verrou:
+            pool, self._pool = self._pool, None
+            gestionnaire, self._gestionnaire = self._gestionnaire, None
+            self._travaux.clear()
+            self._detaches.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if gestionnaire is not None:
+            gestionnaire.shutdown()
+
+
+def file_travaux_par_defaut():
+    """
+    Renvoie la file de travaux partagée du processus, configurée par les variables d'environnement.
+
+    :return: File par défaut.
+    :rtype: FileTravaux
+    """
+    global _file_par_defaut
+    with _VERROU:
+        if _file_par_defaut is None:
+            processus = os.environ.get("PARACHUTE_TRAVAUX_PROCESSUS")
+            profondeur = os.environ.get("PARACHUTE_TRAVAUX_PROFONDEUR")
+            _file_par_defaut = FileTravaux(processus=int(processus) if processus else None,
+                                           profondeur_max=int(profondeur) if profondeur else None)
+        return _file_par_defaut
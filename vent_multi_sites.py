@@ -0,0 +1,171 @@
+"""
+Ce module définit la classe `ImportVentMultiSites`, qui récupère le vent de nombreux points de
+livraison en parallèle, à côté de `ImportVent` qui traite un seul site.
+
+Responsable de :
+    - regrouper les sites en requêtes Open-Meteo multi-positions (latitudes/longitudes séparées par des virgules),
+    - envoyer ces requêtes en parallèle, avec une concurrence bornée et une session HTTP partagée
+      (connexions réutilisées),
+    - réessayer avec attente exponentielle les erreurs réseau, 429 et 5xx,
+    - passer par le cache disque `CacheVent` et renvoyer le champ de vent interpolé de chaque site.
+
+:author: Linda Ghazouani, Syrine Boudef, Wilson David Parra Oliveros
+:date: 26/06/2026
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_vent import cache_par_defaut
+from importer_vent import DELAI_REQUETE, URL_OPEN_METEO, ImportVent, url_open_meteo
+
+# Codes HTTP pour lesquels une nouvelle tentative a du sens
+_CODES_REESSAYABLES = {429, 500, 502, 503, 504}
+
+
+class ImportVentMultiSites:
+    """
+    Récupération groupée et parallèle du vent pour une liste de sites (lat, lon).
+
+    :param hour_index: Index horaire utilisé pour tous les sites.
+    :type hour_index: int
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param z0: Altitude d'ouverture du parachute.
+    :type z0: float
+    :param taille_lot: Nombre maximal de sites par requête.
+    :type taille_lot: int
+    :param concurrence: Nombre maximal de requêtes simultanées.
+    :type concurrence: int
+    :param tentatives: Nombre maximal d'essais par requête.
+    :type tentatives: int
+    :param attente_initiale: Attente avant le deuxième essai (doublée ensuite), en secondes.
+    :type attente_initiale: float
+    :param url_base: Adresse du service (l'API publique, ou `ServeurMeteoLocal.url`).
+    :type url_base: str
+    :param cache: Cache des réponses météo (par défaut : `cache_par_defaut()`).
+    :type cache: CacheVent
+    """
+
+    def __init__(self, hour_index=0, N=31, z0=1200, taille_lot=50, concurrence=4, tentatives=4,
+                 attente_initiale=0.5, url_base=URL_OPEN_METEO, cache=None):
+        self.hour_index = hour_index
+        self.N = N
+        self.z0 = z0
+        self.taille_lot = taille_lot
+        self.concurrence = concurrence
+        self.tentatives = tentatives
+        self.attente_initiale = attente_initiale
+        self.url_base = url_base
+        self.cache = cache or cache_par_defaut()
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adaptateur = HTTPAdapter(pool_connections=1, pool_maxsize=concurrence)
+        self.session.mount("http://", adaptateur)
+        self.session.mount("https://", adaptateur)
+
+    def _telecharger_lot(self, lot):
+        """
+        Interroge l'API pour un lot de sites, avec nouvelles tentatives.
+
+        :param lot: Liste de (lat, lon).
+        :type lot: list
+        :return: Réponses de l'API, dans l'ordre du lot.
+        :rtype: list
+        """
+        import requests
+
+        url = url_open_meteo(",".join(str(lat) for lat, _ in lot), ",".join(str(lon) for _, lon in lot), self.url_base)
+        for tentative in range(self.tentatives):
+            try:
+                response = self.session.get(url, timeout=DELAI_REQUETE)
+                response.raise_for_status()
+                data = response.json()
+                return data if isinstance(data, list) else [data]
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as erreur:
+                code = erreur.response.status_code if erreur.response is not None else None
+                if tentative == self.tentatives - 1 or (code is not None and code not in _CODES_REESSAYABLES):
+                    raise
+                time.sleep(self.attente_initiale * 2 ** tentative * (1 + random.random()))
+
+    def recuperer(self, sites):
+        """
+        Renvoie la réponse brute de l'API pour chaque site, en ne téléchargeant que les sites absents du cache.
+
+        Les sites qui partagent la même clé de cache (position arrondie) ne sont demandés qu'une fois.
+
+        :param sites: Liste de (lat, lon).
+        :type sites: list
+        :return: Réponses de l'API, dans l'ordre des sites.
+        :rtype: list
+        """
+        reponses = [None] * len(sites)
+        manquants = {}
+        for i, (lat, lon) in enumerate(sites):
+            data = self.cache.lire(lat, lon)
+            if data is not None:
+                self.cache.succes += 1
+                reponses[i] = data
+            else:
+                manquants.setdefault(self.cache.prefixe(lat, lon), []).append(i)
+
+        if manquants and self.cache.hors_ligne:
+            raise LookupError(f"Aucune réponse météo enregistrée pour {', '.join(manquants)} (mode hors ligne)")
+
+        groupes = list(manquants.values())
+        lots = [groupes[k:k + self.taille_lot] for k in range(0, len(groupes), self.taille_lot)]
+        with ThreadPoolExecutor(max_workers=self.concurrence) as pool:
+            resultats = pool.map(lambda lot: self._telecharger_lot([sites[g[0]] for g in lot]), lots)
+            for lot, donnees in zip(lots, resultats):
+                for groupe, data in zip(lot, donnees):
+                    self.cache.ecrire(*sites[groupe[0]], data)
+                    self.cache.echecs += 1
+                    for i in groupe:
+                        reponses[i] = data
+        return reponses
+
+    def import_vent(self, sites):
+        """
+        Récupère et interpole le vent de tous les sites.
+
+        :param sites: Liste de (lat, lon).
+        :type sites: list
+        :return: Liste de tuples (W, z_t, time, data), un par site, comme `ImportVent.import_vent`.
+        :rtype: list
+        """
+        resultats = []
+        for (lat, lon), data in zip(sites, self.recuperer(sites)):
+            W, z_t, time_vec = ImportVent(lat, lon, self.hour_index, self.N, self.z0).interpoler(data)
+            resultats.append((W, z_t, time_vec, data))
+        return resultats
+
+    def fermer(self):
+        """Ferme la session HTTP et ses connexions."""
+        self.session.close()
+
+
+def import_vent_multi_sites(sites, hour_index=0, N=31, z0=1200, **options):
+    """
+    Fonction d'interface simplifiée : vent interpolé pour une liste de sites.
+
+    :param sites: Liste de (lat, lon).
+    :type sites: list
+    :param hour_index: Index horaire utilisé pour tous les sites.
+    :type hour_index: int
+    :param N: Nombre d'étapes temporelles.
+    :type N: int
+    :param z0: Altitude d'ouverture du parachute.
+    :type z0: float
+    :param options: Autres paramètres de `ImportVentMultiSites`.
+    :return: Liste de tuples (W, z_t, time, data).
+    :rtype: list
+    """
+    recuperateur = ImportVentMultiSites(hour_index, N, z0, **options)
+    try:
+        return recuperateur.import_vent(sites)
+    finally:
+        recuperateur.fermer()